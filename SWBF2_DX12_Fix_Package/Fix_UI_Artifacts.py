@@ -1,311 +1,379 @@
-#!/usr/bin/env python3
-"""
-UI-Specific DX12 Artifact Fix for Star Wars Battlefront II
-Prevents resolution scaling from affecting UI elements while keeping 3D content scaling intact
-"""
-
-import os
-import sys
-import subprocess
-
-class UIArtifactFixer:
-    def __init__(self, custom_settings_path=None):
-        if custom_settings_path:
-            self.settings_path = custom_settings_path
-        else:
-            self.settings_path = os.path.expanduser(r"~\Documents\STAR WARS Battlefront II\settings")
-        self.boot_options_path = os.path.join(self.settings_path, "BootOptions")
-        self.profile_options_path = os.path.join(self.settings_path, "ProfileOptions_profile")
-    
-    def fix_ui_specific_artifacts(self):
-        """Apply UI-specific fixes while keeping 3D scaling"""
-        print("🎯 Applying targeted UI artifact fixes...")
-        
-        fixes_applied = []
-        
-        # Fix 1: Force UI to render at native resolution
-        if self.force_ui_native_resolution():
-            fixes_applied.append("UI forced to native resolution")
-        
-        # Fix 2: Separate UI and 3D render paths
-        if self.separate_ui_render_path():
-            fixes_applied.append("UI render path separated from 3D")
-        
-        # Fix 3: Disable UI scaling specifically
-        if self.disable_ui_scaling():
-            fixes_applied.append("UI scaling disabled")
-        
-        # Fix 4: Apply UI-specific DX12 fixes
-        if self.apply_ui_dx12_fixes():
-            fixes_applied.append("UI-specific DX12 optimizations applied")
-        
-        return fixes_applied
-    
-    def force_ui_native_resolution(self):
-        """Force UI elements to render at screen resolution regardless of scaling"""
-        try:
-            if os.path.exists(self.boot_options_path):
-                with open(self.boot_options_path, 'r') as f:
-                    content = f.read()
-                
-                # UI-specific rendering fixes
-                ui_fixes = [
-                    'GstRender.EnableDx12 1',  # Keep DX12 enabled
-                    'GstRender.UI.ForceNativeResolution 1',  # Force UI native res
-                    'GstRender.UI.DisableScaling 1',  # Disable UI scaling
-                    'GstRender.UI.UseSeparateRenderTarget 1',  # Separate UI rendering
-                    'GstRender.UI.ForceScreenDepth 1',  # Keep UI at screen depth
-                ]
-                
-                lines = content.split('\n')
-                for fix in ui_fixes:
-                    setting_name = fix.split()[0]
-                    # Remove existing setting if present
-                    lines = [line for line in lines if not line.startswith(setting_name)]
-                    # Add new setting
-                    lines.append(fix)
-                
-                with open(self.boot_options_path, 'w') as f:
-                    f.write('\n'.join(lines))
-                
-                print("✅ UI forced to native resolution")
-                return True
-                
-        except Exception as e:
-            print(f"⚠️  Could not force UI native resolution: {e}")
-        
-        return False
-    
-    def separate_ui_render_path(self):
-        """Create separate render path for UI vs 3D content"""
-        try:
-            if os.path.exists(self.profile_options_path):
-                with open(self.profile_options_path, 'r') as f:
-                    content = f.read()
-                
-                # Allow 3D scaling but protect UI
-                render_fixes = [
-                    'GstRender.ResolutionScale 1.200000',  # Keep your desired 3D scaling
-                    'GstRender.UI.ResolutionScale 1.000000',  # Force UI to 100%
-                    'GstRender.UI.BypassScaling 1',  # Bypass scaling for UI
-                    'GstRender.SeparateUIContext 1',  # Separate UI context
-                    'GstRender.UIRenderTargetMultiplier 1.0',  # UI at native resolution
-                ]
-                
-                lines = content.split('\n')
-                for fix in render_fixes:
-                    setting_name = fix.split()[0]
-                    lines = [line for line in lines if not line.startswith(setting_name)]
-                    lines.append(fix)
-                
-                with open(self.profile_options_path, 'w') as f:
-                    f.write('\n'.join(lines))
-                
-                print("✅ UI render path separated from 3D")
-                return True
-                
-        except Exception as e:
-            print(f"⚠️  Could not separate UI render path: {e}")
-        
-        return False
-    
-    def disable_ui_scaling(self):
-        """Disable scaling for specific UI elements"""
-        try:
-            if os.path.exists(self.profile_options_path):
-                with open(self.profile_options_path, 'r') as f:
-                    content = f.read()
-                
-                # Disable scaling for UI-specific elements
-                ui_scaling_fixes = [
-                    'GstRender.HUD.DisableScaling 1',  # HUD elements
-                    'GstRender.Menu.DisableScaling 1',  # Menu elements  
-                    'GstRender.Text.DisableScaling 1',  # Text rendering
-                    'GstRender.UI.AntiAliasing 0',  # Disable UI AA that causes artifacts
-                    'GstRender.UI.FilterMode 0',  # Use nearest neighbor for UI
-                ]
-                
-                lines = content.split('\n')
-                for fix in ui_scaling_fixes:
-                    setting_name = fix.split()[0]
-                    lines = [line for line in lines if not line.startswith(setting_name)]
-                    lines.append(fix)
-                
-                with open(self.profile_options_path, 'w') as f:
-                    f.write('\n'.join(lines))
-                
-                print("✅ UI scaling disabled")
-                return True
-                
-        except Exception as e:
-            print(f"⚠️  Could not disable UI scaling: {e}")
-        
-        return False
-    
-    def apply_ui_dx12_fixes(self):
-        """Apply DX12-specific fixes for UI rendering"""
-        try:
-            if os.path.exists(self.boot_options_path):
-                with open(self.boot_options_path, 'r') as f:
-                    content = f.read()
-                
-                # DX12 UI-specific fixes
-                dx12_ui_fixes = [
-                    'GstRender.Dx12.UIDescriptorHeap 512',  # Smaller heap for UI
-                    'GstRender.Dx12.UIForceSRGB 1',  # Force sRGB for UI
-                    'GstRender.Dx12.UIDisableBuffering 1',  # Disable UI buffering
-                    'GstRender.Dx12.UISingleThreaded 1',  # Single-threaded UI
-                    'GstRender.Dx12.UICompatMode 1',  # Compatibility mode for UI
-                ]
-                
-                lines = content.split('\n')
-                for fix in dx12_ui_fixes:
-                    setting_name = fix.split()[0]
-                    lines = [line for line in lines if not line.startswith(setting_name)]
-                    lines.append(fix)
-                
-                with open(self.boot_options_path, 'w') as f:
-                    f.write('\n'.join(lines))
-                
-                print("✅ DX12 UI optimizations applied")
-                return True
-                
-        except Exception as e:
-            print(f"⚠️  Could not apply DX12 UI fixes: {e}")
-        
-        return False
-    
-    def create_ui_fix_profile(self):
-        """Create a profile optimized for artifact-free UI with 3D scaling"""
-        try:
-            # Create UI-optimized settings
-            ui_optimized_settings = """# UI-Optimized DX12 settings - keeps 3D scaling, fixes UI
-GstRender.EnableDx12 1
-GstRender.ResolutionScale 1.200000
-GstRender.UI.ResolutionScale 1.000000
-GstRender.UI.ForceNativeResolution 1
-GstRender.UI.DisableScaling 1
-GstRender.UI.UseSeparateRenderTarget 1
-GstRender.UI.ForceScreenDepth 1
-GstRender.UI.BypassScaling 1
-GstRender.SeparateUIContext 1
-GstRender.UIRenderTargetMultiplier 1.0
-GstRender.HUD.DisableScaling 1
-GstRender.Menu.DisableScaling 1
-GstRender.Text.DisableScaling 1
-GstRender.UI.AntiAliasing 0
-GstRender.UI.FilterMode 0
-GstRender.Dx12.UIDescriptorHeap 512
-GstRender.Dx12.UIForceSRGB 1
-GstRender.Dx12.UIDisableBuffering 1
-GstRender.Dx12.UISingleThreaded 1
-GstRender.Dx12.UICompatMode 1
-"""
-            
-            ui_fix_path = os.path.join(self.settings_path, "UI_Fix_Profile")
-            with open(ui_fix_path, 'w') as f:
-                f.write(ui_optimized_settings)
-            
-            print(f"✅ UI-optimized profile created: {ui_fix_path}")
-            return True
-            
-        except Exception as e:
-            print(f"⚠️  Could not create UI-optimized profile: {e}")
-            return False
-    
-    def apply_registry_ui_fixes(self):
-        """Apply Windows registry fixes for UI rendering"""
-        try:
-            # Registry fixes for UI rendering
-            registry_commands = [
-                'reg add "HKCU\\Software\\EA Games\\STAR WARS Battlefront II" /v "GstRender.UI.ForceNativeRes" /t REG_DWORD /d 1 /f',
-                'reg add "HKCU\\Software\\EA Games\\STAR WARS Battlefront II" /v "GstRender.UI.DisableHWScaling" /t REG_DWORD /d 1 /f',
-            ]
-            
-            for cmd in registry_commands:
-                try:
-                    subprocess.run(cmd, shell=True, capture_output=True)
-                except:
-                    pass  # Registry access might fail, that's ok
-            
-            print("✅ Registry UI fixes applied")
-            return True
-            
-        except Exception as e:
-            print(f"⚠️  Registry fixes failed: {e}")
-            return False
-
-def main():
-    print("=" * 65)
-    print("   UI-Specific DX12 Artifact Fix for Battlefront II")
-    print("=" * 65)
-    print()
-    print("This will fix UI artifacts while keeping 3D resolution scaling.")
-    print("Your 3D graphics scaling will remain intact!")
-    print()
-    
-    # Check for custom settings path argument
-    custom_settings_path = None
-    if len(sys.argv) > 1:
-        custom_settings_path = sys.argv[1]
-        print(f"Using custom settings path: {custom_settings_path}")
-        print()
-    
-    fixer = UIArtifactFixer(custom_settings_path)
-    
-    # Apply UI-specific fixes
-    print("🎯 Applying surgical UI fixes...")
-    print()
-    
-    fixes_applied = fixer.fix_ui_specific_artifacts()
-    
-    # Apply registry fixes
-    fixer.apply_registry_ui_fixes()
-    
-    if fixes_applied:
-        print("✅ UI fixes applied successfully:")
-        for fix in fixes_applied:
-            print(f"   • {fix}")
-        
-        print()
-        print("🎮 What this does:")
-        print("   • 3D content: Keeps your resolution scaling")
-        print("   • UI elements: Forces native resolution (no artifacts)")
-        print("   • HUD/Menu: Renders at screen depth")
-        print("   • Text: Uses native resolution rendering")
-        
-        print()
-        print("📋 Benefits:")
-        print("   ✅ No more UI corruption/artifacts")
-        print("   ✅ Keep 3D graphics scaling benefits")
-        print("   ✅ Maintain DX12 performance")
-        print("   ✅ Crisp, clean UI elements")
-        
-        print()
-        print("🎮 Restart Battlefront II to apply changes.")
-        
-        # Create backup profile
-        fixer.create_ui_fix_profile()
-        
-    else:
-        print("⚠️  No fixes could be applied.")
-        print("   Try running as Administrator.")
-    
-    print()
-    print("🔄 If UI artifacts still persist:")
-    print("   1. Lower 3D resolution scale to 110% instead of 120%")
-    print("   2. Try the UI_Fix_Profile settings")
-    print("   3. Fallback: Use BattlefrontII_DX12_Fix.bat for DX11")
-    
-    print()
-    print("💡 Pro tip: You can now safely use resolution scaling")
-    print("   for 3D graphics without UI corruption!")
-    
-    return 0 if fixes_applied else 1
-
-if __name__ == "__main__":
-    try:
-        sys.exit(main())
-    except KeyboardInterrupt:
-        print("\n⏹️  Fix interrupted by user")
+#!/usr/bin/env python3
+"""
+UI-Specific DX12 Artifact Fix for Star Wars Battlefront II
+Prevents resolution scaling from affecting UI elements while keeping 3D content scaling intact
+"""
+
+import os
+import sys
+
+from backup_store import BackupStore
+from change_journal import ChangeJournal
+from settings_document import SettingsDocument
+
+# UI-specific rendering fixes (BootOptions)
+UI_NATIVE_RESOLUTION_FIXES = [
+    'GstRender.EnableDx12 1',  # Keep DX12 enabled
+    'GstRender.UI.ForceNativeResolution 1',  # Force UI native res
+    'GstRender.UI.DisableScaling 1',  # Disable UI scaling
+    'GstRender.UI.UseSeparateRenderTarget 1',  # Separate UI rendering
+    'GstRender.UI.ForceScreenDepth 1',  # Keep UI at screen depth
+]
+
+# Allow 3D scaling but protect UI (ProfileOptions_profile)
+UI_RENDER_PATH_FIXES = [
+    'GstRender.ResolutionScale 1.200000',  # Keep your desired 3D scaling
+    'GstRender.UI.ResolutionScale 1.000000',  # Force UI to 100%
+    'GstRender.UI.BypassScaling 1',  # Bypass scaling for UI
+    'GstRender.SeparateUIContext 1',  # Separate UI context
+    'GstRender.UIRenderTargetMultiplier 1.0',  # UI at native resolution
+]
+
+# Disable scaling for UI-specific elements (ProfileOptions_profile)
+UI_SCALING_FIXES = [
+    'GstRender.HUD.DisableScaling 1',  # HUD elements
+    'GstRender.Menu.DisableScaling 1',  # Menu elements
+    'GstRender.Text.DisableScaling 1',  # Text rendering
+    'GstRender.UI.AntiAliasing 0',  # Disable UI AA that causes artifacts
+    'GstRender.UI.FilterMode 0',  # Use nearest neighbor for UI
+]
+
+# DX12 UI-specific fixes (BootOptions)
+UI_DX12_FIXES = [
+    'GstRender.Dx12.UIDescriptorHeap 512',  # Smaller heap for UI
+    'GstRender.Dx12.UIForceSRGB 1',  # Force sRGB for UI
+    'GstRender.Dx12.UIDisableBuffering 1',  # Disable UI buffering
+    'GstRender.Dx12.UISingleThreaded 1',  # Single-threaded UI
+    'GstRender.Dx12.UICompatMode 1',  # Compatibility mode for UI
+]
+
+# Registry values read by the game for UI rendering (HKCU)
+UI_REGISTRY_KEY = r"Software\EA Games\STAR WARS Battlefront II"
+UI_REGISTRY_FIXES = [
+    ("GstRender.UI.ForceNativeRes", 1),
+    ("GstRender.UI.DisableHWScaling", 1),
+]
+
+# UI-optimized profile written next to the settings files
+UI_FIX_PROFILE = """# UI-Optimized DX12 settings - keeps 3D scaling, fixes UI
+GstRender.EnableDx12 1
+GstRender.ResolutionScale 1.200000
+GstRender.UI.ResolutionScale 1.000000
+GstRender.UI.ForceNativeResolution 1
+GstRender.UI.DisableScaling 1
+GstRender.UI.UseSeparateRenderTarget 1
+GstRender.UI.ForceScreenDepth 1
+GstRender.UI.BypassScaling 1
+GstRender.SeparateUIContext 1
+GstRender.UIRenderTargetMultiplier 1.0
+GstRender.HUD.DisableScaling 1
+GstRender.Menu.DisableScaling 1
+GstRender.Text.DisableScaling 1
+GstRender.UI.AntiAliasing 0
+GstRender.UI.FilterMode 0
+GstRender.Dx12.UIDescriptorHeap 512
+GstRender.Dx12.UIForceSRGB 1
+GstRender.Dx12.UIDisableBuffering 1
+GstRender.Dx12.UISingleThreaded 1
+GstRender.Dx12.UICompatMode 1
+"""
+
+# Sections of a fix profile (see profile_sync.py for fetching one from a server)
+PROFILE_FORMAT = 1
+PROFILE_SECTIONS = ("native_resolution", "render_path", "scaling", "dx12")
+# Settings file each section is written to
+PROFILE_FILES = {
+    "BootOptions": ("native_resolution", "dx12"),
+    "ProfileOptions_profile": ("render_path", "scaling"),
+}
+
+DEFAULT_SETTINGS_PATH = os.path.join(os.path.expanduser("~"), "Documents", "STAR WARS Battlefront II", "settings")
+
+
+def builtin_profile():
+    """The fixes above as a profile dict, the shape profile_sync serves and caches"""
+    return {
+        "format": PROFILE_FORMAT,
+        "name": "ui-fix",
+        "native_resolution": list(UI_NATIVE_RESOLUTION_FIXES),
+        "render_path": list(UI_RENDER_PATH_FIXES),
+        "scaling": list(UI_SCALING_FIXES),
+        "dx12": list(UI_DX12_FIXES),
+        "ui_fix_profile": UI_FIX_PROFILE,
+    }
+
+
+def validate_profile(profile):
+    """Raise ValueError unless profile has every section in the expected shape"""
+    if not isinstance(profile, dict) or profile.get("format") != PROFILE_FORMAT:
+        raise ValueError("Unsupported fix profile format")
+    for section in PROFILE_SECTIONS:
+        lines = profile.get(section)
+        if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+            raise ValueError(f"Fix profile section {section} must be a list of settings lines")
+    if not isinstance(profile.get("ui_fix_profile"), str):
+        raise ValueError("Fix profile needs ui_fix_profile text")
+    return profile
+
+
+class UIArtifactFixer:
+    def __init__(self, custom_settings_path=None, journal=None, profile=None):
+        if custom_settings_path:
+            self.settings_path = custom_settings_path
+        else:
+            self.settings_path = DEFAULT_SETTINGS_PATH
+        self.boot_options_path = os.path.join(self.settings_path, "BootOptions")
+        self.profile_options_path = os.path.join(self.settings_path, "ProfileOptions_profile")
+        # Parsed settings files, shared by all fixers so each file is read once
+        self.documents = {}
+        self.defer_writes = False
+        # Every change is journaled so it can be rolled back (a batch run passes its own journal)
+        self.journal = journal or ChangeJournal(backups=BackupStore())
+        self.backups = self.journal.backups
+        # Settings lines to apply (the built-in fixes unless a fetched profile is given)
+        self.profile = validate_profile(profile) if profile else builtin_profile()
+    
+    def get_document(self, path):
+        """Return the parsed settings document for path (None if the file is missing)"""
+        if path not in self.documents:
+            if not os.path.exists(path):
+                return None
+            self.documents[path] = SettingsDocument.load(path)
+        return self.documents[path]
+    
+    def patch_settings(self, path, fixes):
+        """Apply fixes to a settings file in memory; written now unless writes are deferred"""
+        document = self.get_document(path)
+        if document is None:
+            return False
+        document.apply(fixes)
+        if not self.defer_writes:
+            self.save_document(path, document)
+        return True
+    
+    def save_document(self, path, document):
+        """Back up the file on disk, then write the document if it changed"""
+        if document.dirty:
+            self.backups.backup(path)
+        self.journal.write_settings(document)
+    
+    def save_documents(self):
+        """Write every modified settings document once"""
+        saved = True
+        for path, document in self.documents.items():
+            try:
+                self.save_document(path, document)
+            except Exception as e:
+                print(f"⚠️  Could not write {os.path.basename(path)}: {e}")
+                saved = False
+        return saved
+    
+    def fix_ui_specific_artifacts(self):
+        """Apply UI-specific fixes while keeping 3D scaling"""
+        print("🎯 Applying targeted UI artifact fixes...")
+        
+        fixes_applied = []
+        self.documents = {}
+        self.defer_writes = True
+        
+        # Fix 1: Force UI to render at native resolution
+        if self.force_ui_native_resolution():
+            fixes_applied.append("UI forced to native resolution")
+        
+        # Fix 2: Separate UI and 3D render paths
+        if self.separate_ui_render_path():
+            fixes_applied.append("UI render path separated from 3D")
+        
+        # Fix 3: Disable UI scaling specifically
+        if self.disable_ui_scaling():
+            fixes_applied.append("UI scaling disabled")
+        
+        # Fix 4: Apply UI-specific DX12 fixes
+        if self.apply_ui_dx12_fixes():
+            fixes_applied.append("UI-specific DX12 optimizations applied")
+        
+        # One write per settings file for the whole run
+        self.defer_writes = False
+        if not self.save_documents():
+            return []
+        
+        return fixes_applied
+    
+    def force_ui_native_resolution(self):
+        """Force UI elements to render at screen resolution regardless of scaling"""
+        try:
+            if self.patch_settings(self.boot_options_path, self.profile["native_resolution"]):
+                print("✅ UI forced to native resolution")
+                return True
+                
+        except Exception as e:
+            print(f"⚠️  Could not force UI native resolution: {e}")
+        
+        return False
+    
+    def separate_ui_render_path(self):
+        """Create separate render path for UI vs 3D content"""
+        try:
+            if self.patch_settings(self.profile_options_path, self.profile["render_path"]):
+                print("✅ UI render path separated from 3D")
+                return True
+                
+        except Exception as e:
+            print(f"⚠️  Could not separate UI render path: {e}")
+        
+        return False
+    
+    def disable_ui_scaling(self):
+        """Disable scaling for specific UI elements"""
+        try:
+            if self.patch_settings(self.profile_options_path, self.profile["scaling"]):
+                print("✅ UI scaling disabled")
+                return True
+                
+        except Exception as e:
+            print(f"⚠️  Could not disable UI scaling: {e}")
+        
+        return False
+    
+    def apply_ui_dx12_fixes(self):
+        """Apply DX12-specific fixes for UI rendering"""
+        try:
+            if self.patch_settings(self.boot_options_path, self.profile["dx12"]):
+                print("✅ DX12 UI optimizations applied")
+                return True
+                
+        except Exception as e:
+            print(f"⚠️  Could not apply DX12 UI fixes: {e}")
+        
+        return False
+    
+    def create_ui_fix_profile(self):
+        """Create a profile optimized for artifact-free UI with 3D scaling"""
+        try:
+            ui_fix_path = os.path.join(self.settings_path, "UI_Fix_Profile")
+            if os.path.exists(ui_fix_path):
+                with open(ui_fix_path, 'r') as f:
+                    if f.read() == self.profile["ui_fix_profile"]:
+                        print(f"✅ UI-optimized profile already up to date: {ui_fix_path}")
+                        return True
+            self.journal.create_file(ui_fix_path, self.profile["ui_fix_profile"])
+            
+            print(f"✅ UI-optimized profile created: {ui_fix_path}")
+            return True
+            
+        except Exception as e:
+            print(f"⚠️  Could not create UI-optimized profile: {e}")
+            return False
+    
+    def apply_registry_ui_fixes(self):
+        """Apply Windows registry fixes for UI rendering"""
+        try:
+            # Registry fixes for UI rendering
+            for name, value in UI_REGISTRY_FIXES:
+                try:
+                    self.journal.set_registry_value("HKCU", UI_REGISTRY_KEY, name, "REG_DWORD", value)
+                except OSError:
+                    pass  # Registry access might fail, that's ok
+            
+            print("✅ Registry UI fixes applied")
+            return True
+            
+        except Exception as e:
+            print(f"⚠️  Registry fixes failed: {e}")
+            return False
+
+def main():
+    print("=" * 65)
+    print("   UI-Specific DX12 Artifact Fix for Battlefront II")
+    print("=" * 65)
+    print()
+    print("This will fix UI artifacts while keeping 3D resolution scaling.")
+    print("Your 3D graphics scaling will remain intact!")
+    print()
+    
+    # Check for custom settings path argument (and --profile-url URL [--profile NAME])
+    args = sys.argv[1:]
+    options = {}
+    for option in ("--profile-url", "--profile"):
+        if option in args[:-1]:
+            position = args.index(option)
+            options[option] = args[position + 1]
+            del args[position:position + 2]
+    profile = None
+    if "--profile-url" in options:
+        from profile_sync import DEFAULT_PROFILE_NAME, fetch_profile
+        name = options.get("--profile", DEFAULT_PROFILE_NAME)
+        try:
+            profile, source = fetch_profile(options["--profile-url"], name)
+            print(f"📥 Using fix profile {name} ({source})")
+        except (RuntimeError, ValueError) as e:
+            print(f"⚠️  Could not get fix profile {name}: {e} - using built-in fixes")
+        print()
+    
+    custom_settings_path = None
+    if args:
+        custom_settings_path = args[0]
+        print(f"Using custom settings path: {custom_settings_path}")
+        print()
+    
+    fixer = UIArtifactFixer(custom_settings_path, profile=profile)
+    fixer.journal.begin("UI artifact fix")
+    
+    # Apply UI-specific fixes
+    print("🎯 Applying surgical UI fixes...")
+    print()
+    
+    fixes_applied = fixer.fix_ui_specific_artifacts()
+    
+    # Apply registry fixes
+    fixer.apply_registry_ui_fixes()
+    
+    if fixes_applied:
+        print("✅ UI fixes applied successfully:")
+        for fix in fixes_applied:
+            print(f"   • {fix}")
+        
+        print()
+        print("🎮 What this does:")
+        print("   • 3D content: Keeps your resolution scaling")
+        print("   • UI elements: Forces native resolution (no artifacts)")
+        print("   • HUD/Menu: Renders at screen depth")
+        print("   • Text: Uses native resolution rendering")
+        
+        print()
+        print("📋 Benefits:")
+        print("   ✅ No more UI corruption/artifacts")
+        print("   ✅ Keep 3D graphics scaling benefits")
+        print("   ✅ Maintain DX12 performance")
+        print("   ✅ Crisp, clean UI elements")
+        
+        print()
+        print("🎮 Restart Battlefront II to apply changes.")
+        
+        # Create backup profile
+        fixer.create_ui_fix_profile()
+        
+    else:
+        print("⚠️  No fixes could be applied.")
+        print("   Try running as Administrator.")
+    
+    print()
+    print("🔄 If UI artifacts still persist:")
+    print("   1. Lower 3D resolution scale to 110% instead of 120%")
+    print("   2. Try the UI_Fix_Profile settings")
+    print("   3. Fallback: Use BattlefrontII_DX12_Fix.bat for DX11")
+    
+    print()
+    print("💡 Pro tip: You can now safely use resolution scaling")
+    print("   for 3D graphics without UI corruption!")
+    print("   Undo every change with: python change_journal.py rollback")
+    
+    fixer.journal.commit()
+    return 0 if fixes_applied else 1
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n⏹️  Fix interrupted by user")
         sys.exit(0)
\ No newline at end of file
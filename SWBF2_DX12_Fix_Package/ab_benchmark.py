@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+A/B Benchmark Runner for Star Wars Battlefront II Fix Profiles
+Applies each settings profile in turn, launches a command (the game, or a
+stand-in workload), records telemetry and the frame-time capture it leaves
+behind, and restores the settings through the change journal. Profiles are
+interleaved across N repetitions and every metric is reported as a median
+with a bootstrap confidence interval for its difference from the first
+(baseline) profile.
+
+Usage: python ab_benchmark.py [profile ...] [--runs N] [--command CMD] [--duration S]
+                              [--process NAME] [--profiles FILE] [--settings DIR] [--game DIR]
+       python ab_benchmark.py --standin-workload   (stand-in game, run by the default command)
+
+The command may use {profile}, {run} and {capture}; it also gets them as
+SWBF2_AB_PROFILE, SWBF2_AB_RUN and SWBF2_AB_CAPTURE, plus SWBF2_AB_FILES
+(the profile's settings files). A frame-time CSV written to the capture path
+(e.g. by PresentMon) is analyzed after each run.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shlex
+import shutil
+import signal
+import logging
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from backup_store import BackupStore
+from change_journal import ChangeJournal
+from frame_analysis import analyze_capture
+from settings_document import SettingsDocument
+from telemetry import DEFAULT_RATE, TelemetrySampler, open_telemetry_source, summarize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULTS_DIR = Path(__file__).resolve().parent / "ABResults"
+DEFAULT_SETTINGS_PATH = os.path.join(os.path.expanduser("~"), "Documents", "STAR WARS Battlefront II", "settings")
+DEFAULT_RUNS = 5
+DEFAULT_PROCESS_TIMEOUT = 120.0
+BOOTSTRAP_RESAMPLES = 2000
+CONFIDENCE = 0.95
+# The percentile bootstrap of a median is overconfident on fewer runs than
+# this (about 1 in 10 identical pairs looks different on 3 runs each)
+MIN_SIGNIFICANCE_SAMPLES = 5
+
+# Metric name -> True if higher is better
+METRICS = {
+    "average_fps": True,
+    "low_1_fps": True,
+    "low_01_fps": True,
+    "p99_ms": False,
+    "stutters": False,
+    "cpu_mean": False,
+    "working_set_peak_mb": False,
+    "private_bytes_peak_mb": False,
+    "wall_time": False,
+}
+
+# What SWBF2DX12Fixer.enable_dx12_mode writes to Scripts/Win32Game.cfg
+STOCK_DX12_SETTINGS = [
+    'GstRender.Dx12Enabled 1',
+    'GstRender.ResolutionScale 1.200000',
+    'GstRender.UIResolutionScale 1.0',
+]
+
+
+class BenchmarkProfile(NamedTuple):
+    """A named set of "Key Value" settings per settings file"""
+    name: str
+    files: Dict[str, List[str]]
+
+
+class RunResult(NamedTuple):
+    profile: str
+    repetition: int
+    exit_code: Optional[int]
+    metrics: Dict[str, float]
+
+
+class MetricComparison(NamedTuple):
+    metric: str
+    profile: str
+    median: float
+    baseline_median: float
+    ci_low: float          # bounds of the median difference (profile - baseline)
+    ci_high: float
+    samples: int
+    baseline_samples: int
+
+    @property
+    def difference(self) -> float:
+        return self.median - self.baseline_median
+
+    @property
+    def enough_samples(self) -> bool:
+        return min(self.samples, self.baseline_samples) >= MIN_SIGNIFICANCE_SAMPLES
+
+    @property
+    def significant(self) -> bool:
+        return self.enough_samples and (self.ci_low > 0 or self.ci_high < 0)
+
+    @property
+    def better(self) -> bool:
+        return (self.difference > 0) == METRICS.get(self.metric, True)
+
+
+def builtin_profiles(settings_path: str = DEFAULT_SETTINGS_PATH,
+                     game_path: Optional[str] = None) -> Dict[str, BenchmarkProfile]:
+    """baseline: the settings as found; ui-fix: the UI artifact fixer's settings;
+    stock-dx12: enable_dx12_mode (needs the game path)"""
+    from Fix_UI_Artifacts import UI_DX12_FIXES, UI_NATIVE_RESOLUTION_FIXES, UI_RENDER_PATH_FIXES, UI_SCALING_FIXES
+
+    profiles = {
+        "baseline": BenchmarkProfile("baseline", {}),
+        "ui-fix": BenchmarkProfile("ui-fix", {
+            os.path.join(settings_path, "BootOptions"): UI_NATIVE_RESOLUTION_FIXES + UI_DX12_FIXES,
+            os.path.join(settings_path, "ProfileOptions_profile"): UI_RENDER_PATH_FIXES + UI_SCALING_FIXES,
+        }),
+    }
+    if game_path:
+        profiles["stock-dx12"] = BenchmarkProfile("stock-dx12", {
+            os.path.join(game_path, "Scripts", "Win32Game.cfg"): STOCK_DX12_SETTINGS,
+        })
+    return profiles
+
+
+def load_profiles(path, settings_path: str = DEFAULT_SETTINGS_PATH) -> Dict[str, BenchmarkProfile]:
+    """Profiles from JSON: {"name": {"BootOptions": ["Key Value", ...], ...}}.
+
+    Relative file names are resolved against the settings directory.
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return {name: BenchmarkProfile(name, {os.path.join(settings_path, target): list(lines)
+                                          for target, lines in files.items()})
+            for name, files in data.items()}
+
+
+# -- statistics -------------------------------------------------------------
+
+def bootstrap_median_difference(samples: Sequence[float], baseline: Sequence[float],
+                                resamples: int = BOOTSTRAP_RESAMPLES, confidence: float = CONFIDENCE,
+                                seed: int = 0) -> Tuple[float, float]:
+    """Percentile bootstrap interval of median(samples) - median(baseline)"""
+    rng = random.Random(seed)
+    differences = sorted(
+        statistics.median(rng.choices(samples, k=len(samples))) -
+        statistics.median(rng.choices(baseline, k=len(baseline)))
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    return differences[int(tail * (resamples - 1))], differences[int(round((1 - tail) * (resamples - 1)))]
+
+
+def compare(results: Sequence[RunResult], baseline: str) -> List[MetricComparison]:
+    """Per profile and metric: medians and the interval of the difference from the baseline profile"""
+    values = {}  # type: Dict[Tuple[str, str], List[float]]
+    for result in results:
+        for metric, value in result.metrics.items():
+            values.setdefault((result.profile, metric), []).append(value)
+
+    profiles = []  # type: List[str]
+    for result in results:
+        if result.profile not in profiles:
+            profiles.append(result.profile)
+
+    comparisons = []
+    for profile in profiles:
+        for metric in METRICS:
+            samples, reference = values.get((profile, metric)), values.get((baseline, metric))
+            if not samples or not reference:
+                continue
+            if profile == baseline:
+                low = high = 0.0
+            else:
+                low, high = bootstrap_median_difference(samples, reference)
+            comparisons.append(MetricComparison(metric, profile, statistics.median(samples),
+                                                statistics.median(reference), low, high, len(samples),
+                                                len(reference)))
+    return comparisons
+
+
+# -- running ----------------------------------------------------------------
+
+class ABRunner:
+    """Runs every profile N times (interleaved) and collects per-run metrics"""
+
+    def __init__(self, profiles: Sequence[BenchmarkProfile], command, repetitions: int = DEFAULT_RUNS,
+                 duration: Optional[float] = None, process_name: Optional[str] = None,
+                 output_dir: Path = DEFAULT_RESULTS_DIR, journal: Optional[ChangeJournal] = None,
+                 telemetry_rate: float = DEFAULT_RATE):
+        if len(profiles) < 2:
+            raise ValueError("An A/B run needs at least two profiles")
+        self.profiles = list(profiles)
+        self.command = command
+        self.repetitions = repetitions
+        self.duration = duration
+        self.process_name = process_name
+        self.output_dir = Path(output_dir)
+        self.journal = journal or ChangeJournal()
+        self.telemetry_rate = telemetry_rate
+        self.results = []  # type: List[RunResult]
+
+    def apply_profile(self, profile: BenchmarkProfile) -> str:
+        """Write the profile's settings as one journal run; returns the run ID to roll back"""
+        run_id = self.journal.begin(f"A/B profile {profile.name}")
+        try:
+            for path, lines in profile.files.items():
+                if os.path.exists(path):
+                    document = SettingsDocument.load(path)
+                else:
+                    document = SettingsDocument(path=path, trailing_newline=True)
+                document.apply(lines)
+                self.journal.write_settings(document)
+        finally:
+            self.journal.commit()
+        return run_id
+
+    def _command_line(self, profile: BenchmarkProfile, repetition: int, capture: Path) -> List[str]:
+        fields = {"profile": profile.name, "run": repetition, "capture": str(capture)}
+        if isinstance(self.command, str):
+            return [part.format(**fields) for part in shlex.split(self.command, posix=os.name != 'nt')]
+        return [str(part).format(**fields) for part in self.command]
+
+    def _target_pid(self, launched: subprocess.Popen) -> Optional[int]:
+        """The launched process, or the named process it starts (e.g. a launcher starting the game)"""
+        if not self.process_name:
+            return launched.pid
+        from process_watch import ProcessWatcher
+        watcher = ProcessWatcher([self.process_name])
+        try:
+            event = watcher.wait_for_process(timeout=DEFAULT_PROCESS_TIMEOUT)
+        finally:
+            watcher.close()
+        return event.pid if event else None
+
+    def run_once(self, profile: BenchmarkProfile, repetition: int) -> RunResult:
+        run_dir = self.output_dir / profile.name
+        run_dir.mkdir(parents=True, exist_ok=True)
+        capture = run_dir / f"run{repetition}.csv"
+        if capture.exists():
+            capture.unlink()
+        environment = dict(os.environ, SWBF2_AB_PROFILE=profile.name, SWBF2_AB_RUN=str(repetition),
+                           SWBF2_AB_CAPTURE=str(capture), SWBF2_AB_FILES=os.pathsep.join(profile.files))
+
+        start = time.monotonic()
+        launched = subprocess.Popen(self._command_line(profile, repetition, capture), env=environment)
+        pid = self._target_pid(launched)
+        sampler = None
+        if pid is not None:
+            try:
+                sampler = TelemetrySampler(open_telemetry_source(pid), self.telemetry_rate).start()
+            except (ProcessLookupError, RuntimeError) as e:
+                logger.warning(f"No telemetry for {profile.name} run {repetition}: {e}")
+
+        try:
+            exit_code = launched.wait(timeout=self.duration)
+        except subprocess.TimeoutExpired:
+            exit_code = None
+            self._stop(launched, pid)
+        if sampler is not None:
+            if pid != launched.pid:
+                sampler.join(self.duration)  # The game may outlive its launcher
+            sampler.stop()
+        elapsed = time.monotonic() - start
+
+        metrics = {"wall_time": elapsed}
+        if sampler is not None:
+            samples = sampler.samples()
+            sampler.save(run_dir / f"run{repetition}.swtl", pid)
+            usage = summarize(samples)
+            if usage:
+                metrics.update(cpu_mean=usage["cpu_mean"],
+                               working_set_peak_mb=usage["working_set_peak"] / (1024 * 1024),
+                               private_bytes_peak_mb=usage["private_bytes_peak"] / (1024 * 1024))
+        if capture.exists():
+            try:
+                frames = analyze_capture(capture)
+            except ValueError as e:
+                logger.warning(f"Unreadable capture {capture}: {e}")
+            else:
+                if frames.frames:
+                    metrics.update(average_fps=frames.average_fps, low_1_fps=frames.low_1_fps,
+                                   low_01_fps=frames.low_01_fps, p99_ms=frames.percentiles_ms["99"],
+                                   stutters=frames.stutters)
+        return RunResult(profile.name, repetition, exit_code, metrics)
+
+    def _stop(self, launched: subprocess.Popen, pid: Optional[int]):
+        if pid is not None and pid != launched.pid:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        launched.terminate()
+        try:
+            launched.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            launched.kill()
+            launched.wait()
+
+    def run(self) -> List[RunResult]:
+        """Every repetition runs each profile once, rotating the order to spread drift evenly"""
+        self.results = []
+        for repetition in range(self.repetitions):
+            shift = repetition % len(self.profiles)
+            for profile in self.profiles[shift:] + self.profiles[:shift]:
+                print(f"▶️  {profile.name} (run {repetition + 1}/{self.repetitions})")
+                run_id = self.apply_profile(profile)
+                try:
+                    result = self.run_once(profile, repetition)
+                finally:
+                    self.journal.rollback(run_id)
+                self.results.append(result)
+                logger.info(f"A/B {profile.name} run {repetition}: {result.metrics}")
+        return self.results
+
+    def report(self) -> dict:
+        baseline = self.profiles[0].name
+        comparisons = compare(self.results, baseline)
+        return {
+            "baseline": baseline,
+            "repetitions": self.repetitions,
+            "runs": [result._asdict() for result in self.results],
+            "comparisons": [dict(comparison._asdict(), difference=comparison.difference,
+                                 significant=comparison.significant) for comparison in comparisons],
+        }
+
+
+def print_report(comparisons: Sequence[MetricComparison], baseline: str):
+    print(f"{'metric':<22} {'profile':<16} {'median':>10} {'vs ' + baseline:>14} "
+          f"{'95% CI of difference':>26}")
+    for comparison in comparisons:
+        if comparison.profile == baseline:
+            print(f"{comparison.metric:<22} {comparison.profile:<16} {comparison.median:>10.2f}")
+            continue
+        marker = ""
+        if comparison.significant:
+            marker = "  ✅ better" if comparison.better else "  ❌ worse"
+        print(f"{comparison.metric:<22} {comparison.profile:<16} {comparison.median:>10.2f} "
+              f"{comparison.difference:>+14.2f} [{comparison.ci_low:>+10.2f}, {comparison.ci_high:>+10.2f}]{marker}")
+    if not all(comparison.enough_samples for comparison in comparisons):
+        print(f"\n⚠️  Fewer than {MIN_SIGNIFICANCE_SAMPLES} runs per profile: differences are not marked "
+              f"better or worse (use --runs {MIN_SIGNIFICANCE_SAMPLES} or more)")
+
+
+# -- stand-in workload ------------------------------------------------------
+
+def standin_workload(duration: float = 3.0):
+    """Pretend game: renders "frames" whose cost grows with the applied ResolutionScale and
+    writes them as a PresentMon capture to SWBF2_AB_CAPTURE"""
+    scale = 1.0
+    for path in filter(None, os.environ.get("SWBF2_AB_FILES", "").split(os.pathsep)):
+        if os.path.exists(path):
+            value = SettingsDocument.load(path).get("GstRender.ResolutionScale")
+            try:
+                scale = float(value) if value is not None else scale
+            except ValueError:
+                pass
+    frame_work = int(20000 * scale * scale)
+    rng = random.Random()
+    frames = []
+    end = time.perf_counter() + duration
+    last = time.perf_counter()
+    while last < end:
+        total = 0
+        for i in range(frame_work + rng.randrange(frame_work // 10 + 1)):
+            total += i
+        now = time.perf_counter()
+        frames.append((now - last) * 1000)
+        last = now
+
+    capture = os.environ.get("SWBF2_AB_CAPTURE")
+    if capture:
+        with open(capture, 'w') as f:
+            f.write("Application,ProcessID,MsBetweenPresents\n")
+            for frame in frames:
+                f.write(f"standin,{os.getpid()},{frame:.4f}\n")
+
+
+def _option(args: List[str], name: str, default=None):
+    if name in args[:-1]:
+        position = args.index(name)
+        value = args[position + 1]
+        del args[position:position + 2]
+        return value
+    return default
+
+
+def main():
+    args = sys.argv[1:]
+    if "--standin-workload" in args:
+        standin_workload(float(os.environ.get("SWBF2_AB_DURATION", "3")))
+        return 0
+
+    runs = int(_option(args, "--runs", DEFAULT_RUNS))
+    command = _option(args, "--command") or [sys.executable, os.path.abspath(__file__), "--standin-workload"]
+    duration = _option(args, "--duration")
+    process_name = _option(args, "--process")
+    profiles_file = _option(args, "--profiles")
+    settings_path = _option(args, "--settings")
+    scratch_dir = journal = None
+    if settings_path is None:
+        settings_path = DEFAULT_SETTINGS_PATH
+        if not os.path.isdir(settings_path):
+            # No game settings here (e.g. Linux): profiles go to a scratch directory instead,
+            # journaled there too so the package's Backups/ never lists them
+            scratch_dir = Path(tempfile.mkdtemp(prefix="swbf2_ab_"))
+            settings_path = str(scratch_dir / "settings")
+            os.mkdir(settings_path)
+            journal = ChangeJournal(scratch_dir / "journal.jsonl", BackupStore(scratch_dir / "Backups"))
+            print(f"ℹ️  No settings directory at {DEFAULT_SETTINGS_PATH}; using {settings_path}")
+    game_path = _option(args, "--game")
+    if game_path is None:
+        from game_discovery import find_game_installation
+        install = find_game_installation()
+        game_path = install.path if install else None
+
+    available = load_profiles(profiles_file, settings_path) if profiles_file else \
+        builtin_profiles(settings_path, game_path)
+    names = args or list(available)
+    missing = [name for name in names if name not in available]
+    if missing or len(names) < 2:
+        print(f"❌ Need at least two profiles out of: {', '.join(available) or 'none'}"
+              + (f" (unknown: {', '.join(missing)})" if missing else ""))
+        return 1
+
+    output_dir = DEFAULT_RESULTS_DIR / time.strftime('%Y%m%d-%H%M%S')
+    runner = ABRunner([available[name] for name in names], command, runs,
+                      float(duration) if duration else None, process_name, output_dir, journal)
+    print(f"📊 A/B benchmark: {', '.join(names)} x {runs} run(s), baseline {names[0]}")
+    try:
+        runner.run()
+    except KeyboardInterrupt:
+        print("\nInterrupted; settings of the current profile were restored")
+        return 1
+    finally:
+        if scratch_dir:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    report = runner.report()
+    with open(output_dir / "report.json", 'w') as f:
+        json.dump(report, f, indent=2)
+    print()
+    print_report(compare(runner.results, names[0]), names[0])
+    print(f"\n📁 Captures, telemetry and report.json: {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
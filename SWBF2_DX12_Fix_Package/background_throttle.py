@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Background Process Throttler for Star Wars Battlefront II
+While the game runs, demotes launchers, overlays, updaters and browsers
+listed in background_processes.json: lower CPU priority, lower I/O priority
+and an affinity mask away from the game's cores (the E-cores on hybrid CPUs).
+On Linux these are per-thread settings, so every thread is demoted. Every
+original value is recorded in throttle_state.json before it is changed
+and put back exactly when the game exits, or by ``restore`` after a crash.
+
+Usage: python background_throttle.py list [name ...]
+       python background_throttle.py run <game_pid> [name ...]
+       python background_throttle.py restore
+"""
+
+import os
+import sys
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from platform_backends import thread_ids
+from process_watch import ProcessNameMatcher, load_psutil
+from scheduling_policy import PROCESS_PRIORITIES, CpuTopology, priority_value, read_cpu_topology
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_FORMAT = 1
+PACKAGE_DIR = Path(__file__).resolve().parent
+DEFAULT_CONFIG_PATH = PACKAGE_DIR / "background_processes.json"
+DEFAULT_STATE_PATH = PACKAGE_DIR / "throttle_state.json"
+DEFAULT_RESCAN_INTERVAL = 5.0  # seconds between scans for background processes started later
+IO_PRIORITIES = ("idle", "low", "normal")
+
+
+class ThrottleConfig(NamedTuple):
+    processes: List[str]
+    priority: Optional[str] = "below_normal"  # key of PROCESS_PRIORITIES; None leaves it alone
+    io_priority: Optional[str] = "low"        # one of IO_PRIORITIES
+    cpus: object = "efficiency"               # "efficiency", a CPU count, or None
+    rescan_interval: float = DEFAULT_RESCAN_INTERVAL
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_CONFIG_PATH) -> 'ThrottleConfig':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("format") != THROTTLE_FORMAT:
+            raise ValueError(f"Unsupported background process format: {data.get('format')!r}")
+        config = cls(data["processes"], data.get("priority"), data.get("io_priority"),
+                     data.get("cpus"), data.get("rescan_interval", DEFAULT_RESCAN_INTERVAL))
+        if config.priority is not None and config.priority not in PROCESS_PRIORITIES:
+            raise ValueError(f"Unknown priority {config.priority!r}")
+        if config.io_priority is not None and config.io_priority not in IO_PRIORITIES:
+            raise ValueError(f"Unknown I/O priority {config.io_priority!r}")
+        if not (config.cpus is None or config.cpus == "efficiency"
+                or (isinstance(config.cpus, int) and config.cpus > 0)):
+            raise ValueError(f"cpus must be \"efficiency\", a positive count or null, not {config.cpus!r}")
+        return config
+
+
+class ThrottleRecord(NamedTuple):
+    """Original scheduling values of one demoted process (None: left unchanged)"""
+    pid: int
+    name: str
+    create_time: float                # tells a restarted process apart from a reused PID
+    priority: Optional[int]           # psutil nice() value
+    io_priority: Optional[List[int]]  # psutil ionice(): [class, value] on Linux, [level] on Windows
+    affinity: Optional[List[int]]
+    threads: Optional[List[list]] = None  # [tid, priority, io_priority, affinity] of other threads (Linux)
+
+
+def background_cpus(topology: CpuTopology, cpus) -> Optional[List[int]]:
+    """Logical CPUs background processes are confined to (None: leave affinity alone).
+
+    "efficiency" means the lowest efficiency class of a hybrid CPU; a count
+    takes that many CPUs from the slowest, highest-numbered cores down.
+    """
+    if cpus is None:
+        return None
+    if cpus == "efficiency":
+        if not topology.hybrid:
+            return None
+        slowest = min(core.efficiency for core in topology.cores)
+        return sorted(cpu for core in topology.cores if core.efficiency == slowest for cpu in core.cpus)
+    if cpus >= topology.logical_count:
+        return None
+    cores = sorted(topology.cores, key=lambda core: (core.efficiency, -core.cpus[0]))
+    chosen = [cpu for core in cores for cpu in reversed(core.cpus)][:cpus]
+    return sorted(chosen)
+
+
+def _io_priority_value(psutil, level: str) -> List:
+    """psutil ionice() arguments for an I/O priority level"""
+    if sys.platform == 'win32':
+        return [{"idle": psutil.IOPRIO_VERYLOW, "low": psutil.IOPRIO_LOW, "normal": psutil.IOPRIO_NORMAL}[level]]
+    # Linux: best-effort class levels run 0 (highest) to 7; idle class only gets otherwise unused disk time
+    return {"idle": [psutil.IOPRIO_CLASS_IDLE, 0], "low": [psutil.IOPRIO_CLASS_BE, 7],
+            "normal": [psutil.IOPRIO_CLASS_BE, 4]}[level]
+
+
+def _read_scheduling(process) -> tuple:
+    """(priority, io_priority, affinity) of a process, or of a thread on Linux"""
+    with process.oneshot():
+        priority = process.nice()
+        io_priority = None
+        if hasattr(process, "ionice"):
+            current = process.ionice()
+            io_priority = [int(current)] if sys.platform == 'win32' else [int(value) for value in current]
+        affinity = process.cpu_affinity() if hasattr(process, "cpu_affinity") else None
+    return priority, io_priority, affinity
+
+
+def _apply_scheduling(psutil, process, priority: Optional[int], io_priority: Optional[List[int]],
+                      affinity: Optional[List[int]]):
+    if priority is not None:
+        process.nice(priority)
+    if io_priority is not None:
+        _set_io_priority(psutil, process, io_priority)
+    if affinity is not None:
+        process.cpu_affinity(affinity)
+
+
+def _changed_only(values: tuple, targets: tuple) -> list:
+    """The original values that are about to change (None for the rest)"""
+    return [value if target is not None else None for value, target in zip(values, targets)]
+
+
+def _threads(psutil, pid: int) -> list:
+    """psutil handles of a process's other threads: on Linux nice, ionice and
+    affinity address a single thread, and psutil.Process(tid) reaches it"""
+    if sys.platform == 'win32':
+        return []
+    threads = []
+    for tid in thread_ids(pid)[1:]:
+        try:
+            threads.append(psutil.Process(tid))
+        except psutil.NoSuchProcess:
+            continue  # Exited meanwhile
+    return threads
+
+
+def _set_io_priority(psutil, process, value: List[int]):
+    if sys.platform == 'win32':
+        process.ionice(value[0])
+    elif value[0] in (psutil.IOPRIO_CLASS_NONE, psutil.IOPRIO_CLASS_IDLE):
+        process.ionice(value[0])  # These classes take no level
+    else:
+        process.ionice(value[0], value[1])
+
+
+CAP_SYS_NICE = 23
+
+
+def lowest_settable_nice() -> Optional[int]:
+    """Lowest nice value this process may set on its own processes (None: no limit, e.g. Windows).
+
+    Unprivileged Linux processes can only raise nice values, down to
+    20 - RLIMIT_NICE; root and CAP_SYS_NICE can set any value.
+    """
+    if sys.platform == 'win32' or not hasattr(os, "geteuid"):
+        return None
+    if os.geteuid() == 0:
+        return -20
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("CapEff:") and int(line.split()[1], 16) & (1 << CAP_SYS_NICE):
+                    return -20
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+        limit = resource.getrlimit(resource.RLIMIT_NICE)[0]
+    except (ImportError, AttributeError, OSError, ValueError):
+        return 20
+    if limit == resource.RLIM_INFINITY:
+        return -20
+    return max(-20, min(20, 20 - limit))
+
+
+def _priority_rank(psutil, value: int) -> int:
+    """Orders priority values from lowest to highest scheduling priority"""
+    if sys.platform == 'win32':
+        classes = [getattr(psutil, PROCESS_PRIORITIES[level][0]) for level in
+                   ("idle", "below_normal", "normal", "above_normal", "high")] + [psutil.REALTIME_PRIORITY_CLASS]
+        return classes.index(value) if value in classes else len(classes)
+    return -value
+
+
+class BackgroundThrottler:
+    """Demotes matching processes while a game process runs and restores them afterwards.
+
+    ``start`` scans on a background thread until the game exits or ``stop``
+    is called; ``stop`` (or ``restore``) puts every recorded value back.
+    Processes already at or below the target priority keep their priority,
+    and so do processes whose priority could not be put back: on Linux
+    without root, CAP_SYS_NICE or a large enough RLIMIT_NICE only the I/O
+    priority and affinity are changed.
+    """
+
+    def __init__(self, config: ThrottleConfig, state_path: Optional[Path] = DEFAULT_STATE_PATH,
+                 topology: Optional[CpuTopology] = None):
+        self.psutil = load_psutil()
+        if self.psutil is None:
+            raise RuntimeError("Background throttling needs psutil")
+        self.config = config
+        self.state_path = state_path
+        self.matcher = ProcessNameMatcher(config.processes)
+        self.cpus = background_cpus(topology or read_cpu_topology(), config.cpus)
+        self.nice_floor = lowest_settable_nice()
+        self.records = {}  # type: Dict[int, ThrottleRecord]
+        self.errors = []  # type: List[str]
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None  # type: Optional[threading.Thread]
+
+    # -- demoting -------------------------------------------------------
+
+    def throttle(self, exclude: tuple = ()) -> List[ThrottleRecord]:
+        """Demote every matching process not demoted yet; returns the new records"""
+        psutil = self.psutil
+        exclude = set(exclude) | {os.getpid()}
+        added = []
+        known = len(self.records)
+        for process in psutil.process_iter(['name']):
+            if process.pid in exclude or process.pid in self.records:
+                continue
+            if not self.matcher.matches(process.info['name']):
+                continue
+            try:
+                record = self._demote(process)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                continue
+            except (psutil.AccessDenied, OSError) as e:
+                self.errors.append(f"{process.info['name']} ({process.pid}): {e}")
+                continue
+            if record is not None:
+                added.append(record)
+        if len(self.records) != known:
+            self._save()  # Includes processes only partly demoted before an error
+        return added
+
+    def _targets(self, priority: int, io_priority: Optional[List[int]],
+                 affinity: Optional[List[int]]) -> tuple:
+        """(priority, io_priority, affinity) to set on one thread; None where it stays as is"""
+        psutil, config = self.psutil, self.config
+        target_priority = priority_value(config.priority) if config.priority else None
+        if target_priority is not None and _priority_rank(psutil, priority) <= _priority_rank(psutil, target_priority):
+            target_priority = None
+        if target_priority is not None and self.nice_floor is not None and priority < self.nice_floor:
+            # The drop could not be undone (nice values only go up without privileges)
+            target_priority = None
+        target_io = _io_priority_value(psutil, config.io_priority) \
+            if config.io_priority and io_priority is not None else None
+        if target_io == io_priority:
+            target_io = None
+        target_affinity = self.cpus if affinity is not None and self.cpus and self.cpus != affinity else None
+        return target_priority, target_io, target_affinity
+
+    def _demote(self, process) -> Optional[ThrottleRecord]:
+        psutil, config = self.psutil, self.config
+        create_time = process.create_time()
+        original = _read_scheduling(process)
+        targets = self._targets(*original)
+        if config.priority and self.nice_floor is not None and original[0] < self.nice_floor:
+            logger.debug(f"Leaving the priority of {process.info['name']} (PID {process.pid}) alone: "
+                         f"nice {original[0]} cannot be restored below {self.nice_floor}")
+        threads = []  # (thread, original values, targets) of every thread, changed or not
+        for thread in _threads(psutil, process.pid):
+            try:
+                thread_original = _read_scheduling(thread)
+            except psutil.NoSuchProcess:
+                continue
+            threads.append((thread, thread_original, self._targets(*thread_original)))
+        changes = [targets] + [thread_targets for _, _, thread_targets in threads]
+        if all(value is None for change in changes for value in change):
+            return None
+
+        # Record first, so a partial failure below is still undone
+        record = ThrottleRecord(process.pid, process.info['name'], create_time, *_changed_only(original, targets),
+                                threads=[[thread.pid] + _changed_only(values, thread_targets)
+                                         for thread, values, thread_targets in threads])
+        with self.lock:
+            self.records[process.pid] = record
+        _apply_scheduling(psutil, process, *targets)
+        for thread, _, thread_targets in threads:
+            try:
+                _apply_scheduling(psutil, thread, *thread_targets)
+            except psutil.NoSuchProcess:
+                continue  # The thread exited meanwhile
+        logger.info(f"Throttled {record.name} (PID {record.pid}, {len(threads) + 1} thread(s))")
+        return record
+
+    # -- restoring ------------------------------------------------------
+
+    def restore(self) -> int:
+        """Put back every recorded value; returns the number of processes restored"""
+        with self.lock:
+            records = list(self.records.values())
+            self.records.clear()
+        restored = restore_records(self.psutil, records, self.errors)
+        self._save()
+        return restored
+
+    def _save(self):
+        if self.state_path is None:
+            return
+        with self.lock:
+            records = [record._asdict() for record in self.records.values()]
+        if not records:
+            if self.state_path.exists():
+                self.state_path.unlink()
+            return
+        temp = self.state_path.with_suffix(".tmp")
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({"format": THROTTLE_FORMAT, "records": records}, f, indent=2)
+        os.replace(temp, self.state_path)
+
+    # -- running alongside the game ---------------------------------------
+
+    def start(self, game_pid: int) -> 'BackgroundThrottler':
+        self.thread = threading.Thread(target=self._run, args=(game_pid,), name="throttle", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> int:
+        """Stop scanning and restore everything; returns the number of processes restored"""
+        self.stop_event.set()
+        self.join(timeout)
+        return self.restore()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the game to exit; True if it has"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+            return not self.thread.is_alive()
+        return True
+
+    def _run(self, game_pid: int):
+        psutil = self.psutil
+        try:
+            game = psutil.Process(game_pid)
+        except psutil.NoSuchProcess:
+            return
+        while not self.stop_event.is_set():
+            self.throttle(exclude=(game_pid,))
+            try:
+                game.wait(self.config.rescan_interval)
+                break  # The game exited
+            except psutil.TimeoutExpired:
+                pass
+
+
+def restore_records(psutil, records: List[ThrottleRecord], errors: Optional[List[str]] = None) -> int:
+    """Restore recorded values to processes that still exist; returns how many were restored.
+
+    Threads started after the demotion inherited demoted values and get the
+    process's original ones.
+    """
+    restored = 0
+    for record in records:
+        try:
+            process = psutil.Process(record.pid)
+            if abs(process.create_time() - record.create_time) > 0.01:
+                continue  # The PID now belongs to another process
+            _apply_scheduling(psutil, process, record.priority, record.io_priority, record.affinity)
+            recorded = {values[0]: values[1:] for values in record.threads or []}
+            for thread in _threads(psutil, record.pid):
+                if thread.pid in recorded:
+                    try:
+                        _apply_scheduling(psutil, thread, *recorded[thread.pid])
+                    except psutil.NoSuchProcess:
+                        continue  # Exited meanwhile
+                    continue
+                try:
+                    _apply_scheduling(psutil, thread, record.priority, record.io_priority, record.affinity)
+                except (psutil.Error, OSError) as e:
+                    logger.debug(f"Could not restore new thread {thread.pid} of {record.name}: {e}")
+            restored += 1
+            logger.info(f"Restored {record.name} (PID {record.pid})")
+        except psutil.NoSuchProcess:
+            continue
+        except (psutil.AccessDenied, OSError) as e:
+            if errors is not None:
+                errors.append(f"restore {record.name} ({record.pid}): {e}")
+            logger.warning(f"Could not restore {record.name} (PID {record.pid}): {e}")
+    return restored
+
+
+def restore_saved(state_path: Path = DEFAULT_STATE_PATH) -> int:
+    """Restore what a throttler that did not finish (crash, power loss) left demoted"""
+    if not state_path.exists():
+        return 0
+    psutil = load_psutil()
+    if psutil is None:
+        raise RuntimeError("Background throttling needs psutil")
+    with open(state_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    restored = restore_records(psutil, [ThrottleRecord(**record) for record in data.get("records", [])])
+    state_path.unlink()
+    return restored
+
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else "list"
+    try:
+        if command == "restore":
+            print(f"✅ Restored {restore_saved()} process(es)")
+            return 0
+        config = ThrottleConfig.load()
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    names = args[2:] if command == "run" else args[1:]
+    if names:
+        config = config._replace(processes=names)
+    psutil = load_psutil()
+    if psutil is None:
+        print("❌ Background throttling needs psutil (pip install psutil)")
+        return 1
+
+    if command == "list":
+        matcher = ProcessNameMatcher(config.processes)
+        matching = [process for process in psutil.process_iter(['name']) if matcher.matches(process.info['name'])]
+        print(f"🔎 {len(matching)} running background process(es) to throttle")
+        for process in matching:
+            print(f"   {process.pid:>7}  {process.info['name']}")
+        return 0
+
+    if command == "run" and len(args) > 1:
+        throttler = BackgroundThrottler(config)
+        print(f"🐢 Throttling background processes until PID {args[1]} exits (Ctrl+C to stop)...")
+        throttler.start(int(args[1]))
+        try:
+            while not throttler.join(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        throttled = len(throttler.records)
+        restored = throttler.stop()
+        print(f"✅ Restored {restored} of {throttled} throttled process(es)")
+        for error in throttler.errors:
+            print(f"   ⚠️  {error}")
+        return 0
+
+    print("Usage: python background_throttle.py list [name ...] | run <game_pid> [name ...] | restore")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
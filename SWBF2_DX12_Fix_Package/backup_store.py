@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Backup Store for Star Wars Battlefront II
+Keeps every distinct version of the files the fixes modify (Win32Game.cfg,
+BootOptions, ProfileOptions_profile). Contents are hashed while streaming and
+each unique blob is stored once, gzip-compressed, under its SHA-256 digest; a
+per-file generation index records which blob each backup refers to. Backing
+up an unchanged file costs one hash and no write.
+
+Usage: python backup_store.py list
+       python backup_store.py restore <file> [generation]
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent / "Backups"
+STREAM_BLOCK = 1024 * 1024
+
+
+class BackupGeneration(NamedTuple):
+    """One backed-up version of a file"""
+    digest: str
+    size: int
+    created: float
+
+
+def hash_file(path, block_size: int = STREAM_BLOCK) -> str:
+    """SHA-256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_key(path) -> str:
+    return os.path.normcase(str(Path(path).resolve()))
+
+
+class BackupStore:
+    """Deduplicated, compressed file backups with a generation index per source path"""
+
+    def __init__(self, root: Path = DEFAULT_STORE_PATH):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        self.index = {}  # type: Dict[str, List[dict]]
+        self.load_index()
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.index = data.get("files", {}) if data.get("version") == INDEX_VERSION else {}
+
+    def save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": INDEX_VERSION, "files": self.index}, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.gz"
+
+    def generations(self, path) -> List[BackupGeneration]:
+        """Backups of a file, oldest (the original) first"""
+        return [BackupGeneration(**entry) for entry in self.index.get(_source_key(path), [])]
+
+    def backup(self, path) -> Optional[BackupGeneration]:
+        """Record the current contents of path (None if it does not exist).
+
+        Unchanged since the last backup: returns that generation without
+        writing anything. New contents already stored (e.g. the file was
+        restored): adds a generation pointing at the existing blob.
+        """
+        path = Path(path)
+        if not path.is_file():
+            return None
+        digest = hash_file(path)
+        key = _source_key(path)
+        history = self.index.setdefault(key, [])
+        if history and history[-1]["digest"] == digest:
+            return BackupGeneration(**history[-1])
+
+        blob = self.object_path(digest)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob.with_name(blob.name + ".tmp")
+            with open(path, 'rb') as source, gzip.open(tmp_path, 'wb') as target:
+                shutil.copyfileobj(source, target, STREAM_BLOCK)
+            os.replace(tmp_path, blob)
+
+        generation = BackupGeneration(digest, path.stat().st_size, time.time())
+        history.append(generation._asdict())
+        self.save_index()
+        logger.debug(f"Backed up {path} as {digest[:12]}")
+        return generation
+
+    def restore(self, path, generation: int = 0) -> BackupGeneration:
+        """Stream a backup back over path; generation 0 is the original, -1 the latest"""
+        history = self.generations(path)
+        if not history:
+            raise FileNotFoundError(f"No backup recorded for {path}")
+        chosen = history[generation]
+        self.restore_blob(chosen.digest, path)
+        return chosen
+
+    def restore_blob(self, digest: str, path):
+        """Stream a stored blob to path, replacing it atomically"""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".restore")
+        with gzip.open(self.object_path(digest), 'rb') as source, open(tmp_path, 'wb') as target:
+            shutil.copyfileobj(source, target, STREAM_BLOCK)
+        os.replace(tmp_path, path)
+
+    def stored_bytes(self) -> int:
+        """Compressed size of all stored blobs"""
+        if not self.objects_dir.exists():
+            return 0
+        return sum(blob.stat().st_size for blob in self.objects_dir.glob("*/*.gz"))
+
+
+def main():
+    store = BackupStore()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+
+    if command == "list":
+        if not store.index:
+            print("No backups recorded")
+        for source, history in sorted(store.index.items()):
+            print(f"📁 {source}")
+            for number, entry in enumerate(history):
+                created = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry["created"]))
+                print(f"   [{number}] {created}  {entry['size']:>8} bytes  {entry['digest'][:12]}")
+        return 0
+
+    if command == "restore" and len(sys.argv) > 2:
+        generation = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+        try:
+            store.restore(sys.argv[2], generation)
+        except (OSError, IndexError) as e:
+            print(f"❌ Could not restore {sys.argv[2]}: {e}")
+            return 1
+        print(f"✅ Restored {sys.argv[2]}")
+        return 0
+
+    print("Usage: python backup_store.py list | restore <file> [generation]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
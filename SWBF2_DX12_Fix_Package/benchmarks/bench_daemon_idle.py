@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Fix Daemon Idle Benchmark
+Runs the fix daemon with no game running and reports the CPU it used while
+idle (budget: 0.2% of one core), then starts and restarts a stand-in game
+executable and reports how quickly each launch was picked up after the
+poll interval had backed off. With --watch-settings the settings drift
+watcher also runs (on a scratch settings directory) and counts towards the
+idle CPU, as it does for fix_daemon.py --watch-settings.
+
+Usage: python benchmarks/bench_daemon_idle.py [idle_seconds] [launches] [--watch-settings[=inotify|rdcw|poll]]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backup_store import BackupStore
+from change_journal import ChangeJournal
+from drift_watcher import DriftWatcher
+from fix_daemon import FixDaemon
+from Fix_UI_Artifacts import PROFILE_FILES
+
+IDLE_BUDGET = 0.2  # percent of one core
+STANDIN_NAME = "swbf2_standin"
+
+
+class RecordingFixer:
+    """Stands in for SWBF2DX12Fixer: records which processes would have been fixed"""
+
+    throttle_background = False
+    telemetry_rate = None
+
+    def __init__(self, settings_path=None, watch_backend=None):
+        self.fixed = []
+        self.watch_settings = settings_path is not None
+        self.settings_path = settings_path
+        self.watch_backend = watch_backend
+
+    def apply_runtime_fixes(self, process_id, process_name):
+        self.fixed.append((process_id, time.time()))
+        return True
+
+    def start_settings_watch(self):
+        workdir = os.path.dirname(self.settings_path)
+        journal = ChangeJournal(os.path.join(workdir, "journal.jsonl"), BackupStore(os.path.join(workdir, "Backups")))
+        return DriftWatcher(self.settings_path, journal=journal, backend=self.watch_backend).start()
+
+    def stop_settings_watch(self, watcher):
+        watcher.stop()
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    idle_seconds = float(args[0]) if len(args) > 0 else 20.0
+    launches = int(args[1]) if len(args) > 1 else 3
+    watch = [arg.partition("=")[2] for arg in sys.argv[1:] if arg.partition("=")[0] == "--watch-settings"]
+
+    # A renamed copy of the interpreter makes a process the daemon can match by name
+    workdir = tempfile.mkdtemp()
+    standin = os.path.join(workdir, STANDIN_NAME + (".exe" if sys.platform == 'win32' else ""))
+    shutil.copy(sys.executable, standin)
+
+    fixer = RecordingFixer()
+    if watch:
+        settings_path = os.path.join(workdir, "settings")
+        os.mkdir(settings_path)
+        for file_name in PROFILE_FILES:
+            with open(os.path.join(settings_path, file_name), 'w') as f:
+                f.write("GstRender.Dx12Enabled 0\n")
+        fixer = RecordingFixer(settings_path, watch[0] or None)
+    daemon = FixDaemon(fixer, [os.path.basename(standin)], liveness_interval=0.5)
+    thread = threading.Thread(target=daemon.run, daemon=True)
+    thread.start()
+    try:
+        time.sleep(idle_seconds)
+        idle_overhead = daemon.idle_overhead
+        interval = daemon.watcher.current_interval
+        if daemon.drift_watcher is not None:
+            print(f"settings drift watcher: {daemon.drift_watcher.backend.name}")
+        print(f"backend: {daemon.watcher.backend.name}, idle {daemon.idle_elapsed:.1f} s: "
+              f"{idle_overhead:.3f}% of one core (budget {IDLE_BUDGET}%), poll interval {interval * 1000:.0f} ms")
+
+        for launch in range(launches):
+            started = time.time()
+            game = subprocess.Popen([standin, "-c", "import time; time.sleep(2)"])
+            game.wait()
+            time.sleep(3)  # Let the session end and the poll interval back off again
+            detected = [at for pid, at in fixer.fixed if pid == game.pid]
+            latency = f"{(detected[0] - started) * 1000:.0f} ms" if detected else "missed"
+            print(f"launch {launch + 1}: PID {game.pid} fixed after {latency}")
+    finally:
+        daemon.request_stop()
+        thread.join(5)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    sessions = len(daemon.finished)
+    print(f"{sessions} of {launches} launches tracked to exit")
+    return 0 if idle_overhead < IDLE_BUDGET and sessions == launches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Frame-Time Analysis Benchmark
+Writes a synthetic PresentMon capture (steady frames with periodic stutters),
+analyzes it with the NumPy and pure-Python engines and checks the streamed
+histogram results against an exact in-memory computation
+
+Usage: python benchmarks/bench_frame_analysis.py [frame_count]
+"""
+
+import os
+import sys
+import math
+import time
+import random
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_analysis import (HISTOGRAM_RESOLUTION_MS, STUTTER_FACTOR, analyze_capture, numpy,
+                            read_frame_times)
+
+HEADER = ("Application,ProcessID,SwapChainAddress,Runtime,SyncInterval,PresentFlags,Dropped,"
+          "TimeInSeconds,MsBetweenPresents,MsBetweenDisplayChange,MsInPresentAPI\n")
+
+
+def write_synthetic_capture(path, frame_count, seed=1):
+    """~144 FPS with jitter, a 40-80 ms stutter every ~2000 frames and another process mixed in"""
+    rng = random.Random(seed)
+    elapsed = 0.0
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        for i in range(frame_count):
+            frame = max(0.5, rng.gauss(6.94, 0.8))
+            if rng.random() < 0.0005:
+                frame = rng.uniform(40.0, 80.0)
+            elapsed += frame / 1000
+            f.write(f"starwarsbattlefrontii.exe,4242,0x1,DXGI,0,0,0,{elapsed:.6f},{frame:.4f},{frame:.4f},0.1\n")
+            if i % 10 == 0:
+                f.write(f"dwm.exe,100,0x2,DXGI,1,0,0,{elapsed:.6f},16.6667,16.6667,0.1\n")
+
+
+def exact_summary(path):
+    """Reference results from every frame held in memory"""
+    times = [value for chunk in read_frame_times(path, application="starwarsbattlefrontii.exe") for value in chunk]
+    ordered = sorted(times)
+
+    def percentile(percent):
+        return ordered[max(1, math.ceil(len(ordered) * percent / 100)) - 1]
+
+    def slowest(percent):
+        count = max(1, math.ceil(len(ordered) * percent / 100))
+        return sum(ordered[-count:]) / count
+
+    stutters, total = 0, 0.0
+    for index, value in enumerate(times):
+        if index and value > STUTTER_FACTOR * total / index:
+            stutters += 1
+        total += value
+    return {"average_fps": 1000 * len(times) / total, "p99": percentile(99), "p99.9": percentile(99.9),
+            "slowest_1": slowest(1), "stutters": stutters}
+
+
+def main():
+    frame_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "capture.csv")
+        write_synthetic_capture(path, frame_count)
+        print(f"capture: {frame_count} frames, {os.path.getsize(path) / (1024 * 1024):.1f} MB")
+
+        engines = [False] + ([True] if numpy is not None else [])
+        for use_numpy in engines:
+            start = time.perf_counter()
+            summary = analyze_capture(path, application="starwarsbattlefrontii.exe", use_numpy=use_numpy)
+            elapsed = time.perf_counter() - start
+            # Separate pass: tracemalloc slows allocation-heavy parsing down several times
+            tracemalloc.start()
+            analyze_capture(path, application="starwarsbattlefrontii.exe", use_numpy=use_numpy)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{'numpy' if use_numpy else 'python':<7} {elapsed:6.2f} s  "
+                  f"{frame_count / elapsed / 1e6:5.2f} M frames/s  peak {peak / (1024 * 1024):5.1f} MB  "
+                  f"avg {summary.average_fps:.1f} FPS, 1% low {summary.low_1_fps:.1f}, "
+                  f"0.1% low {summary.low_01_fps:.1f}, stutters {summary.stutters}")
+        if numpy is None:
+            print("numpy not installed: vectorized engine skipped")
+
+        exact = exact_summary(path)
+        errors = {
+            "P99": abs(summary.percentiles_ms["99"] - exact["p99"]),
+            "P99.9": abs(summary.percentiles_ms["99.9"] - exact["p99.9"]),
+            "slowest 1%": abs(1000 / summary.low_1_average_fps - exact["slowest_1"]),
+        }
+        print("error vs exact: " + ", ".join(f"{name} {error * 1000:.1f} µs" for name, error in errors.items())
+              + f", stutters {summary.stutters} vs {exact['stutters']}")
+        ok = all(error <= HISTOGRAM_RESOLUTION_MS for error in errors.values()) and \
+            summary.stutters == exact["stutters"] and abs(summary.average_fps - exact["average_fps"]) < 0.01
+        return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
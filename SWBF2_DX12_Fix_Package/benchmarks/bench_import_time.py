@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+Imports each entry point in a fresh interpreter with -X importtime and
+compares the median cumulative import time against its startup budget. Also
+fails if an import pulls in a platform module that must stay lazy (winreg,
+psutil), which is what kept the fixer from importing off Windows.
+
+Usage: python benchmarks/bench_import_time.py [runs]
+"""
+
+import os
+import sys
+import statistics
+import subprocess
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Median cumulative import time allowed per module, in milliseconds
+IMPORT_BUDGETS_MS = {
+    "SWBF2_DX12_Complete_Fix": 150,
+    "SWBF2_GUI_Fix": 200,
+    "Fix_UI_Artifacts": 100,
+    "verify_system": 100,
+}
+# Loaded on first use only; importing any entry point must not load these
+LAZY_MODULES = ("winreg", "psutil", "wmi")
+
+
+def measure_import(module, runs):
+    """Median cumulative import time (µs) of module and the lazy modules it loaded (None if it fails)"""
+    code = (f"import sys, {module}; "
+            f"print(','.join(name for name in {LAZY_MODULES!r} if name in sys.modules))")
+    samples = []
+    loaded = ""
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PACKAGE_DIR,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        loaded = result.stdout.strip()
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module and fields[2].startswith(" " + module):
+                samples.append(int(fields[1]))
+                break
+    return statistics.median(samples), loaded
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failures = 0
+    print(f"{'module':<28} {'median':>10} {'budget':>10}")
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        median_us, loaded = measure_import(module, runs)
+        if median_us is None:
+            print(f"{module:<28} {'-':>10} {budget_ms:>8}ms  import failed: {loaded}")
+            failures += 1
+            continue
+        status = "ok"
+        if median_us / 1000 > budget_ms:
+            status = "OVER BUDGET"
+            failures += 1
+        if loaded:
+            status = f"loaded {loaded} at import"
+            failures += 1
+        print(f"{module:<28} {median_us / 1000:>8.1f}ms {budget_ms:>8}ms  {status}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
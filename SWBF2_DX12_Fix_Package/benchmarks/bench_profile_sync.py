@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Profile Distribution Benchmark
+Serves two fix profiles from a local stand-in server and has 200 simulated
+machines (each with its own cache and kept-alive connection) fetch them:
+a cold sync, a refresh with nothing changed (budget: 300 bytes per machine
+for both profiles, i.e. 304 responses only), a refresh after one profile
+changed, and a refresh with the server gone (every machine must fall back
+to its cache)
+
+Usage: python benchmarks/bench_profile_sync.py [machines]
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Fix_UI_Artifacts import builtin_profile
+from profile_sync import DOWNLOADED, NOT_MODIFIED, OFFLINE, ProfileClient, ProfileServer, publish_profile
+
+UNCHANGED_BUDGET = 300  # bytes per machine for a refresh that finds nothing new
+PROFILES = ("ui-fix", "ui-fix-110")
+
+
+def refresh(server, clients):
+    """Fetch every profile on every machine; returns (bytes sent, seconds, sources seen)"""
+    sent_before = server.bytes_sent if server else 0
+    start = time.perf_counter()
+    sources = {}
+    for client in clients:
+        for name in PROFILES:
+            source = client.fetch(name)[1]
+            sources[source] = sources.get(source, 0) + 1
+    elapsed = time.perf_counter() - start
+    return (server.bytes_sent - sent_before) if server else 0, elapsed, sources
+
+
+def main():
+    machines = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    logging.getLogger("profile_sync").setLevel(logging.ERROR)  # One offline warning per fetch otherwise
+    workdir = Path(tempfile.mkdtemp())
+    published = workdir / "published"
+    publish_profile(published, "ui-fix")
+    lower_scale = builtin_profile()
+    lower_scale["render_path"] = [line.replace("1.200000", "1.100000") for line in lower_scale["render_path"]]
+    publish_profile(published, "ui-fix-110", lower_scale)
+
+    server = ProfileServer(published, ("127.0.0.1", 0)).start()
+    clients = [ProfileClient(server.url, workdir / f"machine{index:03}") for index in range(machines)]
+    ok = True
+    try:
+        for label in ("cold sync", "unchanged refresh"):
+            sent, elapsed, sources = refresh(server, clients)
+            print(f"{label:<20} {sent:>9} bytes ({sent / machines:.0f} per machine) in {elapsed:.2f} s  {sources}")
+        ok &= sent / machines <= UNCHANGED_BUDGET and sources == {NOT_MODIFIED: machines * len(PROFILES)}
+
+        time.sleep(1.1)  # A new Last-Modified second, as a real edit would have
+        lower_scale["scaling"].append("GstRender.UI.Sharpen 0")
+        publish_profile(published, "ui-fix-110", lower_scale)
+        sent, elapsed, sources = refresh(server, clients)
+        print(f"{'one profile changed':<20} {sent:>9} bytes ({sent / machines:.0f} per machine) "
+              f"in {elapsed:.2f} s  {sources}")
+        ok &= sources == {NOT_MODIFIED: machines, DOWNLOADED: machines}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for client in clients:
+        client.close()  # Machines rebooted since: they have to reconnect
+    sent, elapsed, sources = refresh(None, clients)
+    print(f"{'server offline':<20} {'':>9}       in {elapsed:.2f} s  {sources}")
+    ok &= sources == {OFFLINE: machines * len(PROFILES)}
+
+    for client in clients:
+        client.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+    print(f"unchanged-refresh budget: {UNCHANGED_BUDGET} bytes per machine -> {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
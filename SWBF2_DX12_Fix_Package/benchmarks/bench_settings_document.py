@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Settings Patch Benchmark
+Compares the old per-fixer read/filter/write cycle against the single-pass
+SettingsDocument engine on large synthetic BootOptions/ProfileOptions files
+
+Usage: python benchmarks/bench_settings_document.py [line_count]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backup_store import BackupStore
+from change_journal import ChangeJournal
+from Fix_UI_Artifacts import (UIArtifactFixer, UI_NATIVE_RESOLUTION_FIXES, UI_RENDER_PATH_FIXES,
+                              UI_SCALING_FIXES, UI_DX12_FIXES)
+
+
+def write_synthetic_settings(settings_dir, line_count):
+    """Create BootOptions/ProfileOptions_profile with line_count settings each"""
+    for name in ("BootOptions", "ProfileOptions_profile"):
+        with open(os.path.join(settings_dir, name), 'w') as f:
+            f.write("# Synthetic settings file\n")
+            for i in range(line_count):
+                f.write(f"GstSynthetic.Option{i} {i % 7}\n")
+            f.write("GstRender.ResolutionScale 1.500000\n")
+
+
+def legacy_patch(path, fixes):
+    """The pre-SettingsDocument implementation: read, filter once per fix, write"""
+    with open(path, 'r') as f:
+        content = f.read()
+    lines = content.split('\n')
+    for fix in fixes:
+        setting_name = fix.split()[0]
+        lines = [line for line in lines if not line.startswith(setting_name)]
+        lines.append(fix)
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+
+
+def run_legacy(settings_dir):
+    boot = os.path.join(settings_dir, "BootOptions")
+    profile = os.path.join(settings_dir, "ProfileOptions_profile")
+    legacy_patch(boot, UI_NATIVE_RESOLUTION_FIXES)
+    legacy_patch(profile, UI_RENDER_PATH_FIXES)
+    legacy_patch(profile, UI_SCALING_FIXES)
+    legacy_patch(boot, UI_DX12_FIXES)
+
+
+def run_document(settings_dir):
+    # A scratch journal next to the files, never the package's own Backups/
+    journal = ChangeJournal(os.path.join(settings_dir, "journal.jsonl"),
+                            BackupStore(os.path.join(settings_dir, "Backups")))
+    fixer = UIArtifactFixer(settings_dir, journal=journal)
+    journal.begin("UI artifact fix (benchmark)")
+    fixer.fix_ui_specific_artifacts()
+    journal.commit()
+
+
+def time_run(func, line_count, repeat):
+    best = None
+    for _ in range(repeat):
+        settings_dir = tempfile.mkdtemp(prefix="swbf2_bench_")
+        try:
+            write_synthetic_settings(settings_dir, line_count)
+            start = time.perf_counter()
+            func(settings_dir)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        finally:
+            shutil.rmtree(settings_dir, ignore_errors=True)
+    return best
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeat = 5
+
+    legacy = time_run(run_legacy, line_count, repeat)
+    # Silence the fixer's progress output while timing
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        document = time_run(run_document, line_count, repeat)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    print(f"Settings patch benchmark ({line_count} lines per file, best of {repeat})")
+    print(f"   Legacy per-fixer rewrite: {legacy * 1000:8.1f} ms")
+    print(f"   SettingsDocument:         {document * 1000:8.1f} ms")
+    print(f"   Speedup:                  {legacy / document:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
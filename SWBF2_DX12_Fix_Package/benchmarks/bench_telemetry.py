@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Telemetry Sampler Benchmark
+Samples a busy child process at 10 Hz and reports how much CPU the sampler
+thread itself used (budget: 0.5% of one core), plus the cost of one read and
+of the ring/downsampling buffers
+
+Usage: python benchmarks/bench_telemetry.py [seconds] [rate_hz]
+"""
+
+import os
+import sys
+import time
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telemetry import (DEFAULT_CAPACITY, DownsamplingBuffer, TelemetryRing, TelemetrySampler,
+                       open_telemetry_source)
+
+OVERHEAD_BUDGET = 0.5  # percent of one core
+
+# Allocates, touches files and spins a few threads so every counter moves
+CHILD = """
+import os, threading, time
+def work():
+    data = []
+    while True:
+        data.append(bytearray(65536))
+        del data[:-200]
+        with open(os.devnull, 'wb') as f:
+            f.write(data[-1])
+        time.sleep(0.001)
+for _ in range(4):
+    threading.Thread(target=work, daemon=True).start()
+time.sleep(3600)
+"""
+
+
+def time_call(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+
+    child = subprocess.Popen([sys.executable, "-c", CHILD])
+    try:
+        source = open_telemetry_source(child.pid)
+        read_cost = time_call(source.read, 1000)
+        print(f"source: {source.name}, one read: {read_cost * 1e6:.0f} µs")
+
+        values = (time.time(), 12.5, 1e9, 9e8, 300, 40, 1e6, 1e5)
+        ring = TelemetryRing()
+        history = DownsamplingBuffer()
+        print(f"ring append: {time_call(lambda: ring.append(values), 100000) * 1e6:.2f} µs, "
+              f"history append: {time_call(lambda: history.append(values), 100000) * 1e6:.2f} µs "
+              f"(stride {history.stride} after 100k samples, {DEFAULT_CAPACITY} rows)")
+
+        sampler = TelemetrySampler(open_telemetry_source(child.pid), rate).start()
+        time.sleep(seconds)
+        sampler.stop()
+    finally:
+        child.kill()
+        child.wait()
+
+    overhead = sampler.overhead
+    print(f"{sampler.sample_count} samples in {sampler.elapsed:.1f} s at {rate:g} Hz: "
+          f"sampler used {overhead:.3f}% of one core (budget {OVERHEAD_BUDGET}%)")
+    return 0 if overhead < OVERHEAD_BUDGET else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Shared setup for the pytest-benchmark micro-benchmarks (micro_benchmarks.py)
+and the behaviour tests (test_*.py): puts the package on sys.path, keeps
+saved runs in benchmarks/baselines/, fails a run that regresses against the
+latest of them and builds the synthetic inputs (settings files, launcher
+trees, dumps) once per session
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.utils import get_machine_id, parse_compare_fail
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BASELINE_DIR = BENCHMARK_DIR / "baselines"
+DEFAULT_STORAGE = "file://./.benchmarks"  # pytest-benchmark's own default
+REGRESSION_THRESHOLD = "median:25%"  # slower than the baseline by more than this fails the run
+
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+
+
+def pytest_configure(config):
+    # Runs before pytest-benchmark opens its storage (its hook is trylast), so
+    # baselines land next to the benchmarks wherever pytest is started from
+    if config.getoption("benchmark_storage", None) == DEFAULT_STORAGE:
+        config.option.benchmark_storage = BASELINE_DIR.as_uri()
+        # Compare against the latest baseline saved on this kind of machine, if there is one
+        if not config.option.benchmark_compare and list(BASELINE_DIR.glob(f"{get_machine_id()}/*.json")):
+            config.option.benchmark_compare = True
+            if not config.option.benchmark_compare_fail:
+                config.option.benchmark_compare_fail = [parse_compare_fail(REGRESSION_THRESHOLD)]
+
+
+def synthetic_settings(line_count: int) -> str:
+    """Settings file text with line_count unrelated options plus keys the fixes touch"""
+    lines = ["# Synthetic settings file"]
+    lines += [f"GstSynthetic.Option{i} {i % 7}" for i in range(line_count)]
+    lines += ["GstRender.ResolutionScale 1.500000", "GstRender.Dx12Enabled 0",
+              "GstRender.UIResolutionScale 1.500000"]
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture(scope="session")
+def settings_text():
+    """{size label: settings file text}"""
+    return {"small": synthetic_settings(50), "100k": synthetic_settings(100000)}
+
+
+@pytest.fixture(scope="session")
+def steam_tree(tmp_path_factory):
+    """A Steam root whose libraryfolders.vdf lists 200 libraries, one with the game"""
+    root = tmp_path_factory.mktemp("steam")
+    entries = []
+    for index in range(200):
+        library = root / f"Library{index:03}"
+        steamapps = library / "steamapps"
+        steamapps.mkdir(parents=True)
+        for app_id in range(index % 5):
+            (steamapps / f"appmanifest_{100000 + app_id}.acf").write_text('"AppState"\n{\n}\n')
+        entries.append(f'\t"{index}"\n\t{{\n\t\t"path"\t\t"{library}"\n\t\t"apps"\n\t\t{{\n\t\t}}\n\t}}')
+    (root / "steamapps").mkdir()
+    (root / "steamapps" / "libraryfolders.vdf").write_text('"libraryfolders"\n{\n' + "\n".join(entries) + "\n}\n")
+    (root / "Library137" / "steamapps" / "appmanifest_1237950.acf").write_text(
+        '"AppState"\n{\n\t"appid"\t\t"1237950"\n\t"installdir"\t\t"STAR WARS Battlefront II"\n}\n')
+    return root
+
+
+@pytest.fixture(scope="session")
+def large_file(tmp_path_factory):
+    """64 MB of incompressible data"""
+    path = tmp_path_factory.mktemp("backup") / "large.bin"
+    block = os.urandom(1024 * 1024)
+    with open(path, 'wb') as f:
+        for _ in range(64):
+            f.write(block)
+    return path
+
+
+@pytest.fixture(scope="session")
+def memory_dump():
+    """32 MB of pseudo-random bytes with one planted signature match near the end"""
+    data = bytearray(os.urandom(1024 * 1024) * 32)
+    match = bytes.fromhex("488B05112233444885C0740A8B4810")
+    data[-4096:-4096 + len(match)] = match
+    return bytes(data)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark Suite
+pytest-benchmark suite for the hot paths of a fix run: settings patching
+(UIArtifactFixer and the DX12 engine config) on small and 100k-line files,
+install discovery over a Steam root with 200 library folders, backups of a
+64 MB file and signature scanning throughput. Runs are saved as JSON in
+benchmarks/baselines/<machine>/; once one exists, a median more than 25%
+slower than the last saved run fails (see conftest.py).
+
+Usage: python -m pytest benchmarks --benchmark-save=baseline   (record a baseline)
+       python -m pytest benchmarks                             (compare against it)
+"""
+
+import shutil
+
+import pytest
+
+from backup_store import BackupStore
+from change_journal import ChangeJournal
+from Fix_UI_Artifacts import UIArtifactFixer
+from game_discovery import GameDiscovery
+from memory_scanner import BufferMemorySource, PatternScanner, Signature, SignatureMatcher
+from signature_db import SignatureDatabase
+from SWBF2_DX12_Complete_Fix import GAME_CONFIG, apply_dx12_config
+
+ROUNDS = {"small": 50, "100k": 10}
+SIGNATURES = [
+    Signature("descriptor_heap", "48 8B 05 ?? ?? ?? ?? 48 85 C0 74 ?? 8B 48 10"),
+    Signature("resolution_scale", "C7 43 ?? 9A 99 99 3F"),
+    Signature("ui_scale", "F3 0F 10 05 ?? ?? ?? ?? 0F 2F C1 76 ?? 41 C7"),
+]
+
+
+def scratch_journal(directory) -> ChangeJournal:
+    return ChangeJournal(directory / "journal.jsonl", BackupStore(directory / "Backups"))
+
+
+def mb_per_second(benchmark, size: int):
+    if benchmark.stats is None:
+        return  # --benchmark-disable: each test ran once, untimed
+    benchmark.extra_info["MB/s"] = round(size / 1024 ** 2 / benchmark.stats.stats.median, 1)
+
+
+# -- settings patching ----------------------------------------------------------
+
+@pytest.mark.parametrize("size", ["small", "100k"])
+def test_ui_artifact_fix(benchmark, tmp_path, settings_text, size):
+    settings_dir = tmp_path / "settings"
+    settings_dir.mkdir()
+    journal = scratch_journal(tmp_path)
+
+    def setup():
+        # Fresh, unfixed files every round (a second pass would find nothing to change)
+        for name in ("BootOptions", "ProfileOptions_profile"):
+            (settings_dir / name).write_text(settings_text[size])
+
+    def patch():
+        return UIArtifactFixer(str(settings_dir), journal=journal).fix_ui_specific_artifacts()
+
+    fixes = benchmark.pedantic(patch, setup=setup, rounds=ROUNDS[size])
+    assert len(fixes) == 4
+
+
+@pytest.mark.parametrize("size", ["small", "100k"])
+def test_dx12_config(benchmark, tmp_path, settings_text, size):
+    config = tmp_path / "game" / GAME_CONFIG
+    config.parent.mkdir(parents=True)
+    journal = scratch_journal(tmp_path)
+
+    def setup():
+        config.write_text(settings_text[size])
+
+    changes = benchmark.pedantic(apply_dx12_config, args=(tmp_path / "game", journal), setup=setup,
+                                 rounds=ROUNDS[size])
+    assert changes == 3
+
+
+# -- install discovery ----------------------------------------------------------
+
+def test_discovery_cold(benchmark, steam_tree):
+    discovery = GameDiscovery(steam_roots=[steam_tree], origin_roots=[], cache_path=None, use_registry=False)
+    installs = benchmark(discovery.discover, use_cache=False)
+    assert [install.source for install in installs] == ["steam"]
+
+
+def test_discovery_cached(benchmark, steam_tree, tmp_path):
+    discovery = GameDiscovery(steam_roots=[steam_tree], origin_roots=[], cache_path=tmp_path / "cache.json",
+                              use_registry=False)
+    discovery.discover()
+    installs = benchmark(discovery.discover)
+    assert discovery.cache_hit and len(installs) == 1
+
+
+# -- backups ---------------------------------------------------------------------
+
+def test_backup_new_file(benchmark, large_file, tmp_path):
+    store_dir = tmp_path / "store"
+
+    def setup():
+        shutil.rmtree(store_dir, ignore_errors=True)
+        return (BackupStore(store_dir),), {}
+
+    benchmark.pedantic(lambda store: store.backup(large_file), setup=setup, rounds=5)
+    mb_per_second(benchmark, large_file.stat().st_size)
+
+
+def test_backup_unchanged_file(benchmark, large_file, tmp_path):
+    store = BackupStore(tmp_path / "store")
+    first = store.backup(large_file)
+    assert benchmark.pedantic(store.backup, args=(large_file,), rounds=10) == first
+    mb_per_second(benchmark, large_file.stat().st_size)
+
+
+# -- signature scanning -----------------------------------------------------------
+
+@pytest.mark.parametrize("signatures", ["3", "database"])
+def test_pattern_scan(benchmark, memory_dump, signatures):
+    if signatures == "database":
+        database = SignatureDatabase.load()
+        signature_list = database.signatures(database.select_build(None))
+    else:
+        signature_list = SIGNATURES
+    scanner = PatternScanner(SignatureMatcher(signature_list), max_matches=None)
+    source = BufferMemorySource({0x140000000: memory_dump})
+
+    results = benchmark.pedantic(scanner.scan, args=(source,), rounds=5, warmup_rounds=1)
+    mb_per_second(benchmark, len(memory_dump))
+    if signatures == "3":
+        assert results["descriptor_heap"] == [0x140000000 + len(memory_dump) - 4096]
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark Baseline Recorder
+Runs the pytest-benchmark suite (micro_benchmarks.py) as of a git revision
+and saves the run in benchmarks/baselines/<machine>/, so the next
+``python -m pytest benchmarks`` on this machine compares against it and fails
+on a regression (see conftest.py). Timings only compare on the same hardware,
+so no baseline is committed: CI records one from the target branch on its own
+runner, then runs the suite on the change:
+
+    python benchmarks/record_baseline.py origin/main
+    python -m pytest benchmarks
+
+Usage: python benchmarks/record_baseline.py [revision]   (default: HEAD)
+"""
+
+import sys
+import shutil
+import tempfile
+import subprocess
+from pathlib import Path
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BASELINE_DIR = BENCHMARK_DIR / "baselines"
+
+
+def git(*args, cwd=BENCHMARK_DIR) -> str:
+    return subprocess.run(["git"] + list(args), cwd=str(cwd), check=True,
+                          stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+
+
+def record(revision: str = "HEAD") -> int:
+    """Run the suite from a checkout of revision and save it as a baseline; returns pytest's exit code"""
+    root = Path(git("rev-parse", "--show-toplevel"))
+    commit = git("rev-parse", "--short", revision)
+    checkout = Path(tempfile.mkdtemp(prefix="swbf2_baseline_"))
+    try:
+        git("worktree", "add", "--detach", str(checkout), commit)
+        benchmarks = checkout / BENCHMARK_DIR.relative_to(root)
+        if not (benchmarks / "micro_benchmarks.py").exists():
+            print(f"❌ {revision} ({commit}) has no micro-benchmark suite")
+            return 1
+        # An explicit storage keeps conftest from comparing this run against older baselines
+        return subprocess.call([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+                                f"--benchmark-storage={BASELINE_DIR.as_uri()}",
+                                f"--benchmark-save=baseline_{commit}"], cwd=str(benchmarks))
+    finally:
+        git("worktree", "remove", "--force", str(checkout))
+        shutil.rmtree(checkout, ignore_errors=True)
+
+
+def main():
+    revision = sys.argv[1] if len(sys.argv) > 1 else "HEAD"
+    try:
+        code = record(revision)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ git failed: {e}")
+        return 1
+    if code == 0:
+        print(f"✅ Baseline for {revision} saved in {BASELINE_DIR}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Behaviour tests for background_throttle.py on a spawned child: every thread
+of a matching process is demoted, a thread already below the target keeps
+its priority, and restore() or the saved state puts the originals back
+"""
+
+import os
+import sys
+import shutil
+import subprocess
+
+import pytest
+
+psutil = pytest.importorskip("psutil")
+if not sys.platform.startswith("linux"):
+    pytest.skip("per-thread scheduling is only read back on Linux", allow_module_level=True)
+
+from background_throttle import BackgroundThrottler, ThrottleConfig, restore_saved
+
+STANDIN_NAME = "swbf2_throttle_test"
+CHILD = """
+import os, sys, threading, time
+def idle(nice):
+    if nice:
+        tid = int(os.readlink("/proc/thread-self").rpartition("/")[2])
+        os.setpriority(os.PRIO_PROCESS, tid, nice)
+    time.sleep(60)
+for nice in (0, 0, 10):
+    threading.Thread(target=idle, args=(nice,), daemon=True).start()
+time.sleep(0.2)
+print("ready", flush=True)
+time.sleep(60)
+"""
+
+
+@pytest.fixture
+def child(tmp_path):
+    """A renamed interpreter with three extra threads, the last at nice 10"""
+    standin = tmp_path / STANDIN_NAME
+    shutil.copy(sys.executable, standin)
+    process = subprocess.Popen([str(standin), "-c", CHILD], stdout=subprocess.PIPE, universal_newlines=True)
+    try:
+        assert process.stdout.readline().strip() == "ready"
+        yield process.pid
+    finally:
+        process.kill()
+        process.wait()
+
+
+def scheduling(pid):
+    """{tid: (nice, ionice)} of every thread of pid"""
+    values = {}
+    for tid in os.listdir(f"/proc/{pid}/task"):
+        thread = psutil.Process(int(tid))
+        values[int(tid)] = (thread.nice(), tuple(thread.ionice()))
+    return values
+
+
+def throttler(tmp_path):
+    config = ThrottleConfig([STANDIN_NAME], priority="below_normal", io_priority="low", cpus=None)
+    return BackgroundThrottler(config, state_path=tmp_path / "throttle_state.json")
+
+
+def assert_throttled(pid, original, demotes_priority):
+    throttled = scheduling(pid)
+    assert set(throttled) == set(original) and len(original) == 4
+    for tid, (nice, ionice) in throttled.items():
+        if original[tid][0] == 10 or not demotes_priority:
+            assert nice == original[tid][0]  # Already below the target, or not undoable
+        else:
+            assert nice == 5
+        assert ionice == (psutil.IOPRIO_CLASS_BE, 7)
+
+
+def test_throttle_then_restore(child, tmp_path):
+    original = scheduling(child)
+    background = throttler(tmp_path)
+    records = background.throttle()
+    assert [record.pid for record in records] == [child]
+    assert_throttled(child, original, background.nice_floor is None or background.nice_floor <= 0)
+    assert background.state_path.exists()
+
+    assert background.restore() == 1
+    assert scheduling(child) == original
+    assert not background.state_path.exists()
+
+
+def test_restore_saved_after_crash(child, tmp_path):
+    original = scheduling(child)
+    background = throttler(tmp_path)
+    background.throttle()
+    assert_throttled(child, original, background.nice_floor is None or background.nice_floor <= 0)
+
+    # The throttler died without restoring; the next start finds its state file
+    assert restore_saved(background.state_path) == 1
+    assert scheduling(child) == original
+    assert not background.state_path.exists()
@@ -0,0 +1,91 @@
+"""
+Behaviour tests for change_journal.py: a journaled run rolls back to the
+original bytes, files it created are removed and an interrupted rollback
+finishes when run again
+"""
+
+import pytest
+
+from backup_store import BackupStore
+from change_journal import ChangeJournal
+from settings_document import SettingsDocument
+
+# Comments and a duplicate key must survive a round trip
+ORIGINAL_SETTINGS = ("# Battlefront II settings\nGstRender.Dx12Enabled 0\n"
+                     "GstRender.ResolutionScale 1.500000\nGstRender.Dx12Enabled 0\n"
+                     "GstAudio.Volume 0.800000\n")
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return ChangeJournal(tmp_path / "journal.jsonl", BackupStore(tmp_path / "Backups"))
+
+
+def change_settings(journal, path):
+    document = SettingsDocument.load(str(path))
+    document.set("GstRender.Dx12Enabled", "1")
+    document.set("GstRender.ResolutionScale", "1.000000")
+    document.set("GstRender.FutureFrameRendering", "1")  # Not in the file yet
+    return journal.write_settings(document)
+
+
+def test_rollback_restores_original_bytes(journal, tmp_path):
+    settings = tmp_path / "BootOptions"
+    settings.write_bytes(ORIGINAL_SETTINGS.encode())
+    profile = tmp_path / "profile.txt"
+
+    run_id = journal.begin("test")
+    assert change_settings(journal, settings) == 3
+    journal.create_file(profile, "GstRender.Dx12Enabled 1\n")
+    journal.commit()
+    assert settings.read_bytes() != ORIGINAL_SETTINGS.encode()
+    assert [(run.run, run.state, run.changes) for run in journal.runs()] == [(run_id, "committed", 4)]
+
+    assert journal.rollback(run_id) == 4
+    assert settings.read_bytes() == ORIGINAL_SETTINGS.encode()
+    assert not profile.exists()
+    assert journal.runs()[0].state == "rolled back"
+    assert journal.rollback(run_id) == 0  # Nothing left to undo
+
+
+def test_rollback_restores_overwritten_file(journal, tmp_path):
+    profile = tmp_path / "profile.txt"
+    profile.write_text("GstRender.Dx12Enabled 0\n")
+
+    journal.begin("test")
+    journal.create_file(profile, "GstRender.Dx12Enabled 1\n")
+    journal.commit()
+
+    assert journal.rollback() == 1
+    assert profile.read_text() == "GstRender.Dx12Enabled 0\n"
+
+
+def test_interrupted_rollback_resumes(journal, tmp_path, monkeypatch):
+    first, second = tmp_path / "BootOptions", tmp_path / "ProfileOptions_profile"
+    for path in (first, second):
+        path.write_bytes(ORIGINAL_SETTINGS.encode())
+    run_id = journal.begin("test")
+    change_settings(journal, first)
+    change_settings(journal, second)
+    journal.commit()
+
+    # Crash after the second file (undone first, newest change first) was restored
+    undo_settings = ChangeJournal._undo_settings
+
+    def crash_on_first(self, path, changes):
+        if path == str(first):
+            raise OSError("simulated crash")
+        undo_settings(self, path, changes)
+
+    monkeypatch.setattr(ChangeJournal, "_undo_settings", crash_on_first)
+    with pytest.raises(OSError):
+        journal.rollback(run_id)
+    assert second.read_bytes() == ORIGINAL_SETTINGS.encode()
+    assert first.read_bytes() != ORIGINAL_SETTINGS.encode()
+    assert journal.runs()[0].state == "committed"
+
+    monkeypatch.undo()
+    resumed = ChangeJournal(journal.path, journal.backups)  # As after a restart
+    assert resumed.rollback(run_id) == 3  # Only the first file's changes were left
+    assert first.read_bytes() == ORIGINAL_SETTINGS.encode()
+    assert resumed.runs()[0].state == "rolled back"
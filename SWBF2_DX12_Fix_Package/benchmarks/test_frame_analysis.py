@@ -0,0 +1,54 @@
+"""
+Behaviour tests for frame_analysis.py on a generated PresentMon capture:
+known frame times give known FPS, lows, percentiles and hitch counts, in
+chunks or not and with or without NumPy
+"""
+
+import pytest
+
+from frame_analysis import HISTOGRAM_RESOLUTION_MS, analyze_capture, numpy
+
+ENGINES = [False] + ([True] if numpy is not None else [])
+
+
+@pytest.fixture
+def capture(tmp_path):
+    """990 frames of 10 ms with a 100 ms hitch every 100th, plus another process's frames"""
+    path = tmp_path / "capture.csv"
+    lines = ["// CapFrameX comment line", "Application,ProcessID,MsBetweenPresents"]
+    for index in range(1000):
+        lines.append(f"starwarsbattlefrontii.exe,4242,{100.0 if index % 100 == 99 else 10.0}")
+        if index % 10 == 0:
+            lines.append("Discord.exe,1717,500.0")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.mark.parametrize("use_numpy", ENGINES)
+@pytest.mark.parametrize("chunk_rows", [64, 65536])
+def test_known_capture(capture, use_numpy, chunk_rows):
+    summary = analyze_capture(capture, "StarWarsBattlefrontII.exe", chunk_rows, use_numpy)
+    assert summary.frames == 1000
+    assert summary.duration == pytest.approx(10.9)
+    assert summary.average_fps == pytest.approx(1000 / 10.9)
+    assert summary.percentiles_ms["50"] == pytest.approx(10.0, abs=HISTOGRAM_RESOLUTION_MS)
+    assert summary.percentiles_ms["99.9"] == pytest.approx(100.0, abs=HISTOGRAM_RESOLUTION_MS)
+    # The slowest 10 frames are the hitches, read back from the middle of their histogram bin
+    assert summary.low_1_average_fps == pytest.approx(1000 / (100.0 + HISTOGRAM_RESOLUTION_MS / 2))
+    assert summary.max_ms == pytest.approx(100.0)
+    assert summary.hitches == 10
+    assert summary.stutters == 10
+
+
+@pytest.mark.parametrize("use_numpy", ENGINES)
+def test_unfiltered_capture_counts_every_process(capture, use_numpy):
+    summary = analyze_capture(capture, use_numpy=use_numpy)
+    assert summary.frames == 1100
+    assert summary.max_ms == pytest.approx(500.0)
+
+
+def test_capture_without_frame_times(tmp_path):
+    path = tmp_path / "capture.csv"
+    path.write_text("Application,ProcessID\nstarwarsbattlefrontii.exe,4242\n")
+    with pytest.raises(ValueError):
+        analyze_capture(path)
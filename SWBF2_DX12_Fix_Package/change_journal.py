@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Change Journal for Star Wars Battlefront II Fixes
+Write-ahead journal of every change a fix run makes (settings keys, registry
+values, created files). Each change is appended and flushed to disk before it
+is applied, so a rollback can undo exactly those changes in reverse order,
+key by key instead of copying whole files, and can resume where it stopped if
+it is interrupted.
+
+Usage: python change_journal.py list
+       python change_journal.py rollback [run]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from backup_store import DEFAULT_STORE_PATH, BackupStore
+from platform_backends import RegistryBackend, get_backends, registry_type_name
+from settings_document import SettingsDocument
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_PATH = DEFAULT_STORE_PATH / "journal.jsonl"
+
+
+class JournalRun(NamedTuple):
+    """Summary of one fix run recorded in the journal"""
+    run: str
+    label: str
+    started: float
+    changes: int
+    state: str  # "open", "committed", "incomplete" (never committed) or "rolled back"
+
+
+def _encode_registry_data(data):
+    return {"hex": data.hex()} if isinstance(data, (bytes, bytearray)) else data
+
+
+def _decode_registry_data(data):
+    return bytes.fromhex(data["hex"]) if isinstance(data, dict) else data
+
+
+class ChangeJournal:
+    """Append-only JSON-lines journal of fix runs and their changes"""
+
+    def __init__(self, path: Path = DEFAULT_JOURNAL_PATH, backups: Optional[BackupStore] = None,
+                 registry: Optional[RegistryBackend] = None):
+        self.path = Path(path)
+        self.backups = backups or BackupStore(self.path.parent)
+        self._registry = registry
+        self.run_id = None  # type: Optional[str]
+        self.sequence = 0
+
+    @property
+    def registry(self) -> RegistryBackend:
+        # Resolved on first registry change, so settings-only runs never touch winreg
+        if self._registry is None:
+            self._registry = get_backends().registry
+        return self._registry
+
+    # -- journal file ---------------------------------------------------
+
+    def _append(self, *records: dict):
+        """Append records and flush them to disk with a single fsync"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def records(self) -> List[dict]:
+        """Every complete record; a torn last line from a crash is ignored"""
+        records = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break
+        except OSError:
+            pass
+        return records
+
+    # -- recording ------------------------------------------------------
+
+    def begin(self, label: str) -> str:
+        """Start a run; changes recorded until commit() belong to it"""
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.sequence = 0
+        self._append({"type": "begin", "run": self.run_id, "label": label, "time": time.time()})
+        return self.run_id
+
+    def commit(self):
+        if self.run_id is not None:
+            self._append({"type": "commit", "run": self.run_id, "time": time.time()})
+            self.run_id = None
+
+    def _record(self, *changes: dict) -> int:
+        """Journal changes before they are applied; returns the sequence number of the last"""
+        if self.run_id is None:
+            self.begin("changes")
+        records = []
+        for change in changes:
+            self.sequence += 1
+            records.append(dict(change, type="change", run=self.run_id, seq=self.sequence))
+        self._append(*records)
+        return self.sequence
+
+    def _applied(self, sequence: int):
+        self._append({"type": "applied", "run": self.run_id, "seq": sequence})
+
+    def write_settings(self, document: SettingsDocument) -> int:
+        """Journal every key the document changed since it was loaded, then save it"""
+        if not document.dirty:
+            return 0
+        if not os.path.exists(document.path):
+            sequence = self._record({"op": "create_file", "path": str(document.path), "backup": None})
+            document.save()
+            self._applied(sequence)
+            return 1
+
+        # The document remembers each key's value from before its first change,
+        # so the file does not have to be read again to find what differs
+        changes = [{"op": "setting", "path": str(document.path), "key": key, "old": old, "new": new}
+                   for key, old, new in document.changes()]
+        # One journal write for the whole file, still flushed before the file is saved
+        if changes:
+            self._record(*changes)
+        document.save()
+        if changes:
+            self._applied(self.sequence)
+        return len(changes)
+
+    def create_file(self, path, text: str):
+        """Write a new file (e.g. a profile); an existing file is backed up first"""
+        path = Path(path)
+        backup = self.backups.backup(path)
+        sequence = self._record({"op": "create_file", "path": str(path),
+                                 "backup": backup.digest if backup else None})
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        self._applied(sequence)
+
+    def set_registry_value(self, hive: str, key: str, name: str, value_type: str, value):
+        """Set a registry value, journaling its previous state (hive is "HKLM" or "HKCU")"""
+        registry = self.registry
+        created = not registry.key_exists(hive, key)
+        current = None if created else registry.query_value(hive, key, name)
+        old = None
+        if current is not None:
+            old = {"type": current[1], "data": _encode_registry_data(current[0])}
+
+        sequence = self._record({"op": "registry", "hive": hive, "key": key, "name": name, "old": old,
+                                 "created_key": created,
+                                 "new": {"type": value_type, "data": _encode_registry_data(value)}})
+        registry.set_value(hive, key, name, value_type, value)
+        self._applied(sequence)
+
+    def attach(self, name: str, data: dict, run_id: Optional[str] = None) -> Optional[str]:
+        """Store a result with a run (default: the open run, else the latest); returns the run ID.
+
+        Attachments (e.g. a frame-time summary) are not changes and are never rolled back.
+        """
+        if run_id is None:
+            run_id = self.run_id or next((run.run for run in reversed(self.runs())), None)
+        if run_id is None:
+            return None
+        self._append({"type": "attachment", "run": run_id, "name": name, "data": data, "time": time.time()})
+        return run_id
+
+    def attachments(self, run_id: str) -> List[dict]:
+        return [record for record in self.records() if record["type"] == "attachment" and record["run"] == run_id]
+
+    # -- inspection -----------------------------------------------------
+
+    def runs(self) -> List[JournalRun]:
+        """Recorded runs, oldest first"""
+        runs = {}  # type: Dict[str, dict]
+        for record in self.records():
+            run = runs.setdefault(record["run"], {"label": "", "started": 0.0, "changes": 0,
+                                                  "state": "incomplete"})
+            if record["type"] == "begin":
+                run.update(label=record["label"], started=record["time"])
+            elif record["type"] == "change":
+                run["changes"] += 1
+            elif record["type"] == "commit":
+                run["state"] = "committed"
+            elif record["type"] == "rolled_back":
+                run["state"] = "rolled back"
+        if self.run_id in runs and runs[self.run_id]["state"] == "incomplete":
+            runs[self.run_id]["state"] = "open"
+        return [JournalRun(run_id, **run) for run_id, run in runs.items()]
+
+    # -- rollback -------------------------------------------------------
+
+    def rollback(self, run_id: Optional[str] = None) -> int:
+        """Undo one run, or every run not yet rolled back (newest first); returns changes undone.
+
+        Changes already undone by an interrupted rollback are skipped, and
+        every inverse operation is idempotent, so running it again after a
+        crash finishes the job.
+        """
+        self.commit()
+        records = self.records()
+        undone = {(record["run"], record["seq"]) for record in records if record["type"] == "undone"}
+        targets = [run.run for run in self.runs() if run.state != "rolled back"]
+        if run_id is not None:
+            targets = [run for run in targets if run == run_id]
+
+        total = 0
+        for target in reversed(targets):
+            pending = [record for record in records
+                       if record["type"] == "change" and record["run"] == target
+                       and (target, record["seq"]) not in undone]
+            pending.reverse()
+            index = 0
+            while index < len(pending):
+                change = pending[index]
+                if change["op"] == "setting":
+                    # Undo consecutive key changes to one file with a single write
+                    batch = [change]
+                    while (index + len(batch) < len(pending) and pending[index + len(batch)]["op"] == "setting"
+                           and pending[index + len(batch)]["path"] == change["path"]):
+                        batch.append(pending[index + len(batch)])
+                    self._undo_settings(change["path"], batch)
+                else:
+                    batch = [change]
+                    self._undo(change)
+                for done in batch:
+                    self._append({"type": "undone", "run": target, "seq": done["seq"]})
+                total += len(batch)
+                index += len(batch)
+            self._append({"type": "rolled_back", "run": target, "time": time.time()})
+            logger.info(f"Rolled back run {target}")
+        return total
+
+    def _undo_settings(self, path: str, changes: List[dict]):
+        if not os.path.exists(path):
+            return
+        document = SettingsDocument.load(path)
+        for change in changes:
+            if change["old"] is None:
+                document.remove(change["key"])
+            else:
+                document.set(change["key"], change["old"])
+        document.save()
+
+    def _undo(self, change: dict):
+        if change["op"] == "create_file":
+            if change["backup"]:
+                self.backups.restore_blob(change["backup"], change["path"])
+            elif os.path.exists(change["path"]):
+                os.remove(change["path"])
+        elif change["op"] == "registry":
+            registry = self.registry
+            old = change["old"]
+            if old is not None:
+                # Journals written before type names were recorded hold winreg constants
+                registry.set_value(change["hive"], change["key"], change["name"],
+                                   registry_type_name(old["type"]), _decode_registry_data(old["data"]))
+            else:
+                registry.delete_value(change["hive"], change["key"], change["name"])
+            if change["created_key"]:
+                registry.delete_key(change["hive"], change["key"])  # Kept if something else uses it too
+
+
+def main():
+    journal = ChangeJournal()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+
+    if command == "list":
+        runs = journal.runs()
+        if not runs:
+            print("No changes recorded")
+        for run in runs:
+            started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run.started))
+            print(f"   {run.run}  {started}  {run.label:<24} {run.changes:>4} change(s)  {run.state}")
+        return 0
+
+    if command == "rollback":
+        try:
+            undone = journal.rollback(sys.argv[2] if len(sys.argv) > 2 else None)
+        except OSError as e:
+            print(f"❌ Rollback failed: {e}")
+            print("   Run it again to resume where it stopped.")
+            return 1
+        print(f"✅ Rolled back {undone} change(s)")
+        return 0
+
+    print("Usage: python change_journal.py list | rollback [run]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Settings Drift Watcher for Star Wars Battlefront II
+The game rewrites BootOptions and ProfileOptions_profile when options change
+in-game and on exit, which quietly undoes the UI artifact fixes. This watches
+the settings directory (inotify on Linux, ReadDirectoryChangesW on Windows,
+stat polling elsewhere), waits for a burst of writes to settle, compares only
+the keys the fix manages and writes back just the ones that drifted, in one
+journaled atomic write. A file the game still has open is left alone until
+it is closed. Drift is counted per session.
+
+Usage: python drift_watcher.py [settings_dir] [--backend inotify|rdcw|poll]
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import logging
+import threading
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from change_journal import ChangeJournal
+from Fix_UI_Artifacts import DEFAULT_SETTINGS_PATH, PROFILE_FILES, builtin_profile
+from settings_document import SettingsDocument, split_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE = 1.0       # seconds without writes before a burst counts as finished
+DEFAULT_MAX_DELAY = 10.0     # re-check after this long even if writes keep coming
+DEFAULT_RETRY_INTERVAL = 2.0  # seconds between checks while the game holds a file open
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+# -- directory change backends ------------------------------------------------
+
+class WatchBackend:
+    """Reports names of files changed in one directory.
+
+    ``wait`` blocks for up to timeout seconds and returns the names seen
+    (possibly including files nobody asked about); an empty set on timeout.
+    """
+
+    name = "base"
+
+    def wait(self, timeout: float) -> Set[str]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PollingBackend(WatchBackend):
+    """Compares (mtime, size) of the watched files every interval"""
+
+    name = "poll"
+
+    def __init__(self, directory: str, names, interval: float = DEFAULT_POLL_INTERVAL):
+        self.paths = {name: os.path.join(directory, name) for name in names}
+        self.interval = interval
+        self.signatures = {name: self._signature(path) for name, path in self.paths.items()}
+
+    @staticmethod
+    def _signature(path: str):
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def wait(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = set()
+            for name, path in self.paths.items():
+                signature = self._signature(path)
+                if signature != self.signatures[name]:
+                    self.signatures[name] = signature
+                    changed.add(name)
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+
+class InotifyBackend(WatchBackend):
+    """Linux inotify on the directory (catches atomic replaces as well as in-place writes)"""
+
+    name = "inotify"
+    EVENT = struct.Struct("iIII")
+    IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x002, 0x008, 0x080, 0x100
+    IN_NONBLOCK, IN_CLOEXEC = 0o4000, 0o2000000
+
+    def __init__(self, directory: str):
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+
+    @classmethod
+    def available(cls) -> bool:
+        return sys.platform.startswith('linux')
+
+    def wait(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not readable:
+            return set()
+        data = os.read(self.fd, 65536)
+        names = set()
+        offset = 0
+        while offset + self.EVENT.size <= len(data):
+            _, _, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ReadDirectoryChangesBackend(WatchBackend):
+    """Windows ReadDirectoryChangesW with an overlapped read, so waits can time out"""
+
+    name = "rdcw"
+
+    def __init__(self, directory: str):
+        import ctypes
+        from ctypes import wintypes
+
+        class OVERLAPPED(ctypes.Structure):
+            _fields_ = [("Internal", ctypes.c_void_p), ("InternalHigh", ctypes.c_void_p),
+                        ("Offset", wintypes.DWORD), ("OffsetHigh", wintypes.DWORD),
+                        ("hEvent", wintypes.HANDLE)]
+
+        self.ctypes, self.wintypes = ctypes, wintypes
+        kernel32 = self.kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        kernel32.CreateEventW.restype = wintypes.HANDLE
+        file_list_directory, share_all, open_existing = 0x0001, 0x0007, 3
+        backup_semantics, overlapped = 0x02000000, 0x40000000
+        self.handle = kernel32.CreateFileW(directory, file_list_directory, share_all, None, open_existing,
+                                           backup_semantics | overlapped, None)
+        if self.handle in (None, wintypes.HANDLE(-1).value):
+            raise ctypes.WinError(ctypes.get_last_error())
+        self.overlapped = OVERLAPPED()
+        self.overlapped.hEvent = kernel32.CreateEventW(None, True, False, None)
+        self.buffer = ctypes.create_string_buffer(65536)
+        self._issue()
+
+    @classmethod
+    def available(cls) -> bool:
+        return sys.platform == 'win32'
+
+    def _issue(self):
+        # FILE_NOTIFY_CHANGE_FILE_NAME | _SIZE | _LAST_WRITE
+        self.kernel32.ResetEvent(self.overlapped.hEvent)
+        if not self.kernel32.ReadDirectoryChangesW(self.handle, self.buffer, len(self.buffer), False,
+                                                   0x0001 | 0x0008 | 0x0010, None,
+                                                   self.ctypes.byref(self.overlapped), None):
+            raise self.ctypes.WinError(self.ctypes.get_last_error())
+
+    def wait(self, timeout: float) -> Set[str]:
+        wait_object_0 = 0
+        if self.kernel32.WaitForSingleObject(self.overlapped.hEvent, int(timeout * 1000)) != wait_object_0:
+            return set()
+        transferred = self.wintypes.DWORD(0)
+        self.kernel32.GetOverlappedResult(self.handle, self.ctypes.byref(self.overlapped),
+                                          self.ctypes.byref(transferred), False)
+        data = self.buffer.raw[:transferred.value]
+        names = set()
+        offset = 0
+        while data:
+            # FILE_NOTIFY_INFORMATION: NextEntryOffset, Action, FileNameLength, FileName (UTF-16)
+            next_offset, _, length = struct.unpack_from("<III", data, offset)
+            names.add(data[offset + 12:offset + 12 + length].decode('utf-16-le'))
+            if not next_offset:
+                break
+            offset += next_offset
+        self._issue()
+        return names
+
+    def close(self):
+        self.kernel32.CancelIoEx(self.handle, None)
+        self.kernel32.CloseHandle(self.overlapped.hEvent)
+        self.kernel32.CloseHandle(self.handle)
+
+
+def create_watch_backend(directory: str, names, preferred: Optional[str] = None) -> WatchBackend:
+    """Native notifications where available, stat polling otherwise"""
+    order = [preferred] if preferred else [InotifyBackend.name, ReadDirectoryChangesBackend.name]
+    for name in order:
+        try:
+            if name == InotifyBackend.name and InotifyBackend.available():
+                return InotifyBackend(directory)
+            if name == ReadDirectoryChangesBackend.name and ReadDirectoryChangesBackend.available():
+                return ReadDirectoryChangesBackend(directory)
+        except OSError as e:
+            logger.debug(f"Settings watch backend {name} unavailable: {e}")
+    return PollingBackend(directory, names)
+
+
+# -- drift detection --------------------------------------------------------
+
+def managed_settings(profile: Optional[dict] = None) -> Dict[str, Dict[str, str]]:
+    """File name -> {key: value} the UI artifact fix manages"""
+    profile = profile or builtin_profile()
+    managed = {}
+    for file_name, sections in PROFILE_FILES.items():
+        keys = {}
+        for section in sections:
+            for line in profile[section]:
+                key, value = split_setting(line)
+                if key is not None:
+                    keys[key] = value
+        managed[file_name] = keys
+    return managed
+
+
+def same_value(current: Optional[str], wanted: str) -> bool:
+    """Equal as text, or as numbers (the game rewrites 1.000000 as 1.0)"""
+    if current is None:
+        return False
+    if current.strip() == wanted.strip():
+        return True
+    try:
+        return float(current) == float(wanted)
+    except ValueError:
+        return False
+
+
+def drifted_keys(document: SettingsDocument, wanted: Dict[str, str]) -> Dict[str, str]:
+    return {key: value for key, value in wanted.items() if not same_value(document.get(key), value)}
+
+
+def file_in_use(path: str) -> bool:
+    """Whether another process has path open (on Windows: open without sharing, as the game does)"""
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        generic_read_write, open_existing, sharing_violation = 0xC0000000, 3, 32
+        handle = kernel32.CreateFileW(path, generic_read_write, 0, None, open_existing, 0, None)
+        if handle in (None, wintypes.HANDLE(-1).value):
+            return ctypes.get_last_error() == sharing_violation
+        kernel32.CloseHandle(handle)
+        return False
+
+    # Elsewhere (e.g. the game under Proton) look for the file among open descriptors
+    target = os.path.realpath(path)
+    own_pid = str(os.getpid())
+    try:
+        pids = [entry for entry in os.listdir("/proc") if entry.isdigit() and entry != own_pid]
+    except OSError:
+        return False
+    for pid in pids:
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            for fd in os.listdir(fd_dir):
+                if os.readlink(os.path.join(fd_dir, fd)) == target:
+                    return True
+        except OSError:
+            continue  # Exited, or another user's process
+    return False
+
+
+class DriftSession(NamedTuple):
+    label: str
+    started: float
+    bursts: int          # settled bursts of writes to managed files
+    drift_events: int    # bursts that had undone at least one managed key
+    keys_restored: int
+    deferred: int        # checks postponed because the file was open
+
+
+class DriftWatcher:
+    """Watches a settings directory and restores managed keys the game overwrote.
+
+    Runs on a background thread between start() and stop(); begin_session()
+    closes the current session's counts (see ``sessions``) and starts new
+    ones, so drift can be attributed to each game session.
+    """
+
+    def __init__(self, settings_path: str = DEFAULT_SETTINGS_PATH, profile: Optional[dict] = None,
+                 journal: Optional[ChangeJournal] = None, backend: Optional[str] = None,
+                 debounce: float = DEFAULT_DEBOUNCE, max_delay: float = DEFAULT_MAX_DELAY,
+                 retry_interval: float = DEFAULT_RETRY_INTERVAL):
+        if not os.path.isdir(settings_path):
+            raise FileNotFoundError(f"Settings directory not found: {settings_path}")
+        self.settings_path = settings_path
+        self.managed = managed_settings(profile)
+        self.journal = journal or ChangeJournal()
+        self.backend = create_watch_backend(settings_path, list(self.managed), backend)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.retry_interval = retry_interval
+        self.pending = set()  # type: Set[str]
+        self.written = {}  # type: Dict[str, tuple]  # (mtime_ns, size) after our own last write
+        self.sessions = []  # type: List[DriftSession]
+        self.lock = threading.Lock()
+        self._new_session("watch")
+        self.stop_event = threading.Event()
+        self.thread = None  # type: Optional[threading.Thread]
+
+    # -- sessions -------------------------------------------------------
+
+    def _new_session(self, label: str):
+        self.current = {"label": label, "started": time.time(), "bursts": 0, "drift_events": 0,
+                        "keys_restored": 0, "deferred": 0}
+
+    def begin_session(self, label: str) -> DriftSession:
+        """Close the current session (returned) and start counting a new one"""
+        with self.lock:
+            finished = DriftSession(**self.current)
+            self.sessions.append(finished)
+            self._new_session(label)
+        return finished
+
+    def _count(self, field: str, amount: int = 1):
+        with self.lock:
+            self.current[field] += amount
+
+    # -- checking -------------------------------------------------------
+
+    def own_write(self, file_name: str) -> bool:
+        """Whether the file is still exactly what we last wrote (so the event was our own)"""
+        try:
+            stat = os.stat(os.path.join(self.settings_path, file_name))
+        except OSError:
+            return False
+        return self.written.get(file_name) == (stat.st_mtime_ns, stat.st_size)
+
+    def check(self, file_name: str) -> Optional[int]:
+        """Restore drifted keys of one file; number restored, or None if the file is busy"""
+        path = os.path.join(self.settings_path, file_name)
+        if not os.path.exists(path) or self.own_write(file_name):
+            return 0
+        if file_in_use(path):
+            return None
+
+        document = SettingsDocument.load(path)
+        drifted = drifted_keys(document, self.managed[file_name])
+        if not drifted:
+            return 0
+        for key, value in drifted.items():
+            document.set(key, value)
+        self.journal.begin("settings drift")
+        try:
+            self.journal.write_settings(document)  # Write-ahead journal, then one atomic replace
+        except PermissionError:
+            return None  # Opened by the game between the check and the write
+        finally:
+            self.journal.commit()
+        stat = os.stat(path)
+        self.written[file_name] = (stat.st_mtime_ns, stat.st_size)
+        logger.info(f"Settings drift in {file_name}: restored {', '.join(sorted(drifted))}")
+        return len(drifted)
+
+    def check_pending(self, settled: bool = True):
+        for file_name in sorted(self.pending):
+            if self.own_write(file_name):
+                self.pending.discard(file_name)
+                continue
+            try:
+                restored = self.check(file_name)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not check {file_name} for drift: {e}")
+                restored = 0
+            if restored is None:
+                self._count("deferred")
+                continue  # Retried after retry_interval
+            self.pending.discard(file_name)
+            if settled:
+                self._count("bursts")
+            if restored:
+                self._count("drift_events")
+                self._count("keys_restored", restored)
+
+    # -- thread ---------------------------------------------------------
+
+    def _collect(self, timeout: float) -> Set[str]:
+        return {name for name in self.backend.wait(timeout) if name in self.managed}
+
+    def _run(self):
+        self.pending.update(self.managed)  # Repair drift that happened while nobody watched
+        self.check_pending(settled=False)
+        while not self.stop_event.is_set():
+            changed = self._collect(self.retry_interval if self.pending else 1.0)
+            if changed:
+                # Debounce: wait until the game has been quiet for a while (bounded by max_delay)
+                first = time.monotonic()
+                quiet_until = first + self.debounce
+                while not self.stop_event.is_set():
+                    now = time.monotonic()
+                    if now >= quiet_until or now - first >= self.max_delay:
+                        break
+                    more = self._collect(min(quiet_until, first + self.max_delay) - now)
+                    if more:
+                        changed |= more
+                        quiet_until = time.monotonic() + self.debounce
+                self.pending |= changed
+            if self.pending and not self.stop_event.is_set():
+                self.check_pending()
+
+    def start(self) -> 'DriftWatcher':
+        self.thread = threading.Thread(target=self._run, name="drift-watcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> List[DriftSession]:
+        """Stop watching; returns every session including the one still open"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.backend.close()
+        self.begin_session("stopped")
+        return self.sessions
+
+
+def describe_session(session: DriftSession) -> str:
+    return (f"{session.drift_events} drift event(s), {session.keys_restored} key(s) restored "
+            f"over {session.bursts} settled write burst(s)"
+            + (f", {session.deferred} deferred while the file was open" if session.deferred else ""))
+
+
+def main():
+    args = sys.argv[1:]
+    backend = args[args.index("--backend") + 1] if "--backend" in args[:-1] else None
+    positional = [arg for index, arg in enumerate(args) if not arg.startswith("--")
+                  and (index == 0 or args[index - 1] != "--backend")]
+    settings_path = positional[0] if positional else DEFAULT_SETTINGS_PATH
+    if not os.path.isdir(settings_path):
+        print(f"❌ Settings directory not found: {settings_path}")
+        return 1
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    watcher = DriftWatcher(settings_path, backend=backend)
+    print(f"👀 Watching {settings_path} ({watcher.backend.name}); Ctrl+C to stop")
+    watcher.start()
+    try:
+        while watcher.thread.is_alive():
+            watcher.thread.join(1.0)
+    except KeyboardInterrupt:
+        pass
+    sessions = watcher.stop()
+    print(f"✅ {describe_session(sessions[0])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
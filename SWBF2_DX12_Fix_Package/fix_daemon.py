@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Runtime Fix Daemon for Star Wars Battlefront II
+Keeps watching for the game after the first session instead of giving up:
+every new game process (restarts, the trial executable, a reused PID) gets
+the runtime fixes, each session is tracked until its process exits, and
+the daemon shuts down cleanly on Ctrl+C or SIGTERM. Between sessions it
+waits on WMI notifications, or polls with a back-off that settles at one
+scan a second, and reports how much CPU it used while idle. With
+--watch-settings the UI fix settings are also guarded against the game
+overwriting them (see drift_watcher.py), with drift reported per session.
+
+Usage: python fix_daemon.py [--telemetry[=Hz]] [--throttle-background] [--watch-settings]
+"""
+
+import os
+import sys
+import time
+import signal
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from process_watch import ProcessEvent, ProcessWatcher, load_psutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_POLL_INTERVAL = 1.0  # seconds between scans once polling has backed off
+DEFAULT_LIVENESS_INTERVAL = 2.0  # seconds between checks that tracked game processes still run
+
+
+def process_alive(pid: int, create_time: Optional[float] = None) -> bool:
+    """Whether pid still runs (and, given create_time, is still the same process)"""
+    psutil = load_psutil()
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            if process.status() == psutil.STATUS_ZOMBIE:
+                return False
+            # Backends derive start times from differently rounded boot times
+            return create_time is None or abs(process.create_time() - create_time) < 2.0
+        except psutil.NoSuchProcess:
+            return False
+        except psutil.AccessDenied:
+            return True
+    try:
+        with open(f"/proc/{pid}/stat", 'rb') as f:
+            stat = f.read()
+        return stat[stat.rindex(b')') + 2:stat.rindex(b')') + 3] != b'Z'
+    except OSError:
+        return False
+
+
+class GameSession:
+    """One game process from detection to exit"""
+
+    def __init__(self, event: ProcessEvent):
+        self.pid = event.pid
+        self.name = event.name
+        self.create_time = event.create_time
+        self.detected_at = event.detected_at
+        self.fixed = False
+        self.ended_at = None  # type: Optional[float]
+        self.throttler = None
+        self.sampler = None
+
+    @property
+    def duration(self) -> float:
+        return (self.ended_at or time.time()) - self.detected_at
+
+
+class FixDaemon:
+    """Applies the fixer's runtime fixes to every game process until stopped.
+
+    ``fixer`` is a SWBF2DX12Fixer (anything with apply_runtime_fixes and the
+    throttle_background/telemetry_rate/watch_settings settings). Telemetry and
+    background throttling, when enabled, run per session and end with it;
+    the settings drift watcher runs for the daemon's lifetime.
+    """
+
+    def __init__(self, fixer, names: Iterable[str], watcher: Optional[ProcessWatcher] = None,
+                 max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+                 liveness_interval: float = DEFAULT_LIVENESS_INTERVAL):
+        self.fixer = fixer
+        self.watcher = watcher or ProcessWatcher(names, max_poll_interval=max_poll_interval)
+        self.liveness_interval = liveness_interval
+        self.sessions = {}  # type: Dict[int, GameSession]
+        self.finished = []  # type: List[GameSession]
+        self.stop_event = threading.Event()
+        self.idle_cpu = 0.0       # CPU seconds used while no game was running
+        self.idle_elapsed = 0.0
+        self.drift_watcher = None
+
+    def request_stop(self, *_):
+        """Stop the daemon (safe from signal handlers and other threads)"""
+        self.stop_event.set()
+
+    def install_signal_handlers(self):
+        signals = [signal.SIGINT, signal.SIGTERM]
+        if hasattr(signal, "SIGBREAK"):
+            signals.append(signal.SIGBREAK)  # Console close / Ctrl+Break on Windows
+        for signum in signals:
+            signal.signal(signum, self.request_stop)
+
+    @property
+    def idle_overhead(self) -> float:
+        """Percent of one core used while idle"""
+        return self.idle_cpu / self.idle_elapsed * 100 if self.idle_elapsed else 0.0
+
+    # -- sessions -------------------------------------------------------
+
+    def _start_session(self, event: ProcessEvent):
+        current = self.sessions.get(event.pid)
+        if current is not None and process_alive(current.pid, current.create_time):
+            return  # Already fixed (e.g. reported again by a fresh snapshot)
+        if current is not None:
+            self._end_session(current)  # The PID was reused by a new game process
+
+        session = GameSession(event)
+        self.sessions[event.pid] = session
+        logger.info(f"Game session started: {event.name} (PID: {event.pid})")
+        if self.drift_watcher is not None:
+            self.drift_watcher.begin_session(f"{event.name} {event.pid}")
+        if event.latency is not None:
+            logger.info(f"Game process detected {event.latency * 1000:.1f} ms after launch")
+        session.fixed = self.fixer.apply_runtime_fixes(event.pid, event.name)
+        if not session.fixed:
+            return
+        if getattr(self.fixer, "throttle_background", False):
+            session.throttler = self.fixer.start_background_throttle(event.pid)
+        if getattr(self.fixer, "telemetry_rate", None):
+            from telemetry import TelemetrySampler, open_telemetry_source
+            try:
+                session.sampler = TelemetrySampler(open_telemetry_source(event.pid),
+                                                   self.fixer.telemetry_rate).start()
+            except (ProcessLookupError, RuntimeError) as e:
+                logger.warning(f"Telemetry unavailable: {e}")
+
+    def _end_session(self, session: GameSession):
+        session.ended_at = time.time()
+        self.sessions.pop(session.pid, None)
+        self.finished.append(session)
+        if session.throttler is not None:
+            self.fixer.stop_background_throttle(session.throttler)
+        if session.sampler is not None:
+            session.sampler.stop()
+            self.fixer.save_telemetry(session.sampler, session.pid)
+        logger.info(f"Game session ended: {session.name} (PID: {session.pid}) "
+                    f"after {session.duration / 60:.1f} min")
+        if self.drift_watcher is not None:
+            from drift_watcher import describe_session
+            drift = self.drift_watcher.begin_session("between sessions")
+            logger.info(f"Settings drift during the session: {describe_session(drift)}")
+        self.watcher.reset_backoff()  # A restart usually follows shortly
+
+    def _check_sessions(self):
+        for session in list(self.sessions.values()):
+            if not process_alive(session.pid, session.create_time):
+                self._end_session(session)
+
+    # -- main loop ------------------------------------------------------
+
+    def run(self) -> int:
+        """Run until request_stop; returns the number of game sessions seen"""
+        logger.info(f"Fix daemon started (process watch backend: {self.watcher.backend.name})")
+        if getattr(self.fixer, "watch_settings", False):
+            self.drift_watcher = self.fixer.start_settings_watch()
+        try:
+            while not self.stop_event.is_set():
+                idle = not self.sessions
+                cpu_start, wall_start = time.process_time(), time.monotonic()
+                event = self.watcher.wait_for_process(timeout=self.liveness_interval, cancel=self.stop_event)
+                if idle and event is None:
+                    self.idle_cpu += time.process_time() - cpu_start
+                    self.idle_elapsed += time.monotonic() - wall_start
+                if event is not None:
+                    self._start_session(event)
+                self._check_sessions()
+        finally:
+            for session in list(self.sessions.values()):
+                self._end_session(session)
+            self.watcher.close()
+            if self.drift_watcher is not None:
+                self.fixer.stop_settings_watch(self.drift_watcher)
+            logger.info(f"Fix daemon stopped after {len(self.finished)} session(s); "
+                        f"idle CPU {self.idle_overhead:.3f}% of one core")
+        return len(self.finished)
+
+
+def main():
+    from SWBF2_DX12_Complete_Fix import SWBF2DX12Fixer
+    from telemetry import DEFAULT_RATE
+
+    telemetry_rate = None
+    for arg in sys.argv[1:]:
+        if arg == "--telemetry" or arg.startswith("--telemetry="):
+            telemetry_rate = float(arg.partition("=")[2] or DEFAULT_RATE)
+    fixer = SWBF2DX12Fixer(telemetry_rate=telemetry_rate,
+                           throttle_background="--throttle-background" in sys.argv[1:],
+                           watch_settings="--watch-settings" in sys.argv[1:])
+    print(f"🔁 Applying runtime fixes to every SWBF2 launch (PID {os.getpid()}, Ctrl+C to stop)...")
+    sessions = fixer.run_daemon()
+    print(f"✅ Stopped after {sessions} game session(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Fleet Batch Fix for Star Wars Battlefront II
+Headless batch mode for machines with several user profiles and installs:
+finds every profile's settings directory and every game install, applies
+the file-level fixes (UI artifact settings and profile, DX12 engine config)
+to all of them in a process pool, and writes one report. Each target gets
+its own change journal, so a failure only affects that target and every
+target can be rolled back on its own or with the whole batch.
+
+Usage: python fleet_fix.py [--users-root DIR ...] [--game DIR ...] [--no-discovery]
+                           [--workers N] [--report PATH] [--profile-url URL [--profile NAME]]
+       python fleet_fix.py rollback <batch_dir>
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import uuid
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from backup_store import DEFAULT_STORE_PATH, BackupStore
+from change_journal import ChangeJournal
+from game_discovery import GAME_EXECUTABLE, GAME_FOLDER_NAME, GameDiscovery
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLEET_DIR = DEFAULT_STORE_PATH / "Fleet"
+SETTINGS_FILES = ("BootOptions", "ProfileOptions_profile")
+# Where a profile's Documents folder can be, relative to the profile directory
+DOCUMENTS_DIRS = (Path("Documents"), Path("OneDrive") / "Documents")
+
+SETTINGS, INSTALL = "settings", "install"
+FIXED, UNCHANGED, FAILED = "fixed", "unchanged", "failed"
+
+
+class FleetTarget(NamedTuple):
+    kind: str    # SETTINGS or INSTALL
+    path: str
+    owner: str   # profile name for settings, discovery source for installs
+
+
+class TargetResult(NamedTuple):
+    target: FleetTarget
+    status: str            # FIXED, UNCHANGED or FAILED
+    changes: int
+    fixes: List[str]
+    error: Optional[str]
+    elapsed: float
+    journal: Optional[str]
+
+
+def default_users_roots() -> List[Path]:
+    if sys.platform == 'win32':
+        return [Path(os.environ.get("SystemDrive", "C:") + "\\") / "Users"]
+    return []
+
+
+def find_settings_dirs(users_roots: Iterable[Path]) -> List[FleetTarget]:
+    """Every user profile's game settings directory that has settings files"""
+    targets = []
+    for root in users_roots:
+        try:
+            profiles = sorted((entry for entry in os.scandir(root) if entry.is_dir()),
+                              key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Cannot list user profiles in {root}: {e}")
+            continue
+        for profile in profiles:
+            for documents in DOCUMENTS_DIRS:
+                settings = Path(profile.path) / documents / GAME_FOLDER_NAME / "settings"
+                if any((settings / name).is_file() for name in SETTINGS_FILES):
+                    targets.append(FleetTarget(SETTINGS, str(settings), profile.name))
+    return targets
+
+
+def find_installs(extra_paths: Iterable[Path] = (), discovery: bool = True) -> List[FleetTarget]:
+    """Installs from the launcher manifests plus extra_paths, each once"""
+    candidates = [(str(path), "command line") for path in extra_paths]
+    if discovery:
+        candidates += [(install.path, install.source) for install in GameDiscovery().discover()]
+    targets, seen = [], set()
+    for path, source in candidates:
+        key = os.path.normcase(os.path.normpath(path))
+        if key in seen or not os.path.exists(os.path.join(path, GAME_EXECUTABLE)):
+            continue
+        seen.add(key)
+        targets.append(FleetTarget(INSTALL, path, source))
+    return targets
+
+
+def journal_dir(batch_dir: Path, target: FleetTarget) -> Path:
+    key = hashlib.sha1(os.path.normcase(os.path.normpath(target.path)).encode('utf-8')).hexdigest()[:12]
+    return Path(batch_dir) / f"{target.kind}-{key}"
+
+
+def fix_target(target: FleetTarget, batch_dir: str, profile: Optional[dict] = None) -> TargetResult:
+    """Apply the file-level fixes to one target (runs in a pool worker; never raises)"""
+    start = time.perf_counter()
+    directory = journal_dir(Path(batch_dir), target)
+    output = io.StringIO()
+    fixes = []  # type: List[str]
+    try:
+        journal = ChangeJournal(directory / "journal.jsonl", BackupStore(directory))
+        journal.begin(f"fleet {target.kind} {target.path}")
+        with redirect_stdout(output):
+            if target.kind == SETTINGS:
+                from Fix_UI_Artifacts import UIArtifactFixer
+                fixer = UIArtifactFixer(target.path, journal=journal, profile=profile)
+                fixes = fixer.fix_ui_specific_artifacts()
+                if not fixes:
+                    raise RuntimeError("no UI fixes could be applied")
+                if fixer.create_ui_fix_profile():
+                    fixes.append("UI_Fix_Profile")
+            else:
+                from SWBF2_DX12_Complete_Fix import apply_dx12_config
+                apply_dx12_config(Path(target.path), journal)
+                fixes = ["DX12 engine config"]
+        changes = journal.sequence
+        journal.commit()
+    except Exception as e:
+        # Keep the fixers' own explanation (they print rather than raise)
+        detail = " ".join(line.strip() for line in output.getvalue().splitlines() if "⚠️" in line)
+        error = f"{type(e).__name__}: {e}" + (f" ({detail})" if detail else "")
+        return TargetResult(target, FAILED, 0, fixes, error, time.perf_counter() - start, str(directory))
+    status = FIXED if changes else UNCHANGED
+    return TargetResult(target, status, changes, fixes, None, time.perf_counter() - start, str(directory))
+
+
+def rollback_target(directory: str) -> int:
+    """Undo one target's journal (runs in a pool worker)"""
+    directory = Path(directory)
+    return ChangeJournal(directory / "journal.jsonl", BackupStore(directory)).rollback()
+
+
+def run_pool(function: Callable, items: list, workers: Optional[int] = None,
+             progress: Optional[Callable] = None) -> list:
+    """function(*item) for every item, in a process pool (inline for one worker); results in item order.
+
+    An item whose worker raises or dies yields the exception instead of a
+    result, so one bad target never aborts the batch.
+    """
+    results = [None] * len(items)
+    if workers == 1 or len(items) <= 1:
+        for index, item in enumerate(items):
+            try:
+                results[index] = function(*item)
+            except Exception as e:
+                results[index] = e
+            if progress:
+                progress(index + 1, len(items))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(function, *item): index for index, item in enumerate(items)}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = e
+            if progress:
+                progress(done, len(items))
+    return results
+
+
+def run_batch(targets: List[FleetTarget], batch_dir: Path, workers: Optional[int] = None,
+              progress: Optional[Callable] = None, profile: Optional[dict] = None) -> dict:
+    """Fix every target and return the aggregated report (also saved as batch_dir/report.json).
+
+    profile replaces the built-in UI fixes (see profile_sync.py); it is
+    fetched once by the caller rather than by every worker.
+    """
+    batch_dir = Path(batch_dir)
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    started, start = time.time(), time.perf_counter()
+    outcomes = run_pool(fix_target, [(target, str(batch_dir), profile) for target in targets], workers, progress)
+
+    results = []
+    for target, outcome in zip(targets, outcomes):
+        if isinstance(outcome, Exception):
+            outcome = TargetResult(target, FAILED, 0, [], f"worker failed: {type(outcome).__name__}: {outcome}",
+                                   0.0, None)
+        results.append(outcome)
+
+    report = {
+        "batch": batch_dir.name,
+        "started": started,
+        "elapsed": time.perf_counter() - start,
+        "workers": workers or os.cpu_count(),
+        "profile": profile.get("name") if profile else "built-in",
+        "totals": {status: sum(1 for result in results if result.status == status)
+                   for status in (FIXED, UNCHANGED, FAILED)},
+        "targets": [dict(result._asdict(), target=result.target._asdict(), elapsed=round(result.elapsed, 4))
+                    for result in results],
+    }
+    with open(batch_dir / "report.json", 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def rollback_batch(batch_dir: Path, workers: Optional[int] = None) -> int:
+    """Undo every target of a batch; returns the number of changes undone"""
+    directories = [(str(path),) for path in sorted(Path(batch_dir).iterdir())
+                   if (path / "journal.jsonl").exists()]
+    undone = 0
+    for directory, outcome in zip(directories, run_pool(rollback_target, directories, workers)):
+        if isinstance(outcome, Exception):
+            print(f"   ❌ {directory[0]}: {outcome}")
+        else:
+            undone += outcome
+    return undone
+
+
+def _option_values(args: List[str], option: str) -> List[str]:
+    return [args[index + 1] for index, arg in enumerate(args[:-1]) if arg == option]
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "rollback":
+        if len(args) < 2:
+            print("Usage: python fleet_fix.py rollback <batch_dir>")
+            return 1
+        undone = rollback_batch(Path(args[1]))
+        print(f"✅ Rolled back {undone} change(s)")
+        return 0
+
+    users_roots = [Path(path) for path in _option_values(args, "--users-root")] or default_users_roots()
+    games = [Path(path) for path in _option_values(args, "--game")]
+    workers = int(_option_values(args, "--workers")[0]) if "--workers" in args else None
+
+    targets = find_settings_dirs(users_roots) + find_installs(games, discovery="--no-discovery" not in args)
+    if not targets:
+        print("❌ No settings directories or game installs found")
+        return 1
+    settings_count = sum(1 for target in targets if target.kind == SETTINGS)
+    print(f"🖧  {settings_count} settings director(ies) and {len(targets) - settings_count} install(s)")
+
+    profile = None
+    if "--profile-url" in args:
+        from profile_sync import DEFAULT_PROFILE_NAME, fetch_profile
+        name = (_option_values(args, "--profile") or [DEFAULT_PROFILE_NAME])[0]
+        try:
+            profile, source = fetch_profile(_option_values(args, "--profile-url")[0], name)
+        except (RuntimeError, ValueError) as e:
+            print(f"❌ Could not get fix profile {name}: {e}")
+            return 1
+        print(f"📥 Fix profile {name} ({source})")
+
+    batch_dir = DEFAULT_FLEET_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    report = run_batch(targets, batch_dir, workers, profile=profile)
+    if "--report" in args:
+        with open(_option_values(args, "--report")[0], 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    totals = report["totals"]
+    print(f"✅ {totals[FIXED]} fixed, {totals[UNCHANGED]} already fixed, {totals[FAILED]} failed "
+          f"in {report['elapsed']:.2f} s")
+    for entry in report["targets"]:
+        if entry["status"] == FAILED:
+            print(f"   ❌ {entry['target']['path']}: {entry['error']}")
+    print(f"📄 Report: {batch_dir / 'report.json'} (undo with: python fleet_fix.py rollback {batch_dir})")
+    return 0 if not totals[FAILED] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
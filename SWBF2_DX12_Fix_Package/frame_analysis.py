@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Frame-Time Analysis for Star Wars Battlefront II
+Streams PresentMon/CapFrameX frame-time CSV captures in chunks and reduces
+them to average FPS, 1%/0.1% lows, frame-time percentiles and stutter counts.
+Frame times go into a fixed 10 µs histogram instead of being kept, so memory
+stays bounded on multi-hour captures. NumPy vectorizes each chunk when it is
+installed; the same results are computed in pure Python otherwise.
+
+Usage: python frame_analysis.py <capture.csv> [--app NAME] [--json] [--attach [run]]
+"""
+
+import sys
+import csv
+import json
+import math
+import logging
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+# Frame-time columns in the order they are tried (PresentMon 1.x/2.x, CapFrameX)
+FRAME_TIME_COLUMNS = ("MsBetweenPresents", "msBetweenPresents", "FrameTime", "MsBetweenDisplayChange")
+APPLICATION_COLUMNS = ("Application", "ProcessName")
+DEFAULT_CHUNK_ROWS = 65536
+
+HISTOGRAM_RESOLUTION_MS = 0.01
+HISTOGRAM_MAX_MS = 1000.0  # Longer frames share an overflow bin; their exact sum is kept
+HISTOGRAM_BINS = int(HISTOGRAM_MAX_MS / HISTOGRAM_RESOLUTION_MS)
+
+PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9)
+STUTTER_FACTOR = 2.5   # A frame this many times longer than the running average is a stutter
+HITCH_MS = 50.0        # Frames at least this long are counted as hitches regardless
+
+
+class FrameSummary(NamedTuple):
+    """Compact result of a capture, small enough to attach to a fix run"""
+    frames: int
+    duration: float                   # seconds of frame time
+    average_fps: float
+    low_1_fps: float                  # FPS of the 99th percentile frame time
+    low_01_fps: float                 # FPS of the 99.9th percentile frame time
+    low_1_average_fps: float          # average FPS of the slowest 1% of frames
+    low_01_average_fps: float
+    percentiles_ms: Dict[str, float]  # "50", "90", "95", "99", "99.9"
+    max_ms: float
+    stutters: int
+    hitches: int
+
+    def to_dict(self) -> dict:
+        data = {key: (round(value, 3) if isinstance(value, float) else value)
+                for key, value in self._asdict().items()}
+        data["percentiles_ms"] = {name: round(value, 3) for name, value in self.percentiles_ms.items()}
+        return data
+
+
+class FrameTimeAccumulator:
+    """Running frame-time statistics in constant memory"""
+
+    def __init__(self, use_numpy: Optional[bool] = None):
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        if self.use_numpy and numpy is None:
+            raise RuntimeError("NumPy is not installed")
+        self.engine = "numpy" if self.use_numpy else "python"
+        if self.use_numpy:
+            self.histogram = numpy.zeros(HISTOGRAM_BINS + 1, dtype=numpy.int64)
+        else:
+            self.histogram = array('Q', bytes(8 * (HISTOGRAM_BINS + 1)))
+        self.frames = 0
+        self.total_ms = 0.0
+        self.overflow_ms = 0.0
+        self.max_ms = 0.0
+        self.stutters = 0
+        self.hitches = 0
+
+    def add(self, frame_times: Sequence[float]):
+        """Add one chunk of frame times in milliseconds (invalid values are dropped)"""
+        if self.use_numpy:
+            self._add_numpy(numpy.asarray(frame_times, dtype=numpy.float64))
+        else:
+            self._add_python(frame_times)
+
+    def _add_numpy(self, times):
+        times = times[numpy.isfinite(times) & (times > 0)]
+        if not times.size:
+            return
+        # Running average of every frame before each one (the first frame of a capture has none)
+        preceding = numpy.cumsum(times) - times + self.total_ms
+        counts = numpy.arange(self.frames, self.frames + times.size, dtype=numpy.float64)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            stutter = (counts > 0) & (times * counts > STUTTER_FACTOR * preceding)
+        self.stutters += int(numpy.count_nonzero(stutter))
+        self.hitches += int(numpy.count_nonzero(times >= HITCH_MS))
+
+        bins = numpy.minimum((times / HISTOGRAM_RESOLUTION_MS).astype(numpy.int64), HISTOGRAM_BINS)
+        self.histogram += numpy.bincount(bins, minlength=HISTOGRAM_BINS + 1)
+        self.overflow_ms += float(times[bins == HISTOGRAM_BINS].sum())
+        self.frames += int(times.size)
+        self.total_ms += float(times.sum())
+        self.max_ms = max(self.max_ms, float(times.max()))
+
+    def _add_python(self, times: Sequence[float]):
+        histogram = self.histogram
+        frames, total = self.frames, self.total_ms
+        for value in times:
+            if not (value > 0) or math.isinf(value):
+                continue
+            if frames and value * frames > STUTTER_FACTOR * total:
+                self.stutters += 1
+            if value >= HITCH_MS:
+                self.hitches += 1
+            index = int(value / HISTOGRAM_RESOLUTION_MS)
+            if index >= HISTOGRAM_BINS:
+                index = HISTOGRAM_BINS
+                self.overflow_ms += value
+            histogram[index] += 1
+            frames += 1
+            total += value
+            if value > self.max_ms:
+                self.max_ms = value
+        self.frames, self.total_ms = frames, total
+
+    # -- reduction ------------------------------------------------------
+
+    def _bin_value(self, index: int) -> float:
+        """Representative frame time of a bin (its centre; the overflow bin's mean)"""
+        if index == HISTOGRAM_BINS:
+            overflow = int(self.histogram[HISTOGRAM_BINS])
+            return self.overflow_ms / overflow if overflow else HISTOGRAM_MAX_MS
+        return (index + 0.5) * HISTOGRAM_RESOLUTION_MS
+
+    def percentile(self, percent: float) -> float:
+        """Frame time (ms) that percent of frames do not exceed"""
+        if not self.frames:
+            return 0.0
+        rank = max(1, math.ceil(self.frames * percent / 100.0))
+        if self.use_numpy:
+            index = int(numpy.searchsorted(numpy.cumsum(self.histogram), rank))
+        else:
+            seen = 0
+            for index, count in enumerate(self.histogram):
+                seen += count
+                if seen >= rank:
+                    break
+        return min(self._bin_value(index), self.max_ms)
+
+    def slowest_average(self, percent: float) -> float:
+        """Mean frame time (ms) of the slowest percent of frames"""
+        if not self.frames:
+            return 0.0
+        wanted = max(1, math.ceil(self.frames * percent / 100.0))
+        if self.use_numpy:
+            occupied = numpy.flatnonzero(self.histogram)[::-1].tolist()
+        else:
+            occupied = (index for index in range(HISTOGRAM_BINS, -1, -1) if self.histogram[index])
+        taken, total = 0, 0.0
+        for index in occupied:
+            count = int(self.histogram[index])
+            used = min(count, wanted - taken)
+            total += used * self._bin_value(index)
+            taken += used
+            if taken == wanted:
+                break
+        return total / taken
+
+    def summary(self) -> FrameSummary:
+        def fps(frame_ms: float) -> float:
+            return 1000.0 / frame_ms if frame_ms > 0 else 0.0
+
+        percentiles = {f"{percent:g}": self.percentile(percent) for percent in PERCENTILES}
+        return FrameSummary(
+            frames=self.frames,
+            duration=self.total_ms / 1000.0,
+            average_fps=fps(self.total_ms / self.frames) if self.frames else 0.0,
+            low_1_fps=fps(percentiles["99"]),
+            low_01_fps=fps(percentiles["99.9"]),
+            low_1_average_fps=fps(self.slowest_average(1.0)),
+            low_01_average_fps=fps(self.slowest_average(0.1)),
+            percentiles_ms=percentiles,
+            max_ms=self.max_ms,
+            stutters=self.stutters,
+            hitches=self.hitches,
+        )
+
+
+def read_frame_times(path, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                     application: Optional[str] = None) -> Iterator[List[float]]:
+    """Frame times (ms) from a capture CSV, chunk_rows at a time.
+
+    CapFrameX "//" comment lines are skipped; with application set, only
+    rows of that process (Application/ProcessName column) are kept.
+    """
+    with open(path, 'r', newline='', encoding='utf-8', errors='replace') as f:
+        rows = csv.reader(line for line in f if not line.startswith("//"))
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [name.strip() for name in header]
+        column = next((header.index(name) for name in FRAME_TIME_COLUMNS if name in header), None)
+        if column is None:
+            raise ValueError(f"{path}: no frame-time column (expected one of {', '.join(FRAME_TIME_COLUMNS)})")
+        app_column = next((header.index(name) for name in APPLICATION_COLUMNS if name in header), None)
+        if application and app_column is None:
+            raise ValueError(f"{path}: no application column to filter on")
+        wanted = application.lower() if application else None
+
+        chunk = []  # type: List[float]
+        for row in rows:
+            if len(row) <= column or (wanted and row[app_column].strip().lower() != wanted):
+                continue
+            try:
+                chunk.append(float(row[column]))
+            except ValueError:
+                continue
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def analyze_capture(path, application: Optional[str] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                    use_numpy: Optional[bool] = None) -> FrameSummary:
+    accumulator = FrameTimeAccumulator(use_numpy)
+    for chunk in read_frame_times(path, chunk_rows, application):
+        accumulator.add(chunk)
+    return accumulator.summary()
+
+
+def print_summary(summary: FrameSummary):
+    if not summary.frames:
+        print("No frames found")
+        return
+    percentiles = ", ".join(f"P{name} {value:.2f}" for name, value in summary.percentiles_ms.items())
+    print(f"   Frames:       {summary.frames} over {summary.duration:.1f} s")
+    print(f"   Average:      {summary.average_fps:.1f} FPS")
+    print(f"   1% low:       {summary.low_1_fps:.1f} FPS ({summary.low_1_average_fps:.1f} FPS average of slowest 1%)")
+    print(f"   0.1% low:     {summary.low_01_fps:.1f} FPS ({summary.low_01_average_fps:.1f} FPS average of slowest 0.1%)")
+    print(f"   Frame times:  {percentiles}, max {summary.max_ms:.2f} ms")
+    print(f"   Stutters:     {summary.stutters} (> {STUTTER_FACTOR:g}x running average), "
+          f"hitches: {summary.hitches} (>= {HITCH_MS:g} ms)")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0].startswith("--"):
+        print("Usage: python frame_analysis.py <capture.csv> [--app NAME] [--json] [--attach [run]]")
+        return 1
+    path = args[0]
+    application = args[args.index("--app") + 1] if "--app" in args[:-1] else None
+
+    try:
+        summary = analyze_capture(path, application)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not analyze {path}: {e}")
+        return 1
+
+    if "--json" in args:
+        print(json.dumps(summary.to_dict(), indent=2))
+    else:
+        print(f"📊 {path}")
+        print_summary(summary)
+
+    if "--attach" in args:
+        from change_journal import ChangeJournal
+        position = args.index("--attach") + 1
+        run = args[position] if position < len(args) and not args[position].startswith("--") else None
+        attached = ChangeJournal().attach("frame_summary", dict(summary.to_dict(), capture=str(path)), run)
+        if attached is None:
+            print("❌ No fix run recorded to attach the summary to")
+            return 1
+        print(f"✅ Attached to fix run {attached}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
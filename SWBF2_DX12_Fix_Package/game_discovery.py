@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Game Installation Discovery for Star Wars Battlefront II
+Builds an index of installs from Steam library manifests (libraryfolders.vdf,
+appmanifest_*.acf), Origin/EA install manifests (*.mfst) and the EA registry
+key, and caches it on disk keyed by the manifests' modification times.
+"""
+
+import os
+import sys
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import parse_qs
+
+from path_probe import DEFAULT_PROBE_TIMEOUT, ProbeReport, probe_paths
+
+logger = logging.getLogger(__name__)
+
+GAME_EXECUTABLE = "starwarsbattlefrontii.exe"
+GAME_FOLDER_NAME = "STAR WARS Battlefront II"
+STEAM_APP_ID = "1237950"
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent / "discovery_cache.json"
+
+# Hard-coded locations, only probed when no manifest knows about the game
+FALLBACK_PATHS = [
+    r"C:\Program Files (x86)\Steam\steamapps\common\STAR WARS Battlefront II",
+    r"C:\Program Files\Steam\steamapps\common\STAR WARS Battlefront II",
+    r"D:\Steam\steamapps\common\STAR WARS Battlefront II",
+    r"E:\Steam\steamapps\common\STAR WARS Battlefront II",
+    r"E:\SteamLibrary\steamapps\common\STAR WARS Battlefront II",
+    r"C:\Program Files (x86)\EA Games\STAR WARS Battlefront II",
+    r"C:\Program Files\EA Games\STAR WARS Battlefront II",
+    r"C:\Program Files (x86)\Origin Games\STAR WARS Battlefront II",
+    r"C:\Program Files\Origin Games\STAR WARS Battlefront II",
+]
+
+
+class GameInstall(NamedTuple):
+    """A known game installation"""
+    path: str
+    source: str  # "local", "steam", "origin", "registry" or "fallback"
+    manifest: Optional[str] = None
+
+
+def parse_vdf(text: str) -> dict:
+    """Parse Valve KeyValues text (libraryfolders.vdf, appmanifest_*.acf) into nested dicts"""
+    tokens = []
+    i, length = 0, len(text)
+    while i < length:
+        char = text[i]
+        if char in ' \t\r\n':
+            i += 1
+        elif char == '/' and text.startswith('//', i):
+            newline = text.find('\n', i)
+            i = length if newline == -1 else newline + 1
+        elif char in '{}':
+            tokens.append(char)
+            i += 1
+        elif char == '"':
+            value = []
+            i += 1
+            while i < length and text[i] != '"':
+                if text[i] == '\\' and i + 1 < length:
+                    value.append(text[i + 1])
+                    i += 2
+                else:
+                    value.append(text[i])
+                    i += 1
+            tokens.append(('str', ''.join(value)))
+            i += 1
+        else:
+            start = i
+            while i < length and text[i] not in ' \t\r\n{}"':
+                i += 1
+            tokens.append(('str', text[start:i]))
+
+    root = {}
+    stack = [root]
+    key = None
+    for token in tokens:
+        if token == '{':
+            child = {}
+            stack[-1][key if key is not None else ''] = child
+            stack.append(child)
+            key = None
+        elif token == '}':
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        elif key is None:
+            key = token[1]
+        else:
+            stack[-1][key] = token[1]
+            key = None
+    return root
+
+
+def _lower_keys(node: dict) -> dict:
+    return {k.lower(): v for k, v in node.items()}
+
+
+def default_steam_roots() -> List[Path]:
+    """Steam client directories for this machine"""
+    roots = []
+    if sys.platform == 'win32':
+        try:
+            import winreg
+            for hive, key_path, value in (
+                (winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam", "SteamPath"),
+                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam", "InstallPath"),
+            ):
+                try:
+                    with winreg.OpenKey(hive, key_path) as key:
+                        roots.append(Path(winreg.QueryValueEx(key, value)[0]))
+                except OSError:
+                    continue
+        except ImportError:
+            pass
+        roots += [Path(r"C:\Program Files (x86)\Steam"), Path(r"C:\Program Files\Steam")]
+    else:
+        home = Path.home()
+        roots += [
+            home / ".steam" / "steam",
+            home / ".local" / "share" / "Steam",
+            home / ".var" / "app" / "com.valvesoftware.Steam" / ".local" / "share" / "Steam",
+        ]
+    return roots
+
+
+def default_origin_roots() -> List[Path]:
+    """Origin/EA app LocalContent directories holding *.mfst install manifests"""
+    program_data = os.environ.get("ProgramData", r"C:\ProgramData")
+    return [Path(program_data) / "Origin" / "LocalContent"]
+
+
+def registry_installs() -> List[GameInstall]:
+    """Install directories recorded by the EA app / Origin installer"""
+    if sys.platform != 'win32':
+        return []
+    try:
+        import winreg
+    except ImportError:
+        return []
+    installs = []
+    for key_path in (r"SOFTWARE\WOW6432Node\EA Games\STAR WARS Battlefront II",
+                     r"SOFTWARE\EA Games\STAR WARS Battlefront II"):
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+                installs.append(GameInstall(winreg.QueryValueEx(key, "Install Dir")[0], "registry"))
+        except OSError:
+            continue
+    return installs
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class GameDiscovery:
+    """Finds game installs from launcher manifests, with a persistent index cache.
+
+    The cache records the mtime of every manifest and library directory that
+    was read; a cached index is reused as long as none of them changed, so a
+    repeat run only costs one stat per manifest plus one for the executable.
+    """
+
+    def __init__(self, steam_roots: Optional[Iterable[Path]] = None,
+                 origin_roots: Optional[Iterable[Path]] = None,
+                 cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+                 use_registry: bool = True, probe_timeout: float = DEFAULT_PROBE_TIMEOUT):
+        self.steam_roots = [Path(p) for p in (steam_roots if steam_roots is not None else default_steam_roots())]
+        self.origin_roots = [Path(p) for p in (origin_roots if origin_roots is not None else default_origin_roots())]
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.use_registry = use_registry
+        self.probe_timeout = probe_timeout
+        self.cache_hit = False
+        self.last_probe = None  # type: Optional[ProbeReport]
+
+    # -- index building -------------------------------------------------
+
+    def _scan_steam(self, fingerprints: Dict[str, Optional[int]]) -> List[GameInstall]:
+        installs = []
+        libraries = []
+        for root in self.steam_roots:
+            steamapps = root / "steamapps"
+            vdf_path = steamapps / "libraryfolders.vdf"
+            fingerprints[str(vdf_path)] = _mtime(vdf_path)
+            if fingerprints[str(vdf_path)] is None:
+                continue
+            libraries.append(root)
+            try:
+                data = _lower_keys(parse_vdf(vdf_path.read_text(encoding='utf-8', errors='replace')))
+            except OSError:
+                continue
+            for library_id, entry in _lower_keys(data.get("libraryfolders", {})).items():
+                if not library_id.isdigit():
+                    continue  # "contentstatsid" and friends in the old format
+                # New format: "0" { "path" "..." }; old format: "1" "D:\\SteamLibrary"
+                library = entry.get("path") if isinstance(entry, dict) else entry
+                if library and library.strip():
+                    libraries.append(Path(library))
+
+        seen = set()
+        for library in libraries:
+            steamapps = library / "steamapps"
+            library_key = os.path.normcase(os.path.normpath(str(steamapps)))
+            if library_key in seen:
+                continue
+            seen.add(library_key)
+            # The directory mtime changes when an appmanifest is added or removed
+            fingerprints[str(steamapps)] = _mtime(steamapps)
+            manifest = steamapps / f"appmanifest_{STEAM_APP_ID}.acf"
+            fingerprints[str(manifest)] = _mtime(manifest)
+            if fingerprints[str(manifest)] is None:
+                continue
+            try:
+                app_state = _lower_keys(_lower_keys(parse_vdf(manifest.read_text(encoding='utf-8', errors='replace')))
+                                        .get("appstate", {}))
+            except OSError:
+                continue
+            install_dir = app_state.get("installdir") or GAME_FOLDER_NAME
+            installs.append(GameInstall(str(steamapps / "common" / install_dir), "steam", str(manifest)))
+        return installs
+
+    def _scan_origin(self, fingerprints: Dict[str, Optional[int]]) -> List[GameInstall]:
+        installs = []
+        for root in self.origin_roots:
+            fingerprints[str(root)] = _mtime(root)
+            if fingerprints[str(root)] is None:
+                continue
+            try:
+                game_dirs = [game_dir for game_dir in root.iterdir() if game_dir.is_dir()]
+            except OSError:
+                continue  # e.g. no permission to list another user's Origin folder
+            for game_dir in game_dirs:
+                fingerprints[str(game_dir)] = _mtime(game_dir)
+                try:
+                    manifests = list(game_dir.glob("*.mfst"))
+                except OSError:
+                    continue
+                for manifest in manifests:
+                    fingerprints[str(manifest)] = _mtime(manifest)
+                    try:
+                        query = parse_qs(manifest.read_text(encoding='utf-8', errors='replace').strip().lstrip('?'))
+                    except OSError:
+                        continue
+                    install_path = (query.get("dipinstallpath") or [None])[0]
+                    if not install_path:
+                        continue
+                    names = (game_dir.name + install_path).lower()
+                    if "battlefront ii" in names or "battlefront 2" in names:
+                        installs.append(GameInstall(install_path.rstrip('\\/'), "origin", str(manifest)))
+        return installs
+
+    def build_index(self) -> dict:
+        """Read every manifest and return a fresh index"""
+        fingerprints = {}  # type: Dict[str, Optional[int]]
+        installs = self._scan_steam(fingerprints) + self._scan_origin(fingerprints)
+        return {
+            "version": CACHE_VERSION,
+            "fingerprints": fingerprints,
+            "installs": [install._asdict() for install in installs],
+        }
+
+    # -- cache ----------------------------------------------------------
+
+    def _cache_key(self) -> dict:
+        return {
+            "steam_roots": [str(p) for p in self.steam_roots],
+            "origin_roots": [str(p) for p in self.origin_roots],
+        }
+
+    def load_cached_index(self) -> Optional[dict]:
+        """Return the cached index if every recorded manifest is unchanged"""
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get("version") != CACHE_VERSION or index.get("key") != self._cache_key():
+            return None
+        for path, mtime in index.get("fingerprints", {}).items():
+            if _mtime(Path(path)) != mtime:
+                return None
+        return index
+
+    def save_index(self, index: dict):
+        if not self.cache_path:
+            return
+        index = dict(index, key=self._cache_key())
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug(f"Could not write discovery cache: {e}")
+
+    def discover(self, use_cache: bool = True) -> List[GameInstall]:
+        """All installs known to the launchers (cached index when still valid)"""
+        index = self.load_cached_index() if use_cache else None
+        self.cache_hit = index is not None
+        if index is None:
+            index = self.build_index()
+            self.save_index(index)
+        installs = [GameInstall(**install) for install in index["installs"]]
+        if self.use_registry:
+            installs += registry_installs()
+        return installs
+
+    # -- lookup ---------------------------------------------------------
+
+    def find_game(self, local_dirs: Iterable[Path] = (),
+                  fallback_paths: Iterable[str] = FALLBACK_PATHS) -> Optional[GameInstall]:
+        """First install that actually contains the game executable.
+
+        ``local_dirs`` (e.g. the directory the fix package was unpacked into)
+        take priority, then the manifest index, then ``fallback_paths``. All
+        candidates are probed concurrently with a per-probe deadline; the
+        outcome is kept in ``last_probe`` (see path_probe.ProbeReport).
+        """
+        candidates = [GameInstall(str(directory), "local") for directory in local_dirs]
+        candidates += self.discover()
+        candidates += [GameInstall(path, "fallback") for path in fallback_paths]
+
+        unique = []
+        seen = set()
+        for install in candidates:
+            key = os.path.normcase(os.path.normpath(install.path))
+            if key not in seen:
+                seen.add(key)
+                unique.append(install)
+
+        self.last_probe = probe_paths(
+            [install.path for install in unique],
+            check=lambda path: os.path.exists(os.path.join(path, GAME_EXECUTABLE)),
+            timeout=self.probe_timeout,
+        )
+        for path in self.last_probe.timed_out:
+            logger.warning(f"Timed out probing {path} (drive asleep or disconnected?)")
+        if self.last_probe.found_index is None:
+            return None
+        return unique[self.last_probe.found_index]
+
+
+def find_game_installation(local_dirs: Iterable[Path] = (), **kwargs) -> Optional[GameInstall]:
+    """Convenience wrapper around GameDiscovery().find_game()"""
+    return GameDiscovery(**kwargs).find_game(local_dirs)
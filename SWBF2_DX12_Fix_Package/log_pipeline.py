@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Non-Blocking Logging Pipeline for the SWBF2 DX12 Fix
+Loggers only enqueue records (QueueHandler); a QueueListener thread writes
+them to the console, to a size-rotated log file whose old segments are
+gzip-compressed, and optionally to a JSON-lines file with a per-session ID.
+"""
+
+import os
+import gzip
+import json
+import time
+import uuid
+import queue
+import atexit
+import shutil
+import logging
+import logging.handlers
+from typing import List, Optional
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the exception text separate from the message"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler whose rotated segments are gzip-compressed (<name>.1.gz, ...)"""
+
+    def __init__(self, filename: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT, encoding: str = 'utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._compress
+
+    @staticmethod
+    def _compress(source: str, dest: str):
+        with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, tagged with the session ID"""
+
+    def __init__(self, session_id: str):
+        super().__init__()
+        self.session_id = session_id
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "session": self.session_id,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class LogPipeline:
+    """A running queue listener and the handlers it feeds"""
+
+    def __init__(self, listener: logging.handlers.QueueListener, queue_handler: logging.Handler,
+                 handlers: List[logging.Handler], session_id: str):
+        self.listener = listener
+        self.queue_handler = queue_handler
+        self.handlers = handlers
+        self.session_id = session_id
+
+    def stop(self):
+        """Flush queued records and close the sinks (idempotent)"""
+        if self.listener is None:
+            return
+        logging.getLogger().removeHandler(self.queue_handler)
+        self.listener.stop()
+        self.listener = None
+        for handler in self.handlers:
+            handler.close()
+
+
+def start_logging(log_path: str, json_path: Optional[str] = None, level: int = logging.INFO,
+                  console: bool = True, max_bytes: int = DEFAULT_MAX_BYTES,
+                  backup_count: int = DEFAULT_BACKUP_COUNT) -> LogPipeline:
+    """Route the root logger through a queue to rotating text (and optional JSON-lines) sinks"""
+    session_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    text_formatter = logging.Formatter(TEXT_FORMAT)
+
+    handlers = []  # type: List[logging.Handler]
+    file_handler = CompressingRotatingFileHandler(log_path, max_bytes, backup_count)
+    file_handler.setFormatter(text_formatter)
+    handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(text_formatter)
+        handlers.append(console_handler)
+    if json_path:
+        json_handler = CompressingRotatingFileHandler(json_path, max_bytes, backup_count)
+        json_handler.setFormatter(JsonLinesFormatter(session_id))
+        handlers.append(json_handler)
+
+    records = queue.Queue()  # type: queue.Queue
+    queue_handler = StructuredQueueHandler(records)
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    pipeline = LogPipeline(listener, queue_handler, handlers, session_id)
+    atexit.register(pipeline.stop)
+    return pipeline
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Process Memory Region Map for Star Wars Battlefront II
+Enumerates committed regions (VirtualQueryEx on Windows, /proc/<pid>/maps on
+Linux), filters them by protection and type, merges adjacent regions and
+reads them as overlapping chunks on a pool of threads with reusable buffers.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import FrozenSet, Iterator, List, NamedTuple, Optional, Sequence
+
+DEFAULT_WORKERS = 4
+
+# Windows VirtualQueryEx constants
+MEM_COMMIT = 0x1000
+MEM_IMAGE = 0x1000000
+MEM_MAPPED = 0x40000
+MEM_PRIVATE = 0x20000
+PAGE_NOACCESS = 0x01
+PAGE_GUARD = 0x100
+WINDOWS_PROTECTION = {
+    0x02: 'r',    # PAGE_READONLY
+    0x04: 'rw',   # PAGE_READWRITE
+    0x08: 'rw',   # PAGE_WRITECOPY
+    0x10: 'x',    # PAGE_EXECUTE
+    0x20: 'rx',   # PAGE_EXECUTE_READ
+    0x40: 'rwx',  # PAGE_EXECUTE_READWRITE
+    0x80: 'rwx',  # PAGE_EXECUTE_WRITECOPY
+}
+WINDOWS_TYPES = {MEM_IMAGE: 'image', MEM_MAPPED: 'mapped', MEM_PRIVATE: 'private'}
+
+IMAGE_SUFFIXES = ('.exe', '.dll', '.so')
+
+
+class MemoryRegion(NamedTuple):
+    """A committed region of a process address space"""
+    base: int
+    size: int
+    protection: str = 'r'  # any of "r", "w", "x"
+    type: str = 'private'  # "image", "mapped" or "private"
+    path: str = ''
+
+    @property
+    def end(self) -> int:
+        return self.base + self.size
+
+
+class RegionFilter(NamedTuple):
+    """Which regions to read: required/excluded protection flags, types and size bounds"""
+    require: str = 'r'
+    exclude: str = ''
+    types: Optional[FrozenSet[str]] = None
+    min_size: int = 0
+    max_size: Optional[int] = None
+
+    def accepts(self, region: MemoryRegion) -> bool:
+        if any(flag not in region.protection for flag in self.require):
+            return False
+        if any(flag in region.protection for flag in self.exclude):
+            return False
+        if self.types is not None and region.type not in self.types:
+            return False
+        if region.size < self.min_size:
+            return False
+        return self.max_size is None or region.size <= self.max_size
+
+
+READABLE = RegionFilter()
+# Game data (not code): module .data/.rdata and heap allocations
+GAME_DATA = RegionFilter(require='r', exclude='x', types=frozenset(('image', 'private')))
+
+
+def read_proc_maps(pid: int, proc_root: str = "/proc") -> List[MemoryRegion]:
+    """Regions of a Linux process from /proc/<pid>/maps"""
+    regions = []
+    with open(os.path.join(proc_root, str(pid), "maps"), 'r') as f:
+        for line in f:
+            fields = line.split(None, 5)
+            if len(fields) < 5:
+                continue
+            path = fields[5].strip() if len(fields) > 5 else ''
+            if path in ('[vvar]', '[vvar_vclock]', '[vsyscall]'):
+                continue  # Not readable through /proc/<pid>/mem
+            start, end = (int(value, 16) for value in fields[0].split('-'))
+            protection = ''.join(flag for flag in 'rwx' if flag in fields[1])
+            if path.startswith('/'):
+                lower = path.lower()
+                region_type = 'image' if lower.endswith(IMAGE_SUFFIXES) or '.so.' in lower else 'mapped'
+            else:
+                region_type = 'private'
+            regions.append(MemoryRegion(start, end - start, protection, region_type, path))
+    return regions
+
+
+def query_windows_regions(process_handle) -> List[MemoryRegion]:
+    """Committed, accessible regions of a Windows process via VirtualQueryEx"""
+    import ctypes
+    from ctypes import wintypes
+
+    class MEMORY_BASIC_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("BaseAddress", ctypes.c_void_p),
+            ("AllocationBase", ctypes.c_void_p),
+            ("AllocationProtect", wintypes.DWORD),
+            ("PartitionId", wintypes.WORD),
+            ("RegionSize", ctypes.c_size_t),
+            ("State", wintypes.DWORD),
+            ("Protect", wintypes.DWORD),
+            ("Type", wintypes.DWORD),
+        ]
+
+    virtual_query = ctypes.WinDLL('kernel32', use_last_error=True).VirtualQueryEx
+    virtual_query.argtypes = [wintypes.HANDLE, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+    virtual_query.restype = ctypes.c_size_t
+
+    info = MEMORY_BASIC_INFORMATION()
+    regions = []
+    address = 0
+    while virtual_query(process_handle, ctypes.c_void_p(address), ctypes.byref(info), ctypes.sizeof(info)):
+        base = info.BaseAddress or 0
+        if info.State == MEM_COMMIT and not info.Protect & (PAGE_GUARD | PAGE_NOACCESS):
+            protection = WINDOWS_PROTECTION.get(info.Protect & 0xFF, '')
+            if protection:
+                regions.append(MemoryRegion(base, info.RegionSize, protection,
+                                            WINDOWS_TYPES.get(info.Type, 'private')))
+        next_address = base + info.RegionSize
+        if next_address <= address or next_address >= 1 << 64:
+            break
+        address = next_address
+    return regions
+
+
+def find_module(regions: Sequence[MemoryRegion], module_name: str) -> Optional[MemoryRegion]:
+    """Span of a mapped module (by file name) from regions that carry paths"""
+    module_name = module_name.lower()
+    mapped = [region for region in regions
+              if region.path and os.path.basename(region.path.replace('\\', '/')).lower() == module_name]
+    if not mapped:
+        return None
+    base = min(region.base for region in mapped)
+    end = max(region.end for region in mapped)
+    return MemoryRegion(base, end - base, 'r', 'image', mapped[0].path)
+
+
+def query_windows_module(process_handle, module_name: str) -> Optional[MemoryRegion]:
+    """Base and image size of a loaded module of a Windows process (EnumProcessModulesEx)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class MODULEINFO(ctypes.Structure):
+        _fields_ = [
+            ("lpBaseOfDll", ctypes.c_void_p),
+            ("SizeOfImage", wintypes.DWORD),
+            ("EntryPoint", ctypes.c_void_p),
+        ]
+
+    psapi = ctypes.WinDLL('psapi', use_last_error=True)
+    psapi.EnumProcessModulesEx.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.HMODULE), wintypes.DWORD,
+                                           ctypes.POINTER(wintypes.DWORD), wintypes.DWORD]
+    psapi.GetModuleBaseNameW.argtypes = [wintypes.HANDLE, wintypes.HMODULE, wintypes.LPWSTR, wintypes.DWORD]
+    psapi.GetModuleInformation.argtypes = [wintypes.HANDLE, wintypes.HMODULE, ctypes.POINTER(MODULEINFO),
+                                           wintypes.DWORD]
+
+    LIST_MODULES_ALL = 0x03
+    modules = (wintypes.HMODULE * 1024)()
+    needed = wintypes.DWORD(0)
+    if not psapi.EnumProcessModulesEx(process_handle, modules, ctypes.sizeof(modules), ctypes.byref(needed),
+                                      LIST_MODULES_ALL):
+        return None
+    name = ctypes.create_unicode_buffer(260)
+    for module in modules[:min(len(modules), needed.value // ctypes.sizeof(wintypes.HMODULE))]:
+        if not psapi.GetModuleBaseNameW(process_handle, module, name, len(name)):
+            continue
+        if name.value.lower() != module_name.lower():
+            continue
+        info = MODULEINFO()
+        if psapi.GetModuleInformation(process_handle, module, ctypes.byref(info), ctypes.sizeof(info)):
+            return MemoryRegion(info.lpBaseOfDll or 0, info.SizeOfImage, 'r', 'image', name.value)
+    return None
+
+
+def merge_regions(regions: Sequence[MemoryRegion]) -> List[MemoryRegion]:
+    """Merge contiguous regions of the same type so they are read (and scanned) as one"""
+    merged = []  # type: List[MemoryRegion]
+    for region in sorted(regions, key=lambda r: r.base):
+        if merged and merged[-1].end == region.base and merged[-1].type == region.type:
+            last = merged[-1]
+            common = ''.join(flag for flag in last.protection if flag in region.protection)
+            merged[-1] = last._replace(size=last.size + region.size, protection=common,
+                                       path=last.path if last.path == region.path else '')
+        else:
+            merged.append(region)
+    return merged
+
+
+def select_regions(regions: Sequence[MemoryRegion],
+                   region_filter: Optional[RegionFilter] = READABLE) -> List[MemoryRegion]:
+    """Filter, then merge adjacent regions"""
+    if region_filter is not None:
+        regions = [region for region in regions if region_filter.accepts(region)]
+    return merge_regions(regions)
+
+
+def summarize_regions(regions: Sequence[MemoryRegion]) -> dict:
+    """Committed bytes per region type"""
+    summary = {}
+    for region in regions:
+        summary[region.type] = summary.get(region.type, 0) + region.size
+    return summary
+
+
+class Chunk(NamedTuple):
+    """A block of memory read into a pooled buffer"""
+    address: int
+    view: memoryview      # view[:length] holds the data
+    length: int
+    scan_length: int      # matches starting at or beyond this are repeated in the next chunk
+    region: MemoryRegion
+
+
+class ReadStats(NamedTuple):
+    bytes_read: int
+    bytes_skipped: int
+    regions_read: int
+    regions_skipped: int
+    elapsed: float
+    workers: int
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second"""
+        return self.bytes_read / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ParallelChunkReader:
+    """Reads regions as overlapping chunks on a thread pool.
+
+    ``2 * workers`` buffers of chunk_size + overlap bytes are allocated once;
+    a chunk's buffer goes back to the pool when the consumer asks for the
+    next chunk, which also bounds how far readers can run ahead. The read
+    calls (pread on /proc/<pid>/mem, ReadProcessMemory) release the GIL, so
+    reads overlap with scanning in the consuming thread. Chunks are yielded
+    in completion order. Unreadable chunks (guard pages, memory freed
+    meanwhile) are skipped and counted instead of failing the read.
+    """
+
+    def __init__(self, source, chunk_size: int, overlap: int = 0, workers: int = DEFAULT_WORKERS):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.workers = max(1, workers)
+        self.buffers = [bytearray(chunk_size + overlap) for _ in range(self.workers * 2)]
+        self.last_stats = None  # type: Optional[ReadStats]
+
+    def _plan(self, regions: Sequence[MemoryRegion]):
+        for region in regions:
+            offset = 0
+            while offset < region.size:
+                want = min(self.chunk_size + self.overlap, region.size - offset)
+                last = offset + want >= region.size
+                yield region, region.base + offset, want, last
+                if last:
+                    break
+                offset += self.chunk_size
+
+    def _read(self, task, buffer: bytearray):
+        region, address, want, last = task
+        view = memoryview(buffer)[:want]
+        try:
+            read = self.source.read_into(address, view)
+        except OSError:
+            read = 0
+        return task, view, read
+
+    def iter_chunks(self, regions: Sequence[MemoryRegion]) -> Iterator[Chunk]:
+        start = time.perf_counter()
+        bytes_read = bytes_skipped = 0
+        region_ok = {}  # base -> whether any chunk of the region was readable
+        free = list(self.buffers)
+        tasks = self._plan(regions)
+        in_flight = {}
+
+        def submit(executor):
+            while free:
+                task = next(tasks, None)
+                if task is None:
+                    return
+                buffer = free.pop()
+                in_flight[executor.submit(self._read, task, buffer)] = buffer
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                try:
+                    submit(executor)
+                    while in_flight:
+                        done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                        for future in done:
+                            buffer = in_flight.pop(future)
+                            (region, address, want, last), view, read = future.result()
+                            region_ok.setdefault(region.base, False)
+                            if read <= 0:
+                                bytes_skipped += want if last else self.chunk_size
+                            else:
+                                region_ok[region.base] = True
+                                scan_length = read if (last or read < want) else self.chunk_size
+                                bytes_read += scan_length
+                                yield Chunk(address, view, read, scan_length, region)
+                            free.append(buffer)
+                        submit(executor)
+                finally:
+                    # Consumer stopped early: don't start reads nobody will look at
+                    for future in in_flight:
+                        future.cancel()
+        finally:
+            regions_read = sum(1 for ok in region_ok.values() if ok)
+            self.last_stats = ReadStats(bytes_read, bytes_skipped, regions_read,
+                                        len(region_ok) - regions_read,
+                                        time.perf_counter() - start, self.workers)
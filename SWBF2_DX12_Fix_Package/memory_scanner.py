@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Byte-Pattern Memory Scanner for Star Wars Battlefront II
+Finds wildcard byte signatures in game memory (or any file) without copying:
+chunks are read into reusable buffers, the longest fixed run (anchor) of each
+signature is located with bytes.find (CPython's memchr-anchored
+Horspool/two-way search) and wildcard bytes are verified on memoryview slices.
+"""
+
+import os
+import sys
+import logging
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from memory_regions import (DEFAULT_WORKERS, READABLE, MemoryRegion, ParallelChunkReader, RegionFilter,
+                            find_module, query_windows_module, query_windows_regions, read_proc_maps,
+                            select_regions)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_MAX_MATCHES = 64
+HAVE_PREADV = hasattr(os, 'preadv')
+
+
+class Signature:
+    """A byte pattern with optional wildcards.
+
+    Patterns are written IDA-style, e.g. ``"9A 99 99 3F ?? ?? 80 3F"``, or
+    given as raw bytes (no wildcards).
+    """
+
+    def __init__(self, name: str, pattern: Union[str, bytes], description: str = ""):
+        self.name = name
+        self.description = description
+        if isinstance(pattern, (bytes, bytearray)):
+            self.pattern = bytes(pattern)
+            self.mask = [True] * len(self.pattern)
+        else:
+            values, mask = [], []
+            for token in pattern.split():
+                if token in ('?', '??'):
+                    values.append(0)
+                    mask.append(False)
+                else:
+                    values.append(int(token, 16))
+                    mask.append(True)
+            self.pattern = bytes(values)
+            self.mask = mask
+        if not any(self.mask):
+            raise ValueError(f"Signature {name} has no fixed bytes")
+
+        # Runs of fixed bytes as (offset, bytes)
+        self.runs = []  # type: List[Tuple[int, bytes]]
+        start = None
+        for i, fixed in enumerate(self.mask + [False]):
+            if fixed and start is None:
+                start = i
+            elif not fixed and start is not None:
+                self.runs.append((start, self.pattern[start:i]))
+                start = None
+
+        # Anchor on the longest run; prefer runs that are not all 00/FF padding
+        self.anchor_offset, self.anchor = max(
+            self.runs, key=lambda run: (len(run[1]), sum(b not in (0x00, 0xFF) for b in run[1])))
+        self.other_runs = [run for run in self.runs if run[0] != self.anchor_offset]
+
+    def __len__(self) -> int:
+        return len(self.pattern)
+
+    def __repr__(self) -> str:
+        return f"Signature({self.name!r}, {self.to_pattern_string()!r})"
+
+    def to_pattern_string(self) -> str:
+        return ' '.join(f"{b:02X}" if fixed else '??' for b, fixed in zip(self.pattern, self.mask))
+
+    def matches_at(self, buffer, offset: int = 0) -> bool:
+        """Whether the whole signature matches at buffer[offset:]"""
+        if offset < 0 or offset + len(self.pattern) > len(buffer):
+            return False
+        view = memoryview(buffer)
+        return all(view[offset + start:offset + start + len(run)] == run for start, run in self.runs)
+
+    def find_all(self, buffer, start: int = 0, end: Optional[int] = None,
+                 view: Optional[memoryview] = None, limit: Optional[int] = None) -> List[int]:
+        """Offsets in buffer[start:end] where the whole signature matches"""
+        end = len(buffer) if end is None else end
+        view = view if view is not None else memoryview(buffer)
+        matches = []
+        anchor, anchor_offset, length = self.anchor, self.anchor_offset, len(self.pattern)
+        position = buffer.find(anchor, start + anchor_offset, end)
+        while position != -1:
+            match = position - anchor_offset
+            if match + length <= end and all(
+                    view[match + offset:match + offset + len(run)] == run for offset, run in self.other_runs):
+                matches.append(match)
+                if limit is not None and len(matches) >= limit:
+                    break
+            position = buffer.find(anchor, position + 1, end)
+        return matches
+
+
+class SignatureMatcher:
+    """A set of signatures compiled for matching in one go.
+
+    Every chunk is read once for the whole set; signatures sharing an
+    anchor are searched together, so each distinct anchor costs one
+    bytes.find pass over the chunk.
+    """
+
+    def __init__(self, signatures: Sequence[Signature]):
+        self.signatures = list(signatures)
+        self.groups = {}  # type: Dict[bytes, List[Signature]]
+        for signature in self.signatures:
+            self.groups.setdefault(signature.anchor, []).append(signature)
+
+    @property
+    def max_length(self) -> int:
+        return max((len(signature) for signature in self.signatures), default=1)
+
+    def _verify(self, group: List[Signature], position: int, end: int, view: memoryview,
+                active, hits: List[Tuple[Signature, int]]):
+        for signature in group:
+            if active is not None and signature.name not in active:
+                continue
+            match = position - signature.anchor_offset
+            if match < 0 or match + len(signature) > end:
+                continue
+            if all(view[match + offset:match + offset + len(run)] == run for offset, run in signature.other_runs):
+                hits.append((signature, match))
+
+    def find_all(self, buffer, end: int, view: memoryview, active=None) -> List[Tuple[Signature, int]]:
+        """(signature, offset) for every match in buffer[:end]; ``active`` limits the signature names"""
+        hits = []  # type: List[Tuple[Signature, int]]
+        for anchor, group in self.groups.items():
+            if active is not None and not any(signature.name in active for signature in group):
+                continue
+            position = buffer.find(anchor, 0, end)
+            while position != -1:
+                self._verify(group, position, end, view, active, hits)
+                position = buffer.find(anchor, position + 1, end)
+        return hits
+
+
+class MemorySource:
+    """Readable address space: a list of regions plus a way to read them.
+
+    ``read_into`` may be called from several reader threads at once.
+    """
+
+    name = "base"
+
+    def regions(self) -> List[MemoryRegion]:
+        """Every readable region (unfiltered, unmerged)"""
+        raise NotImplementedError
+
+    def read_into(self, address: int, buffer: memoryview) -> int:
+        """Fill buffer from address; returns the number of bytes read (0 if unreadable)"""
+        raise NotImplementedError
+
+    def module(self, module_name: str) -> Optional[MemoryRegion]:
+        """Address range of a loaded module, if this source knows about modules"""
+        return find_module(self.regions(), module_name)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FileMemorySource(MemorySource):
+    """A file (e.g. a memory dump) scanned as one region starting at base_address"""
+
+    name = "file"
+
+    def __init__(self, path: str, base_address: int = 0):
+        self.path = path
+        self.base_address = base_address
+        self.file = open(path, 'rb', buffering=0)
+        self.lock = threading.Lock()
+
+    def regions(self) -> List[MemoryRegion]:
+        return [MemoryRegion(self.base_address, os.fstat(self.file.fileno()).st_size, 'r', 'private', self.path)]
+
+    def read_into(self, address: int, buffer: memoryview) -> int:
+        if HAVE_PREADV:
+            return os.preadv(self.file.fileno(), [buffer], address - self.base_address)
+        with self.lock:
+            self.file.seek(address - self.base_address)
+            return self.file.readinto(buffer) or 0
+
+    def close(self):
+        self.file.close()
+
+
+class BufferMemorySource(MemorySource):
+    """An address space held in memory: {base address: bytes} (tests and fake backends)"""
+
+    name = "buffer"
+
+    def __init__(self, blocks: Dict[int, bytes], path: str = ''):
+        self.blocks = sorted(blocks.items())
+        self.path = path
+
+    def regions(self) -> List[MemoryRegion]:
+        return [MemoryRegion(base, len(data), 'rw', 'image' if self.path else 'private', self.path)
+                for base, data in self.blocks]
+
+    def read_into(self, address: int, buffer: memoryview) -> int:
+        for base, data in self.blocks:
+            if base <= address < base + len(data):
+                chunk = data[address - base:address - base + len(buffer)]
+                buffer[:len(chunk)] = chunk
+                return len(chunk)
+        return 0
+
+
+class ProcMemSource(MemorySource):
+    """A live Linux process via /proc/<pid>/maps and /proc/<pid>/mem (needs ptrace rights)"""
+
+    name = "procfs"
+
+    def __init__(self, pid: int, proc_root: str = "/proc"):
+        self.pid = pid
+        self.proc_root = proc_root
+        self.file = open(os.path.join(proc_root, str(pid), "mem"), 'rb', buffering=0)
+
+    def regions(self) -> List[MemoryRegion]:
+        return [region for region in read_proc_maps(self.pid, self.proc_root) if 'r' in region.protection]
+
+    def read_into(self, address: int, buffer: memoryview) -> int:
+        try:
+            return os.preadv(self.file.fileno(), [buffer], address)
+        except (OSError, OverflowError, ValueError):
+            return 0
+
+    def close(self):
+        self.file.close()
+
+
+class WindowsProcessMemorySource(MemorySource):
+    """A live Windows process via VirtualQueryEx/ReadProcessMemory on an open handle"""
+
+    name = "win32"
+
+    def __init__(self, process_handle):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        self.read_process_memory = ctypes.WinDLL('kernel32', use_last_error=True).ReadProcessMemory
+        self.read_process_memory.argtypes = [wintypes.HANDLE, ctypes.c_void_p, ctypes.c_void_p,
+                                             ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)]
+        self.read_process_memory.restype = wintypes.BOOL
+        self.handle = process_handle
+
+    def regions(self) -> List[MemoryRegion]:
+        return [region for region in query_windows_regions(self.handle) if 'r' in region.protection]
+
+    def module(self, module_name: str) -> Optional[MemoryRegion]:
+        return query_windows_module(self.handle, module_name)
+
+    def read_into(self, address: int, buffer: memoryview) -> int:
+        ctypes = self.ctypes
+        read = ctypes.c_size_t(0)
+        target = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+        # A partial copy (region freed or protected meanwhile) still reports what was read
+        self.read_process_memory(self.handle, ctypes.c_void_p(address), target, len(buffer), ctypes.byref(read))
+        return read.value
+
+
+def open_process_memory(pid: int, process_handle=None) -> MemorySource:
+    """Memory source for a live process on this platform"""
+    if sys.platform == 'win32':
+        if process_handle is None:
+            raise ValueError("A process handle with PROCESS_VM_READ access is required on Windows")
+        return WindowsProcessMemorySource(process_handle)
+    return ProcMemSource(pid)
+
+
+class ScanStats(NamedTuple):
+    bytes_scanned: int
+    bytes_skipped: int
+    regions_scanned: int
+    regions_skipped: int
+    elapsed: float
+    workers: int = 1
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second"""
+        return self.bytes_scanned / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class PatternScanner:
+    """Scans the regions of a MemorySource for a set of signatures.
+
+    Regions are filtered and merged (see memory_regions.select_regions) and
+    read by a ParallelChunkReader into preallocated, reused buffers;
+    consecutive chunks overlap by the longest signature minus one byte so
+    matches spanning a chunk boundary are not lost.
+    """
+
+    def __init__(self, signatures: Union[Sequence[Signature], SignatureMatcher],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, max_matches: Optional[int] = DEFAULT_MAX_MATCHES,
+                 workers: int = DEFAULT_WORKERS):
+        self.matcher = signatures if isinstance(signatures, SignatureMatcher) else SignatureMatcher(signatures)
+        self.signatures = self.matcher.signatures
+        self.chunk_size = chunk_size
+        self.max_matches = max_matches
+        self.workers = workers
+        self.overlap = self.matcher.max_length - 1
+        self.last_stats = None  # type: Optional[ScanStats]
+
+    def scan(self, source: MemorySource, regions: Optional[Sequence[MemoryRegion]] = None,
+             region_filter: Optional[RegionFilter] = READABLE) -> Dict[str, List[int]]:
+        """Addresses of each signature's matches, keyed by signature name"""
+        results = {signature.name: [] for signature in self.signatures}  # type: Dict[str, List[int]]
+        active = set(results)
+        regions = select_regions(source.regions() if regions is None else regions, region_filter)
+        reader = ParallelChunkReader(source, self.chunk_size, self.overlap, self.workers)
+
+        chunks = reader.iter_chunks(regions)
+        try:
+            for chunk in chunks:
+                for signature, match in self.matcher.find_all(chunk.view.obj, chunk.length, chunk.view, active):
+                    # Matches starting in the overlap are found again by the next chunk
+                    if match >= chunk.scan_length or signature.name not in active:
+                        continue
+                    found = results[signature.name]
+                    found.append(chunk.address + match)
+                    if self.max_matches is not None and len(found) >= self.max_matches:
+                        active.discard(signature.name)
+                if not active:
+                    break
+        finally:
+            chunks.close()
+
+        for found in results.values():
+            found.sort()
+        stats = reader.last_stats
+        self.last_stats = ScanStats(stats.bytes_read, stats.bytes_skipped, stats.regions_read,
+                                    stats.regions_skipped, stats.elapsed, stats.workers)
+        return results
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Signature Offset Cache for Star Wars Battlefront II
+Remembers where each signature was found, as an offset into the game
+executable's image, keyed by a cheap fingerprint of the executable (size,
+mtime and a hash of sampled blocks). On later launches of the same build the
+cached offsets are verified with a few small reads instead of a full scan.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from memory_regions import MemoryRegion
+from memory_scanner import MemorySource, Signature
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent / "offset_cache.json"
+FINGERPRINT_SAMPLES = 16
+FINGERPRINT_BLOCK = 64 * 1024
+MAX_BUILDS = 4  # Builds remembered at once (oldest dropped first)
+
+
+def fingerprint_executable(path, samples: int = FINGERPRINT_SAMPLES,
+                           block_size: int = FINGERPRINT_BLOCK) -> Optional[str]:
+    """Cheap build identity: size, mtime and a hash of evenly spaced blocks.
+
+    Reads samples * block_size bytes (1 MB by default) instead of hashing the
+    whole multi-hundred-MB executable.
+    """
+    try:
+        stat = os.stat(path)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            step = max(block_size, stat.st_size // samples)
+            for offset in range(0, stat.st_size, step):
+                f.seek(offset)
+                digest.update(f.read(block_size))
+            # The tail holds the PE certificate/overlay, which changes with every build
+            f.seek(max(0, stat.st_size - block_size))
+            digest.update(f.read(block_size))
+    except OSError:
+        return None
+    return f"{stat.st_size}-{stat.st_mtime_ns}-{digest.hexdigest()}"
+
+
+class OffsetCache:
+    """Module-relative signature offsets per executable fingerprint (JSON file)"""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_CACHE_PATH):
+        self.path = Path(path) if path else None
+        self.builds = {}  # type: Dict[str, dict]
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        self.builds = {}
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.builds = data.get("builds", {})
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": CACHE_VERSION, "builds": self.builds}, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            logger.debug(f"Could not write offset cache: {e}")
+
+    def lookup(self, fingerprint: str, signature: Signature) -> Optional[List[int]]:
+        """Cached offsets of a signature for a build (None if never recorded)"""
+        entry = self.builds.get(fingerprint, {}).get("signatures", {}).get(signature.name)
+        if entry is None or entry.get("pattern") != signature.to_pattern_string():
+            return None
+        return entry["offsets"]
+
+    def store(self, fingerprint: str, module: MemoryRegion, matches: Dict[str, List[int]],
+              signatures: Sequence[Signature]):
+        """Record the matches that fall inside the module image as module-relative offsets.
+
+        Matches in heap memory move between launches and are not cached; a
+        signature without any match in the image is scanned for again.
+        """
+        build = self.builds.setdefault(fingerprint, {"signatures": {}})
+        build["updated"] = time.time()
+        for signature in signatures:
+            offsets = [address - module.base for address in matches.get(signature.name, ())
+                       if module.base <= address < module.end]
+            if offsets:
+                build["signatures"][signature.name] = {"pattern": signature.to_pattern_string(),
+                                                       "offsets": offsets}
+        for stale in sorted(self.builds, key=lambda key: self.builds[key].get("updated", 0))[:-MAX_BUILDS]:
+            del self.builds[stale]
+        self.dirty = True
+
+    def verified_matches(self, fingerprint: str, signatures: Sequence[Signature], source: MemorySource,
+                         module: MemoryRegion) -> Dict[str, List[int]]:
+        """Addresses of the cached matches that still hold the signature, keyed by name.
+
+        Each cached offset costs one read of the signature's length. A
+        signature is only returned if every cached offset still matches.
+        """
+        verified = {}  # type: Dict[str, List[int]]
+        for signature in signatures:
+            offsets = self.lookup(fingerprint, signature)
+            if not offsets:
+                continue
+            buffer = bytearray(len(signature))
+            addresses = []
+            for offset in offsets:
+                address = module.base + offset
+                if source.read_into(address, memoryview(buffer)) != len(buffer) or not signature.matches_at(buffer):
+                    break
+                addresses.append(address)
+            else:
+                verified[signature.name] = addresses
+        return verified
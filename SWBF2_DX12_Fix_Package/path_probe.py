@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Concurrent Path Probing for Star Wars Battlefront II
+Checks candidate paths in a bounded pool of daemon threads with a deadline
+per probe, so sleeping HDDs and disconnected network/USB drives cannot stall
+game detection for longer than one timeout.
+"""
+
+import os
+import time
+import queue
+import threading
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+DEFAULT_PROBE_TIMEOUT = 2.0  # seconds a single probe may take
+DEFAULT_MAX_WORKERS = 8
+
+
+class ProbeResult(NamedTuple):
+    """Outcome of probing one candidate"""
+    path: str
+    ok: bool
+    elapsed: Optional[float]  # None if the probe never finished
+    timed_out: bool = False
+    error: Optional[str] = None
+
+
+class ProbeReport:
+    """Results of a probe_paths() run"""
+
+    def __init__(self, candidates: Sequence[str]):
+        self.candidates = list(candidates)
+        self.results = [None] * len(self.candidates)  # type: List[Optional[ProbeResult]]
+        self.found_index = None  # type: Optional[int]
+        self.elapsed = 0.0
+
+    @property
+    def found(self) -> Optional[str]:
+        return None if self.found_index is None else self.candidates[self.found_index]
+
+    @property
+    def timed_out(self) -> List[str]:
+        """Candidates whose probe did not finish within its deadline"""
+        return [result.path for result in self.results if result is not None and result.timed_out]
+
+
+def _worker(jobs: "queue.Queue", results: "queue.Queue", started: dict, check: Callable[[str], bool]):
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        index, path = job
+        begin = time.monotonic()
+        started[index] = begin
+        try:
+            ok, error = bool(check(path)), None
+        except Exception as e:
+            ok, error = False, str(e)
+        results.put((index, ProbeResult(path, ok, time.monotonic() - begin, False, error)))
+
+
+def probe_paths(candidates: Sequence[str], check: Callable[[str], bool] = os.path.exists,
+                timeout: float = DEFAULT_PROBE_TIMEOUT,
+                max_workers: int = DEFAULT_MAX_WORKERS) -> ProbeReport:
+    """Probe candidates concurrently and return the first hit in priority order.
+
+    Candidates are ordered by priority. The search returns as soon as the
+    best remaining candidate is known to be a hit, i.e. every candidate ahead
+    of it has finished or exceeded its deadline; lower priority probes that
+    are still running are abandoned. Worker threads are daemons, so a probe
+    stuck on a dead drive never blocks interpreter exit.
+    """
+    report = ProbeReport(candidates)
+    if not candidates:
+        return report
+
+    start = time.monotonic()
+    jobs = queue.Queue()  # type: queue.Queue
+    results = queue.Queue()  # type: queue.Queue
+    started = {}  # type: dict
+    worker_count = max(1, min(max_workers, len(candidates)))
+    for job in enumerate(candidates):
+        jobs.put(job)
+    for _ in range(worker_count):
+        jobs.put(None)
+        threading.Thread(target=_worker, args=(jobs, results, started, check), daemon=True).start()
+
+    # Queued probes can wait behind stuck ones; bound the whole run as well
+    waves = -(-len(candidates) // worker_count)
+    hard_deadline = start + timeout * waves
+
+    while True:
+        now = time.monotonic()
+        next_deadline = hard_deadline
+        decided = True
+        for index, path in enumerate(report.candidates):
+            result = report.results[index]
+            if result is None:
+                probe_deadline = started[index] + timeout if index in started else hard_deadline
+                if now >= probe_deadline or now >= hard_deadline:
+                    report.results[index] = ProbeResult(path, False, None, True)
+                    continue
+                # Still running (or queued) ahead of any hit: we cannot decide yet
+                next_deadline = min(next_deadline, probe_deadline if index in started else now + 0.05)
+                decided = False
+                break
+            if result.ok:
+                report.found_index = index
+                break
+        if decided:
+            break
+
+        try:
+            index, result = results.get(timeout=max(0.0, next_deadline - now))
+            report.results[index] = result
+        except queue.Empty:
+            continue
+
+    # Drain anything that finished meanwhile so the report is as complete as possible
+    while True:
+        try:
+            index, result = results.get_nowait()
+        except queue.Empty:
+            break
+        if report.results[index] is None:
+            report.results[index] = result
+
+    report.elapsed = time.monotonic() - start
+    return report
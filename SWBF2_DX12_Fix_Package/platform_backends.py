@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Platform Backends for Star Wars Battlefront II Fixes
+Registry, process and memory access behind small interfaces. The backend for
+this platform is only created (and winreg, ctypes.windll or /proc touched)
+on first use, so importing the fix modules is cheap and works off Windows.
+In-memory fakes stand in for all three when running the fixes without a game
+or a registry (set SWBF2_FAKE_PLATFORM=1 or call use_fake_backends()).
+"""
+
+import os
+import sys
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from memory_scanner import MemorySource  # Annotations only; MemoryBackend.open imports it lazily
+
+logger = logging.getLogger(__name__)
+
+FAKE_PLATFORM_ENV = "SWBF2_FAKE_PLATFORM"
+
+REGISTRY_HIVES = {
+    "HKLM": "HKEY_LOCAL_MACHINE",
+    "HKCU": "HKEY_CURRENT_USER",
+}
+REGISTRY_TYPES = {  # winreg constants, fixed by the Windows API
+    "REG_SZ": 1,
+    "REG_EXPAND_SZ": 2,
+    "REG_BINARY": 3,
+    "REG_DWORD": 4,
+    "REG_MULTI_SZ": 7,
+    "REG_QWORD": 11,
+}
+REGISTRY_TYPE_NAMES = {number: name for name, number in REGISTRY_TYPES.items()}
+
+# Windows process constants
+PROCESS_ALL_ACCESS = 0x1F0FFF
+HIGH_PRIORITY_CLASS = 0x00000080
+HIGH_PRIORITY_NICE = -5  # POSIX counterpart of HIGH_PRIORITY_CLASS
+THREAD_SET_INFORMATION = 0x0020
+# Thread priority levels: (SetThreadPriority value, POSIX nice offset). Both are
+# relative to the process priority: Windows adds them to the priority class,
+# on POSIX the offset is added to the process's nice value
+THREAD_PRIORITIES = {
+    "normal": (0, 0),
+    "above_normal": (1, -2),
+    "highest": (2, -5),
+}
+
+
+def registry_type_name(value_type) -> str:
+    """Type name ("REG_DWORD") for a name or a winreg constant"""
+    return REGISTRY_TYPE_NAMES.get(value_type, value_type) if isinstance(value_type, int) else value_type
+
+
+# -- registry ---------------------------------------------------------------
+
+class RegistryBackend:
+    """Registry values addressed by hive ("HKLM"/"HKCU"), key path and value name"""
+
+    name = "base"
+
+    def key_exists(self, hive: str, key: str) -> bool:
+        raise NotImplementedError
+
+    def query_value(self, hive: str, key: str, name: str) -> Optional[Tuple[object, str]]:
+        """(data, type name) of a value, or None if the key or value does not exist"""
+        raise NotImplementedError
+
+    def set_value(self, hive: str, key: str, name: str, value_type: str, value):
+        """Set a value, creating the key if needed"""
+        raise NotImplementedError
+
+    def delete_value(self, hive: str, key: str, name: str):
+        """Remove a value (missing keys and values are ignored)"""
+        raise NotImplementedError
+
+    def delete_key(self, hive: str, key: str) -> bool:
+        """Remove an empty key; False if it still has values or subkeys"""
+        raise NotImplementedError
+
+
+class WinRegBackend(RegistryBackend):
+    """The Windows registry via winreg"""
+
+    name = "winreg"
+
+    def __init__(self):
+        import winreg
+        self.winreg = winreg
+
+    def _hive(self, hive: str):
+        return getattr(self.winreg, REGISTRY_HIVES[hive])
+
+    def key_exists(self, hive: str, key: str) -> bool:
+        try:
+            self.winreg.OpenKey(self._hive(hive), key).Close()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def query_value(self, hive: str, key: str, name: str) -> Optional[Tuple[object, str]]:
+        try:
+            with self.winreg.OpenKey(self._hive(hive), key) as handle:
+                data, value_type = self.winreg.QueryValueEx(handle, name)
+        except FileNotFoundError:
+            return None
+        return data, registry_type_name(value_type)
+
+    def set_value(self, hive: str, key: str, name: str, value_type: str, value):
+        with self.winreg.CreateKey(self._hive(hive), key) as handle:
+            self.winreg.SetValueEx(handle, name, 0, REGISTRY_TYPES[value_type], value)
+
+    def delete_value(self, hive: str, key: str, name: str):
+        try:
+            with self.winreg.OpenKey(self._hive(hive), key, 0, self.winreg.KEY_SET_VALUE) as handle:
+                self.winreg.DeleteValue(handle, name)
+        except FileNotFoundError:
+            pass
+
+    def delete_key(self, hive: str, key: str) -> bool:
+        try:
+            self.winreg.DeleteKey(self._hive(hive), key)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+
+
+class UnavailableRegistryBackend(RegistryBackend):
+    """Platforms without a registry: reads find nothing, writes fail"""
+
+    name = "none"
+
+    def key_exists(self, hive: str, key: str) -> bool:
+        return False
+
+    def query_value(self, hive: str, key: str, name: str) -> Optional[Tuple[object, str]]:
+        return None
+
+    def set_value(self, hive: str, key: str, name: str, value_type: str, value):
+        raise OSError("The Windows registry is not available on this platform")
+
+    def delete_value(self, hive: str, key: str, name: str):
+        pass
+
+    def delete_key(self, hive: str, key: str) -> bool:
+        return True
+
+
+class FakeRegistryBackend(RegistryBackend):
+    """In-memory registry; key paths and value names are case-insensitive like the real one"""
+
+    name = "fake"
+
+    def __init__(self):
+        self.keys = {}  # type: Dict[Tuple[str, str], Dict[str, Tuple[str, object, str]]]
+
+    @staticmethod
+    def _key(hive: str, key: str) -> Tuple[str, str]:
+        if hive not in REGISTRY_HIVES:
+            raise KeyError(hive)
+        return hive, key.strip("\\").lower()
+
+    def key_exists(self, hive: str, key: str) -> bool:
+        return self._key(hive, key) in self.keys
+
+    def query_value(self, hive: str, key: str, name: str) -> Optional[Tuple[object, str]]:
+        entry = self.keys.get(self._key(hive, key), {}).get(name.lower())
+        return None if entry is None else (entry[1], entry[2])
+
+    def set_value(self, hive: str, key: str, name: str, value_type: str, value):
+        if value_type not in REGISTRY_TYPES:
+            raise ValueError(f"Unknown registry type: {value_type}")
+        self.keys.setdefault(self._key(hive, key), {})[name.lower()] = (name, value, value_type)
+
+    def delete_value(self, hive: str, key: str, name: str):
+        self.keys.get(self._key(hive, key), {}).pop(name.lower(), None)
+
+    def delete_key(self, hive: str, key: str) -> bool:
+        path = self._key(hive, key)
+        if self.keys.get(path):
+            return False
+        if any(other[0] == hive and other[1].startswith(path[1] + "\\") for other in self.keys):
+            return False
+        self.keys.pop(path, None)
+        return True
+
+
+# -- processes --------------------------------------------------------------
+
+class ProcessBackend:
+    """Opening a process and tuning its scheduling and memory"""
+
+    name = "base"
+
+    def open(self, pid: int):
+        """A handle for pid, or None if it cannot be opened"""
+        raise NotImplementedError
+
+    def close(self, handle):
+        pass
+
+    def raise_priority(self, handle) -> bool:
+        """Move the process to high priority"""
+        raise NotImplementedError
+
+    def trim_working_set(self, handle) -> bool:
+        """Ask the OS to page out the process's idle working set"""
+        raise NotImplementedError
+
+    def set_thread_priority(self, thread_id: int, level: str) -> bool:
+        """Set one thread's priority ("normal", "above_normal" or "highest")"""
+        raise NotImplementedError
+
+    def is_admin(self) -> Optional[bool]:
+        """Whether this process is elevated (None if it cannot be determined)"""
+        raise NotImplementedError
+
+
+class WindowsProcessBackend(ProcessBackend):
+    """kernel32 OpenProcess/SetPriorityClass/SetProcessWorkingSetSize"""
+
+    name = "win32"
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self.open_process = kernel32.OpenProcess
+        self.open_process.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self.open_process.restype = wintypes.HANDLE
+        self.close_handle = kernel32.CloseHandle
+        self.close_handle.argtypes = [wintypes.HANDLE]
+        self.set_priority_class = kernel32.SetPriorityClass
+        self.set_priority_class.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        self.set_working_set_size = kernel32.SetProcessWorkingSetSize
+        self.set_working_set_size.argtypes = [wintypes.HANDLE, ctypes.c_size_t, ctypes.c_size_t]
+        self.open_thread = kernel32.OpenThread
+        self.open_thread.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self.open_thread.restype = wintypes.HANDLE
+        self.set_priority = kernel32.SetThreadPriority
+        self.set_priority.argtypes = [wintypes.HANDLE, ctypes.c_int]
+
+    def open(self, pid: int):
+        return self.open_process(PROCESS_ALL_ACCESS, False, pid) or None
+
+    def close(self, handle):
+        self.close_handle(handle)
+
+    def raise_priority(self, handle) -> bool:
+        return bool(self.set_priority_class(handle, HIGH_PRIORITY_CLASS))
+
+    def trim_working_set(self, handle) -> bool:
+        # (SIZE_T)-1 for both limits trims the working set
+        unlimited = self.ctypes.c_size_t(-1).value
+        return bool(self.set_working_set_size(handle, unlimited, unlimited))
+
+    def set_thread_priority(self, thread_id: int, level: str) -> bool:
+        thread = self.open_thread(THREAD_SET_INFORMATION, False, thread_id)
+        if not thread:
+            return False
+        try:
+            return bool(self.set_priority(thread, THREAD_PRIORITIES[level][0]))
+        finally:
+            self.close_handle(thread)
+
+    def is_admin(self) -> Optional[bool]:
+        try:
+            return bool(self.ctypes.windll.shell32.IsUserAnAdmin())
+        except Exception:
+            return None
+
+
+def thread_ids(pid: int, proc_root: str = "/proc") -> List[int]:
+    """TIDs of every thread of a process, main thread first (just the PID without /proc)"""
+    try:
+        tids = sorted(int(tid) for tid in os.listdir(os.path.join(proc_root, str(pid), "task")))
+    except OSError:
+        return [pid]
+    return [pid] + [tid for tid in tids if tid != pid]
+
+
+def set_process_nice(pid: int, nice: int, proc_root: str = "/proc"):
+    """Set the nice value of every thread of a process.
+
+    Linux keeps a nice value per thread, so renicing the PID alone only
+    moves the main thread; threads created later inherit their creator's.
+    """
+    os.setpriority(os.PRIO_PROCESS, pid, nice)
+    for tid in thread_ids(pid, proc_root)[1:]:
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, nice)
+        except ProcessLookupError:
+            continue  # The thread exited meanwhile
+
+
+def set_process_affinity(pid: int, cpus, proc_root: str = "/proc"):
+    """Confine every thread of a process to cpus (Linux affinity masks are per thread too)"""
+    os.sched_setaffinity(pid, cpus)
+    for tid in thread_ids(pid, proc_root)[1:]:
+        try:
+            os.sched_setaffinity(tid, cpus)
+        except ProcessLookupError:
+            continue  # The thread exited meanwhile
+
+
+def _thread_group(thread_id: int, proc_root: str = "/proc") -> int:
+    """PID of the process a thread belongs to (the thread itself if unknown)"""
+    try:
+        with open(os.path.join(proc_root, str(thread_id), "status"), 'r') as f:
+            for line in f:
+                if line.startswith("Tgid:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return thread_id
+
+
+class PosixProcessBackend(ProcessBackend):
+    """Linux (e.g. the game under Wine/Proton): the handle is the PID, priority is the nice value"""
+
+    name = "posix"
+
+    def open(self, pid: int):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return None
+        except PermissionError:
+            pass  # Exists but belongs to someone else; later calls report their own failures
+        return pid
+
+    def raise_priority(self, handle) -> bool:
+        try:
+            set_process_nice(handle, HIGH_PRIORITY_NICE)
+            return True
+        except OSError:
+            return False  # Lowering the nice value needs root or CAP_SYS_NICE
+
+    def trim_working_set(self, handle) -> bool:
+        return False  # No per-process equivalent; the kernel reclaims pages on its own
+
+    def set_thread_priority(self, thread_id: int, level: str) -> bool:
+        # Linux keeps a nice value per thread, addressed by its TID; the level
+        # is an offset from the process's own nice value, as on Windows
+        try:
+            base = os.getpriority(os.PRIO_PROCESS, _thread_group(thread_id))
+            os.setpriority(os.PRIO_PROCESS, thread_id, max(-20, min(19, base + THREAD_PRIORITIES[level][1])))
+            return True
+        except OSError:
+            return False
+
+    def is_admin(self) -> Optional[bool]:
+        return os.geteuid() == 0
+
+
+class FakeProcessBackend(ProcessBackend):
+    """Processes that exist only in memory; records every call for inspection"""
+
+    name = "fake"
+
+    def __init__(self, pids=(), admin: bool = True):
+        self.pids = set(pids)
+        self.admin = admin
+        self.open_handles = set()
+        self.calls = []  # type: list
+
+    def open(self, pid: int):
+        self.calls.append(("open", pid))
+        if pid not in self.pids:
+            return None
+        self.open_handles.add(pid)
+        return pid
+
+    def close(self, handle):
+        self.calls.append(("close", handle))
+        self.open_handles.discard(handle)
+
+    def raise_priority(self, handle) -> bool:
+        self.calls.append(("raise_priority", handle))
+        return handle in self.open_handles
+
+    def trim_working_set(self, handle) -> bool:
+        self.calls.append(("trim_working_set", handle))
+        return handle in self.open_handles
+
+    def set_thread_priority(self, thread_id: int, level: str) -> bool:
+        self.calls.append(("set_thread_priority", thread_id, level))
+        return level in THREAD_PRIORITIES
+
+    def is_admin(self) -> Optional[bool]:
+        return self.admin
+
+
+# -- memory -----------------------------------------------------------------
+
+class MemoryBackend:
+    """Readable address spaces of live processes"""
+
+    name = "native"
+
+    def open(self, pid: int, handle=None) -> 'MemorySource':
+        """Memory source for a process (Windows needs the handle from ProcessBackend.open)"""
+        from memory_scanner import open_process_memory
+        return open_process_memory(pid, handle)
+
+
+class FakeMemoryBackend(MemoryBackend):
+    """Address spaces registered per PID, e.g. BufferMemorySource images"""
+
+    name = "fake"
+
+    def __init__(self, sources: Optional[Dict[int, 'MemorySource']] = None):
+        self.sources = dict(sources or {})
+
+    def add(self, pid: int, source: 'MemorySource'):
+        self.sources[pid] = source
+
+    def open(self, pid: int, handle=None) -> 'MemorySource':
+        try:
+            return self.sources[pid]
+        except KeyError:
+            raise ProcessLookupError(f"No fake memory for PID {pid}")
+
+
+# -- selection --------------------------------------------------------------
+
+class PlatformBackends:
+    """The registry, process and memory backends, each created on first access"""
+
+    def __init__(self, registry: Optional[RegistryBackend] = None, process: Optional[ProcessBackend] = None,
+                 memory: Optional[MemoryBackend] = None):
+        self._registry = registry
+        self._process = process
+        self._memory = memory
+
+    @property
+    def registry(self) -> RegistryBackend:
+        if self._registry is None:
+            self._registry = WinRegBackend() if sys.platform == 'win32' else UnavailableRegistryBackend()
+            logger.debug(f"Registry backend: {self._registry.name}")
+        return self._registry
+
+    @property
+    def process(self) -> ProcessBackend:
+        if self._process is None:
+            self._process = WindowsProcessBackend() if sys.platform == 'win32' else PosixProcessBackend()
+            logger.debug(f"Process backend: {self._process.name}")
+        return self._process
+
+    @property
+    def memory(self) -> MemoryBackend:
+        if self._memory is None:
+            self._memory = MemoryBackend()
+        return self._memory
+
+
+def fake_backends() -> PlatformBackends:
+    return PlatformBackends(FakeRegistryBackend(), FakeProcessBackend(), FakeMemoryBackend())
+
+
+_backends = None  # type: Optional[PlatformBackends]
+
+
+def get_backends() -> PlatformBackends:
+    """The process-wide backends (fakes if SWBF2_FAKE_PLATFORM is set)"""
+    global _backends
+    if _backends is None:
+        _backends = fake_backends() if os.environ.get(FAKE_PLATFORM_ENV) else PlatformBackends()
+    return _backends
+
+
+def set_backends(backends: Optional[PlatformBackends]) -> Optional[PlatformBackends]:
+    """Replace the process-wide backends (None: back to the platform defaults); returns the old ones"""
+    global _backends
+    previous, _backends = _backends, backends
+    return previous
+
+
+def use_fake_backends() -> PlatformBackends:
+    backends = fake_backends()
+    set_backends(backends)
+    return backends
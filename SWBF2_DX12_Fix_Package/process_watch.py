@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Game Process Watcher for Star Wars Battlefront II
+Detects game process launches with pluggable backends:
+- WMI process start events (Windows, optional ``wmi`` package)
+- psutil PID diffing (any platform psutil supports)
+- /proc PID diffing (Linux, no dependencies)
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from typing import Iterable, List, NamedTuple, Optional
+
+psutil = None  # Imported on first use by load_psutil()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 0.025  # seconds between scans for polling backends
+BACKOFF_FACTOR = 1.5           # growth of the poll interval after each empty scan (with max_poll_interval)
+
+
+def load_psutil():
+    """psutil, imported on first use (None if it is not installed)"""
+    global psutil
+    if psutil is None:
+        try:
+            import psutil as module
+        except ImportError:
+            return None
+        psutil = module
+    return psutil
+
+
+class ProcessInfo(NamedTuple):
+    """A process seen by a watch backend"""
+    pid: int
+    name: str
+    create_time: Optional[float] = None  # seconds since the epoch, if known
+
+
+class ProcessEvent(NamedTuple):
+    """A matching game process reported by ProcessWatcher"""
+    pid: int
+    name: str
+    create_time: Optional[float]
+    detected_at: float
+    latency: Optional[float]  # detected_at - create_time, for processes started while watching
+
+
+class ProcessNameMatcher:
+    """Case-insensitive matcher for a fixed set of executable names.
+
+    Names are lowercased once up front; matching is a set lookup on the
+    executable's base name, so full paths (from cmdline or WMI) also match.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = frozenset(name.lower() for name in names)
+
+    def matches(self, name: Optional[str]) -> bool:
+        if not name:
+            return False
+        name = name.lower()
+        if name in self.names:
+            return True
+        base = name.replace('\\', '/').rsplit('/', 1)[-1]
+        return base in self.names
+
+
+class ProcessWatchBackend:
+    """Source of newly started processes.
+
+    ``scan`` returns the processes that appeared since the previous call;
+    the first call returns every running process so an already running
+    game is found. Event-driven backends block for up to ``timeout`` seconds
+    waiting for a notification; polling backends return immediately and
+    ProcessWatcher sleeps between scans.
+    """
+
+    name = "base"
+    event_driven = False
+
+    @classmethod
+    def available(cls) -> bool:
+        return False
+
+    def scan(self, timeout: float = 0.0) -> List[ProcessInfo]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PsutilDiffBackend(ProcessWatchBackend):
+    """Polls the PID list and only resolves names for PIDs not seen before"""
+
+    name = "psutil"
+
+    def __init__(self):
+        if load_psutil() is None:
+            raise RuntimeError("The psutil process watch backend needs psutil")
+        self.known_pids = set()
+
+    @classmethod
+    def available(cls) -> bool:
+        return load_psutil() is not None
+
+    def scan(self, timeout: float = 0.0) -> List[ProcessInfo]:
+        current = set(psutil.pids())
+        new_pids = current - self.known_pids
+        self.known_pids = current
+
+        found = []
+        for pid in new_pids:
+            try:
+                process = psutil.Process(pid)
+                found.append(ProcessInfo(pid, process.name(), process.create_time()))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        return found
+
+
+class ProcfsDiffBackend(ProcessWatchBackend):
+    """Polls /proc for new PIDs (Linux, including games running under Wine/Proton)"""
+
+    name = "procfs"
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.proc_root = proc_root
+        self.known_pids = set()
+        self.clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.boot_time = self._read_boot_time()
+
+    @classmethod
+    def available(cls) -> bool:
+        return sys.platform.startswith('linux') and os.path.isdir("/proc/self")
+
+    def _read_boot_time(self) -> Optional[float]:
+        # /proc/stat's btime is truncated to whole seconds; derive it from uptime instead
+        try:
+            with open(os.path.join(self.proc_root, "uptime"), 'r') as f:
+                return time.time() - float(f.read().split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def process_name(self, pid: int) -> Optional[str]:
+        """Executable name from argv[0], falling back to the (truncated) comm name"""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), "cmdline"), 'rb') as f:
+                argv0 = f.read().split(b'\0', 1)[0]
+            if argv0:
+                return argv0.decode('utf-8', 'replace').replace('\\', '/').rsplit('/', 1)[-1]
+            with open(os.path.join(self.proc_root, str(pid), "comm"), 'rb') as f:
+                return f.read().strip().decode('utf-8', 'replace')
+        except OSError:
+            return None
+
+    def create_time(self, pid: int) -> Optional[float]:
+        """Process start time, at clock-tick (usually 10 ms) resolution"""
+        if self.boot_time is None:
+            return None
+        try:
+            with open(os.path.join(self.proc_root, str(pid), "stat"), 'rb') as f:
+                stat = f.read()
+            # Field 22 (starttime) follows the parenthesised command name
+            fields = stat[stat.rindex(b')') + 2:].split()
+            return self.boot_time + int(fields[19]) / self.clock_ticks
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def scan(self, timeout: float = 0.0) -> List[ProcessInfo]:
+        try:
+            current = {int(entry) for entry in os.listdir(self.proc_root) if entry.isdigit()}
+        except OSError:
+            return []
+        new_pids = current - self.known_pids
+        self.known_pids = current
+
+        found = []
+        for pid in new_pids:
+            name = self.process_name(pid)
+            if name:
+                found.append(ProcessInfo(pid, name, self.create_time(pid)))
+        return found
+
+
+class WmiEventBackend(ProcessWatchBackend):
+    """Waits on Win32_ProcessStartTrace notifications (requires ``wmi`` and admin rights)"""
+
+    name = "wmi"
+    event_driven = True
+
+    def __init__(self, names: Optional[Iterable[str]] = None):
+        import pythoncom
+        import wmi
+        pythoncom.CoInitialize()
+        self._wmi = wmi
+        query = "SELECT * FROM Win32_ProcessStartTrace"
+        if names:
+            query += " WHERE " + " OR ".join(f"ProcessName = '{name}'" for name in names)
+        self.watcher = wmi.WMI().watch_for(raw_wql=query)
+        self.snapshot_taken = False
+
+    @classmethod
+    def available(cls) -> bool:
+        if sys.platform != 'win32' or load_psutil() is None:
+            return False
+        try:
+            import wmi  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def scan(self, timeout: float = 0.0) -> List[ProcessInfo]:
+        if not self.snapshot_taken:
+            # Notifications only cover new processes; report what is already running once
+            self.snapshot_taken = True
+            return PsutilDiffBackend().scan()
+        try:
+            event = self.watcher(timeout_ms=max(1, int(timeout * 1000)))
+        except self._wmi.x_wmi_timed_out:
+            return []
+        pid = int(event.ProcessID)
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            create_time = None
+        return [ProcessInfo(pid, event.ProcessName, create_time)]
+
+
+BACKENDS = {
+    WmiEventBackend.name: WmiEventBackend,
+    PsutilDiffBackend.name: PsutilDiffBackend,
+    ProcfsDiffBackend.name: ProcfsDiffBackend,
+}
+
+
+def create_backend(names: Iterable[str], preferred: Optional[str] = None) -> ProcessWatchBackend:
+    """Create the best available backend (or the preferred one if it is available)"""
+    order = [preferred] if preferred else []
+    order += [WmiEventBackend.name, PsutilDiffBackend.name, ProcfsDiffBackend.name]
+    for backend_name in order:
+        backend_class = BACKENDS.get(backend_name)
+        if backend_class is None or not backend_class.available():
+            continue
+        try:
+            if backend_class is WmiEventBackend:
+                return backend_class(names)
+            return backend_class()
+        except Exception as e:
+            logger.debug(f"Process watch backend {backend_name} unavailable: {e}")
+    raise RuntimeError("No process watch backend available (install psutil)")
+
+
+class ProcessWatcher:
+    """Waits for any of a set of executables to start and records detection latency.
+
+    With max_poll_interval set, polling backends back off: every scan that
+    finds nothing stretches the interval by BACKOFF_FACTOR up to that
+    maximum, and a match (or reset_backoff) brings it back to poll_interval.
+    """
+
+    def __init__(self, names: Iterable[str], backend: Optional[ProcessWatchBackend] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, max_poll_interval: Optional[float] = None):
+        names = list(names)
+        self.matcher = ProcessNameMatcher(names)
+        self.backend = backend or create_backend(names)
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.current_interval = poll_interval
+        self.started_at = time.time()
+        self.latencies = []  # type: List[float]
+        self.pending = []  # type: List[ProcessEvent]
+
+    def _match(self, processes: List[ProcessInfo]) -> List[ProcessEvent]:
+        detected_at = time.time()
+        events = []
+        for process in processes:
+            if not self.matcher.matches(process.name):
+                continue
+            latency = None
+            # Only processes started after we began watching have a meaningful latency
+            if process.create_time is not None and process.create_time >= self.started_at:
+                latency = max(0.0, detected_at - process.create_time)
+                self.latencies.append(latency)
+            events.append(ProcessEvent(process.pid, process.name, process.create_time, detected_at, latency))
+        return events
+
+    def reset_backoff(self):
+        self.current_interval = self.poll_interval
+
+    def wait_for_process(self, timeout: Optional[float] = None,
+                         cancel: Optional[threading.Event] = None) -> Optional[ProcessEvent]:
+        """Block until a matching process is found; returns None on timeout or once cancel is set"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.pending:
+                return self.pending.pop(0)
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if (remaining is not None and remaining <= 0) or (cancel is not None and cancel.is_set()):
+                return None
+
+            if self.backend.event_driven:
+                # Block on the notification; wake at least once a second to honour the deadline
+                wait = 1.0 if remaining is None else min(1.0, remaining)
+                self.pending.extend(self._match(self.backend.scan(timeout=wait)))
+            else:
+                interval = self.current_interval
+                wait = interval if remaining is None else min(interval, remaining)
+                self.pending.extend(self._match(self.backend.scan()))
+                if self.pending:
+                    self.reset_backoff()
+                    continue
+                if self.max_poll_interval is not None:
+                    self.current_interval = min(interval * BACKOFF_FACTOR, self.max_poll_interval)
+                if cancel is not None:
+                    cancel.wait(wait)
+                else:
+                    time.sleep(wait)
+
+    def latency_stats(self) -> dict:
+        """Summary of detection latencies in milliseconds"""
+        if not self.latencies:
+            return {"count": 0}
+        ordered = sorted(self.latencies)
+        return {
+            "count": len(ordered),
+            "min_ms": ordered[0] * 1000,
+            "median_ms": ordered[len(ordered) // 2] * 1000,
+            "max_ms": ordered[-1] * 1000,
+        }
+
+    def close(self):
+        self.backend.close()
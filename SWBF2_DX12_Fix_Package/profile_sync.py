@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Fix Profile Distribution for Star Wars Battlefront II
+Fetches fix profiles (the UI artifact fixer's settings lines and
+UI_Fix_Profile, as JSON) from a central HTTP server. Requests are conditional
+(If-None-Match / If-Modified-Since) over one kept-alive connection, so an
+unchanged profile costs a single 304; the last good copy is cached locally
+and used when the server cannot be reached. ``serve`` runs a small stand-in
+server for a directory of profiles.
+
+Usage: python profile_sync.py fetch <base_url> [name]
+       python profile_sync.py publish <directory> [name]
+       python profile_sync.py serve <directory> [port]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import threading
+import http.client
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+from Fix_UI_Artifacts import PROFILE_SECTIONS, builtin_profile, validate_profile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_NAME = "ui-fix"
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / "ProfileCache"
+DEFAULT_PORT = 8642
+DEFAULT_TIMEOUT = 5.0
+
+DOWNLOADED, NOT_MODIFIED, OFFLINE = "downloaded", "not modified", "offline cache"
+
+
+# -- client -----------------------------------------------------------------
+
+class ProfileClient:
+    """Conditional GETs for <base_url>/<name>.json over a reused connection, with an on-disk cache"""
+
+    def __init__(self, base_url: str, cache_dir: Path = DEFAULT_CACHE_DIR, timeout: float = DEFAULT_TIMEOUT):
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Profile URL must be http or https: {base_url}")
+        self.scheme = url.scheme
+        self.host = url.hostname
+        self.port = url.port
+        self.base_path = url.path.rstrip('/')
+        self.cache_dir = Path(cache_dir)
+        self.timeout = timeout
+        self.connection = None  # type: Optional[http.client.HTTPConnection]
+        self.stats = {DOWNLOADED: 0, NOT_MODIFIED: 0, OFFLINE: 0, "body_bytes": 0}
+
+    # -- cache ----------------------------------------------------------
+
+    def _cache_paths(self, name: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{name}.json", self.cache_dir / f"{name}.meta.json"
+
+    def cached(self, name: str) -> Tuple[Optional[bytes], dict]:
+        """Cached body and its validators (ETag, Last-Modified)"""
+        body_path, meta_path = self._cache_paths(name)
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return body, json.load(f)
+        except (OSError, ValueError):
+            return None, {}
+
+    def _store(self, name: str, body: bytes, meta: dict):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for path, data in zip(self._cache_paths(name), (body, json.dumps(meta).encode('utf-8'))):
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    # -- HTTP -----------------------------------------------------------
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self.connection = connection_class(self.host, self.port, timeout=self.timeout)
+        return self.connection
+
+    def _get(self, path: str, headers: Dict[str, str]) -> Tuple[int, http.client.HTTPResponse, bytes]:
+        # A kept-alive connection the server has since closed fails on first use: reconnect once
+        for attempt in (1, 2):
+            connection = self._connect()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                return response.status, response, response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                if attempt == 2:
+                    raise
+            except (OSError, http.client.HTTPException):
+                self.close()
+                raise
+
+    def fetch(self, name: str = DEFAULT_PROFILE_NAME) -> Tuple[dict, str]:
+        """The profile and where it came from (DOWNLOADED, NOT_MODIFIED or OFFLINE)"""
+        cached_body, meta = self.cached(name)
+        headers = {"Accept": "application/json"}
+        if cached_body is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            status, response, body = self._get(f"{self.base_path}/{quote(name)}.json", headers)
+        except (OSError, http.client.HTTPException) as e:
+            if cached_body is None:
+                raise RuntimeError(f"Profile server unreachable and no cached copy of {name}: {e}")
+            logger.warning(f"Profile server unreachable ({e}); using cached {name}")
+            self.stats[OFFLINE] += 1
+            return json.loads(cached_body.decode('utf-8')), OFFLINE
+
+        if status == 304 and cached_body is not None:
+            self.stats[NOT_MODIFIED] += 1
+            return json.loads(cached_body.decode('utf-8')), NOT_MODIFIED
+        if status != 200:
+            if cached_body is not None:
+                logger.warning(f"Profile server answered {status} for {name}; using cached copy")
+                self.stats[OFFLINE] += 1
+                return json.loads(cached_body.decode('utf-8')), OFFLINE
+            raise RuntimeError(f"Profile server answered {status} for {name}")
+
+        profile = validate_profile(json.loads(body.decode('utf-8')))  # Never cache a bad profile
+        self._store(name, body, {"etag": response.getheader("ETag"),
+                                 "last_modified": response.getheader("Last-Modified"),
+                                 "fetched": time.time()})
+        self.stats[DOWNLOADED] += 1
+        self.stats["body_bytes"] += len(body)
+        return profile, DOWNLOADED
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def fetch_profile(base_url: str, name: str = DEFAULT_PROFILE_NAME,
+                  cache_dir: Path = DEFAULT_CACHE_DIR) -> Tuple[dict, str]:
+    """One-off fetch; see ProfileClient.fetch"""
+    client = ProfileClient(base_url, cache_dir)
+    try:
+        return client.fetch(name)
+    finally:
+        client.close()
+
+
+# -- stand-in server ----------------------------------------------------------
+
+class _CountingWriter:
+    """Counts bytes a handler writes to its socket"""
+
+    def __init__(self, stream, server):
+        self.stream = stream
+        self.server = server
+
+    def write(self, data):
+        with self.server.lock:
+            self.server.bytes_sent += len(data)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class ProfileRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections alive between requests
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def setup(self):
+        super().setup()
+        self.wfile = _CountingWriter(self.wfile, self.server)
+
+    def do_GET(self):
+        name = unquote(self.path.split('?', 1)[0]).rsplit('/', 1)[-1]
+        path = self.server.root / name
+        if not name.endswith(".json") or not path.is_file():
+            self.send_error(404)
+            return
+        body = path.read_bytes()
+        modified = int(path.stat().st_mtime)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+        if self._not_modified(etag, modified):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(modified, usegmt=True))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag: str, modified: int) -> bool:
+        match = self.headers.get("If-None-Match")
+        if match is not None:  # Takes precedence over If-Modified-Since (RFC 7232)
+            return any(tag.strip() in (etag, "*") for tag in match.split(","))
+        since = self.headers.get("If-Modified-Since")
+        if since:
+            try:
+                return modified <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class ProfileServer(ThreadingMixIn, HTTPServer):
+    """Serves <root>/<name>.json with ETag/Last-Modified validators; counts bytes sent"""
+
+    daemon_threads = True
+
+    def __init__(self, root: Path, address: Tuple[str, int] = ("127.0.0.1", DEFAULT_PORT)):
+        self.root = Path(root)
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        super().__init__(address, ProfileRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'ProfileServer':
+        threading.Thread(target=self.serve_forever, name="profile-server", daemon=True).start()
+        return self
+
+
+def publish_profile(directory: Path, name: str = DEFAULT_PROFILE_NAME, profile: Optional[dict] = None) -> Path:
+    """Write a profile (default: the built-in fixes) where ProfileServer serves it"""
+    profile = validate_profile(dict(profile or builtin_profile(), name=name))
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    return path
+
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else None
+    if command == "fetch" and len(args) > 1:
+        name = args[2] if len(args) > 2 else DEFAULT_PROFILE_NAME
+        try:
+            profile, source = fetch_profile(args[1], name)
+        except (RuntimeError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+        lines = sum(len(profile[section]) for section in PROFILE_SECTIONS)
+        print(f"✅ {name}: {lines} settings lines ({source})")
+        return 0
+    if command == "publish" and len(args) > 1:
+        path = publish_profile(Path(args[1]), args[2] if len(args) > 2 else DEFAULT_PROFILE_NAME)
+        print(f"✅ Published {path}")
+        return 0
+    if command == "serve" and len(args) > 1:
+        server = ProfileServer(Path(args[1]), ("0.0.0.0", int(args[2]) if len(args) > 2 else DEFAULT_PORT))
+        print(f"🌐 Serving profiles from {args[1]} on port {server.server_address[1]} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+        return 0
+    print("Usage: python profile_sync.py fetch <base_url> [name] | publish <directory> [name] | serve <directory> [port]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
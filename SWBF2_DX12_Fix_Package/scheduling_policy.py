@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+Scheduling Policy Engine for Star Wars Battlefront II
+Picks a policy for the game process from rules in scheduling_policies.json
+(matched against the CPU topology) and applies it: process priority, a CPU
+affinity mask that can leave out SMT siblings and E-cores, and a higher
+priority for the hottest threads found by sampling per-thread CPU time.
+Scheduling latency, migrations and context switches can be measured before
+and after, so each policy is judged on data.
+
+Usage: python scheduling_policy.py topology
+       python scheduling_policy.py apply <pid> [policy]
+       python scheduling_policy.py evaluate <pid> [policy] [window_seconds]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from platform_backends import (HIGH_PRIORITY_NICE, THREAD_PRIORITIES, get_backends, set_process_affinity,
+                               set_process_nice)
+from process_watch import load_psutil
+
+logger = logging.getLogger(__name__)
+
+POLICY_FORMAT = 1
+DEFAULT_POLICY_PATH = Path(__file__).resolve().parent / "scheduling_policies.json"
+DEFAULT_HOT_THREAD_WINDOW = 1.0  # seconds of per-thread CPU time sampled to find the hottest threads
+DEFAULT_HOT_THREAD_DELAY = 30.0  # seconds after launch before sampling: the engine starts its workers while loading
+DEFAULT_MEASURE_WINDOW = 2.0
+AFFINITY_MODES = ("all", "physical", "performance", "physical-performance")
+
+# Process priority levels: (psutil Windows priority class name, POSIX nice value)
+PROCESS_PRIORITIES = {
+    "idle": ("IDLE_PRIORITY_CLASS", 19),
+    "below_normal": ("BELOW_NORMAL_PRIORITY_CLASS", 5),
+    "normal": ("NORMAL_PRIORITY_CLASS", 0),
+    "above_normal": ("ABOVE_NORMAL_PRIORITY_CLASS", -2),
+    "high": ("HIGH_PRIORITY_CLASS", HIGH_PRIORITY_NICE),
+}
+
+
+# -- topology ---------------------------------------------------------------
+
+class CpuCore(NamedTuple):
+    """One physical core"""
+    cpus: Tuple[int, ...]   # its logical CPUs (SMT siblings), lowest first
+    efficiency: int = 0     # higher is faster; all equal on non-hybrid CPUs
+
+
+class CpuTopology(NamedTuple):
+    cores: List[CpuCore]
+
+    @property
+    def logical_count(self) -> int:
+        return sum(len(core.cpus) for core in self.cores)
+
+    @property
+    def smt(self) -> bool:
+        return any(len(core.cpus) > 1 for core in self.cores)
+
+    @property
+    def hybrid(self) -> bool:
+        return len({core.efficiency for core in self.cores}) > 1
+
+    def cpus(self, mode: str) -> List[int]:
+        """Logical CPUs for an affinity mode ("all", "physical", "performance", "physical-performance")"""
+        if mode not in AFFINITY_MODES:
+            raise ValueError(f"Unknown affinity mode: {mode}")
+        cores = self.cores
+        if mode.endswith("performance"):
+            fastest = max(core.efficiency for core in cores)
+            cores = [core for core in cores if core.efficiency == fastest]
+        if mode.startswith("physical"):
+            return sorted(core.cpus[0] for core in cores)
+        return sorted(cpu for core in cores for cpu in core.cpus)
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """Linux CPU list syntax: "0-3,8,10-11" """
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def read_linux_topology(sys_root: str = "/sys") -> Optional[CpuTopology]:
+    """Cores from sysfs; Intel hybrid parts list P-cores under cpu_core and E-cores under cpu_atom"""
+    cpu_root = os.path.join(sys_root, "devices", "system", "cpu")
+    online = _read_text(os.path.join(cpu_root, "online"))
+    if online is None:
+        return None
+    performance = set(parse_cpu_list(_read_text(os.path.join(sys_root, "devices", "cpu_core", "cpus")) or ""))
+
+    cores = {}  # type: Dict[Tuple[int, ...], int]
+    for cpu in parse_cpu_list(online):
+        siblings = _read_text(os.path.join(cpu_root, f"cpu{cpu}", "topology", "thread_siblings_list"))
+        group = tuple(parse_cpu_list(siblings)) if siblings else (cpu,)
+        cores[group] = 1 if performance and cpu in performance else 0
+    return CpuTopology([CpuCore(cpus, efficiency) for cpus, efficiency in sorted(cores.items())])
+
+
+def read_windows_topology() -> Optional[CpuTopology]:
+    """Cores of processor group 0 from GetLogicalProcessorInformationEx (EfficiencyClass per core)"""
+    import ctypes
+    from ctypes import wintypes
+
+    relation_processor_core = 0
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    get_information = kernel32.GetLogicalProcessorInformationEx
+    get_information.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(wintypes.DWORD)]
+    get_information.restype = wintypes.BOOL
+
+    length = wintypes.DWORD(0)
+    get_information(relation_processor_core, None, ctypes.byref(length))
+    buffer = ctypes.create_string_buffer(length.value)
+    if not get_information(relation_processor_core, buffer, ctypes.byref(length)):
+        return None
+
+    # SYSTEM_LOGICAL_PROCESSOR_INFORMATION_EX: Relationship, Size, then PROCESSOR_RELATIONSHIP
+    # (Flags, EfficiencyClass, Reserved[20], GroupCount, GROUP_AFFINITY GroupMask[] at offset 32)
+    data = buffer.raw[:length.value]
+    mask_size = ctypes.sizeof(ctypes.c_void_p)
+    cores = []
+    offset = 0
+    while offset < len(data):
+        size = int.from_bytes(data[offset + 4:offset + 8], 'little')
+        efficiency = data[offset + 9]
+        mask = int.from_bytes(data[offset + 32:offset + 32 + mask_size], 'little')
+        group = int.from_bytes(data[offset + 32 + mask_size:offset + 34 + mask_size], 'little')
+        if group == 0 and mask:
+            cores.append(CpuCore(tuple(cpu for cpu in range(mask_size * 8) if mask >> cpu & 1), efficiency))
+        offset += size
+    return CpuTopology(sorted(cores))
+
+
+def read_cpu_topology() -> CpuTopology:
+    topology = None
+    try:
+        topology = read_windows_topology() if sys.platform == 'win32' else read_linux_topology()
+    except (OSError, ValueError, AttributeError) as e:
+        logger.debug(f"Could not read CPU topology: {e}")
+    if not topology or not topology.cores:
+        # Unknown layout: treat every logical CPU as its own core
+        topology = CpuTopology([CpuCore((cpu,)) for cpu in range(os.cpu_count() or 1)])
+    return topology
+
+
+# -- policies ---------------------------------------------------------------
+
+class HotThreadRule(NamedTuple):
+    count: int
+    priority: str   # key of THREAD_PRIORITIES, relative to the process priority
+    window: float = DEFAULT_HOT_THREAD_WINDOW
+    delay: float = DEFAULT_HOT_THREAD_DELAY
+
+
+class SchedulingPolicy(NamedTuple):
+    name: str
+    priority: Optional[str] = None          # key of PROCESS_PRIORITIES
+    affinity: Optional[str] = None          # one of AFFINITY_MODES
+    hot_threads: Optional[HotThreadRule] = None
+
+
+class PolicyConfig:
+    """Named policies plus ordered rules choosing one for a CPU topology"""
+
+    def __init__(self, data: dict):
+        if data.get("format") != POLICY_FORMAT:
+            raise ValueError(f"Unsupported scheduling policy format: {data.get('format')!r}")
+        self.policies = {}  # type: Dict[str, SchedulingPolicy]
+        for name, entry in data.get("policies", {}).items():
+            if entry.get("priority") is not None and entry["priority"] not in PROCESS_PRIORITIES:
+                raise ValueError(f"Policy {name}: unknown priority {entry['priority']!r}")
+            if entry.get("affinity") is not None and entry["affinity"] not in AFFINITY_MODES:
+                raise ValueError(f"Policy {name}: unknown affinity {entry['affinity']!r}")
+            hot = entry.get("hot_threads")
+            if hot is not None and hot.get("priority") not in THREAD_PRIORITIES:
+                raise ValueError(f"Policy {name}: unknown thread priority {hot.get('priority')!r}")
+            self.policies[name] = SchedulingPolicy(
+                name, entry.get("priority"), entry.get("affinity"),
+                HotThreadRule(hot["count"], hot["priority"], hot.get("window", DEFAULT_HOT_THREAD_WINDOW),
+                              hot.get("delay", DEFAULT_HOT_THREAD_DELAY))
+                if hot else None)
+        self.rules = data.get("rules", [])
+        for rule in self.rules:
+            if rule["policy"] not in self.policies:
+                raise ValueError(f"Rule refers to unknown policy {rule['policy']!r}")
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_POLICY_PATH) -> 'PolicyConfig':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def matches(condition: dict, topology: CpuTopology) -> bool:
+        checks = {
+            "hybrid": lambda value: topology.hybrid == value,
+            "smt": lambda value: topology.smt == value,
+            "min_cores": lambda value: len(topology.cores) >= value,
+            "min_cpus": lambda value: topology.logical_count >= value,
+        }
+        return all(checks[key](value) for key, value in condition.items())
+
+    def select(self, topology: CpuTopology) -> SchedulingPolicy:
+        """Policy of the first rule whose conditions all hold"""
+        for rule in self.rules:
+            if self.matches(rule.get("when", {}), topology):
+                return self.policies[rule["policy"]]
+        raise LookupError("No scheduling rule matches this CPU")
+
+
+# -- applying ---------------------------------------------------------------
+
+class PolicyResult(NamedTuple):
+    policy: str
+    priority: Optional[str]
+    affinity: Optional[List[int]]
+    hot_threads: List[int]                  # thread IDs raised (filled in later when deferred)
+    errors: List[str]
+    previous_priority: Optional[int] = None  # psutil nice() value before, for undo
+    previous_affinity: Optional[List[int]] = None
+    hot_thread_delay: Optional[float] = None  # seconds until hot threads are sampled, if deferred
+
+
+def _psutil():
+    psutil = load_psutil()
+    if psutil is None:
+        raise RuntimeError("Scheduling policies need psutil")
+    return psutil
+
+
+def priority_value(level: str) -> int:
+    """psutil nice() argument for a priority level on this platform"""
+    class_name, nice = PROCESS_PRIORITIES[level]
+    return getattr(_psutil(), class_name) if sys.platform == 'win32' else nice
+
+
+def thread_cpu_times(process) -> Dict[int, float]:
+    return {thread.id: thread.user_time + thread.system_time for thread in process.threads()}
+
+
+def set_process_priority(process, value: int):
+    """process.nice(value), applied to every thread on Linux (nice values are per thread there)"""
+    if sys.platform.startswith('linux'):
+        set_process_nice(process.pid, value)
+    else:
+        process.nice(value)
+
+
+def set_process_cpus(process, cpus: List[int]):
+    """process.cpu_affinity(cpus), applied to every thread on Linux (affinity is per thread there)"""
+    if sys.platform.startswith('linux'):
+        set_process_affinity(process.pid, cpus)
+    else:
+        process.cpu_affinity(cpus)
+
+
+def hottest_threads(process, count: int, window: float = DEFAULT_HOT_THREAD_WINDOW) -> List[int]:
+    """IDs of the count threads that used the most CPU over window seconds"""
+    before = thread_cpu_times(process)
+    time.sleep(window)
+    after = thread_cpu_times(process)
+    used = sorted(((after[tid] - before.get(tid, 0.0), tid) for tid in after), reverse=True)
+    return [tid for cpu, tid in used[:count] if cpu > 0]
+
+
+def raise_hot_threads(process, rule: HotThreadRule, raised: List[int], errors: List[str]):
+    """Sample the process and raise its hottest threads, appending to raised/errors"""
+    threads = get_backends().process
+    for tid in hottest_threads(process, rule.count, rule.window):
+        if threads.set_thread_priority(tid, rule.priority):
+            raised.append(tid)
+        else:
+            errors.append(f"thread {tid} priority {rule.priority}: refused")
+
+
+def _raise_hot_threads_later(process, rule: HotThreadRule, result: 'PolicyResult'):
+    psutil = _psutil()
+    try:
+        process.wait(rule.delay)
+        return  # The game exited before its threads were sampled
+    except psutil.TimeoutExpired:
+        pass
+    try:
+        raise_hot_threads(process, rule, result.hot_threads, result.errors)
+    except (psutil.NoSuchProcess, psutil.AccessDenied, OSError) as e:
+        logger.debug(f"Hot thread sampling stopped: {e}")
+        return
+    logger.info(f"Scheduling policy {result.policy}: raised {len(result.hot_threads)} hot thread(s) "
+                f"to {rule.priority}")
+
+
+def apply_policy(pid: int, policy: Optional[SchedulingPolicy] = None, topology: Optional[CpuTopology] = None,
+                 config: Optional[PolicyConfig] = None, defer_hot_threads: bool = False) -> PolicyResult:
+    """Apply a policy (default: the one the rules pick for this CPU) to a process.
+
+    Each step is independent: one that is refused (e.g. raising priority
+    without the right privileges) is reported in errors and the rest still
+    apply. With defer_hot_threads the hot threads are sampled on a
+    background thread once the rule's delay has passed (a just-launched
+    game has not started its worker threads yet) and added to the result's
+    hot_threads then; otherwise they are sampled now, which blocks for the
+    rule's window.
+    """
+    psutil = _psutil()
+    topology = topology or read_cpu_topology()
+    if policy is None:
+        policy = (config or PolicyConfig.load()).select(topology)
+    try:
+        process = psutil.Process(pid)
+        previous_priority = process.nice()
+    except psutil.NoSuchProcess:
+        raise ProcessLookupError(f"No process {pid}")
+    can_pin = hasattr(process, "cpu_affinity")
+    previous_affinity = process.cpu_affinity() if can_pin else None
+    errors = []
+
+    if policy.priority:
+        try:
+            set_process_priority(process, priority_value(policy.priority))
+        except (psutil.AccessDenied, OSError) as e:
+            errors.append(f"priority {policy.priority}: {e}")
+
+    affinity = None
+    if policy.affinity:
+        cpus = topology.cpus(policy.affinity)
+        if not can_pin:
+            errors.append("affinity: not supported on this platform")
+        else:
+            try:
+                set_process_cpus(process, cpus)
+                affinity = cpus
+            except (psutil.AccessDenied, OSError, ValueError) as e:
+                errors.append(f"affinity {cpus}: {e}")
+
+    raised = []  # type: List[int]
+    rule = policy.hot_threads
+    deferred = bool(rule and defer_hot_threads)
+    if rule and not deferred:
+        raise_hot_threads(process, rule, raised, errors)
+
+    result = PolicyResult(policy.name,
+                          policy.priority if not any(e.startswith("priority") for e in errors) else None,
+                          affinity, raised, errors, previous_priority, previous_affinity,
+                          rule.delay if deferred else None)
+    if deferred:
+        threading.Thread(target=_raise_hot_threads_later, args=(process, rule, result),
+                         name="hot-threads", daemon=True).start()
+    return result
+
+
+def restore_policy(pid: int, result: PolicyResult):
+    """Put back the priority and affinity a PolicyResult replaced (thread priorities end with the threads)"""
+    psutil = _psutil()
+    process = psutil.Process(pid)
+    if result.previous_priority is not None:
+        set_process_priority(process, result.previous_priority)
+    if result.previous_affinity is not None:
+        set_process_cpus(process, result.previous_affinity)
+
+
+# -- measuring --------------------------------------------------------------
+
+class SchedulingStats(NamedTuple):
+    """Scheduler behaviour of a process over a window (rates are per second)"""
+    window: float
+    cpu_percent: float
+    context_switches: float
+    migrations: Optional[float]        # Linux schedstat only
+    run_delay_us: Optional[float]      # mean run-queue wait per timeslice: scheduling latency
+
+
+def _linux_task_counters(pid: int, proc_root: str = "/proc") -> Dict[int, Tuple[int, int, int, int]]:
+    """Per thread: (run ns, run-queue wait ns, timeslices, migrations)"""
+    counters = {}
+    task_root = os.path.join(proc_root, str(pid), "task")
+    for tid in os.listdir(task_root):
+        schedstat = _read_text(os.path.join(task_root, tid, "schedstat"))
+        if not schedstat:
+            continue
+        run, wait, slices = (int(value) for value in schedstat.split()[:3])
+        migrations = 0
+        for line in (_read_text(os.path.join(task_root, tid, "sched")) or "").splitlines():
+            if line.startswith("se.nr_migrations"):
+                migrations = int(line.split(":")[1])
+                break
+        counters[int(tid)] = (run, wait, slices, migrations)
+    return counters
+
+
+def measure_scheduling(pid: int, window: float = DEFAULT_MEASURE_WINDOW) -> SchedulingStats:
+    psutil = _psutil()
+    try:
+        process = psutil.Process(pid)
+        cpu_before = sum(process.cpu_times()[:2])
+        switches_before = sum(process.num_ctx_switches())
+    except psutil.NoSuchProcess:
+        raise ProcessLookupError(f"No process {pid}")
+    linux = sys.platform.startswith('linux') and os.path.isdir(f"/proc/{pid}/task")
+    tasks_before = _linux_task_counters(pid) if linux else {}
+    start = time.monotonic()
+    time.sleep(window)
+    try:
+        cpu_after = sum(process.cpu_times()[:2])
+        switches_after = sum(process.num_ctx_switches())
+        tasks_after = _linux_task_counters(pid) if linux else {}
+    except (psutil.NoSuchProcess, FileNotFoundError):
+        raise ProcessLookupError(f"Process {pid} exited while being measured")
+    elapsed = time.monotonic() - start
+
+    migrations = run_delay = None
+    if linux:
+        deltas = [tuple(after - before for after, before in zip(tasks_after[tid], tasks_before[tid]))
+                  for tid in tasks_after if tid in tasks_before]
+        slices = sum(delta[2] for delta in deltas)
+        wait = sum(delta[1] for delta in deltas)
+        migrations = sum(delta[3] for delta in deltas) / elapsed
+        run_delay = wait / slices / 1000 if slices else 0.0
+        switches = slices  # Timeslices summed over every thread (psutil only counts the main thread here)
+    else:
+        switches = switches_after - switches_before
+    return SchedulingStats(elapsed, (cpu_after - cpu_before) / elapsed * 100, switches / elapsed,
+                           migrations, run_delay)
+
+
+def evaluate_policy(pid: int, policy: Optional[SchedulingPolicy] = None,
+                    window: float = DEFAULT_MEASURE_WINDOW) -> Tuple[SchedulingStats, PolicyResult, SchedulingStats]:
+    """Measure, apply, measure again"""
+    before = measure_scheduling(pid, window)
+    result = apply_policy(pid, policy)
+    after = measure_scheduling(pid, window)
+    return before, result, after
+
+
+def describe(result: PolicyResult) -> str:
+    parts = [f"priority {result.priority or 'unchanged'}"]
+    parts.append(f"affinity {result.affinity}" if result.affinity is not None else "affinity unchanged")
+    if result.hot_thread_delay is not None and not result.hot_threads:
+        parts.append(f"hot threads raised after {result.hot_thread_delay:g} s")
+    else:
+        parts.append(f"{len(result.hot_threads)} hot thread(s) raised")
+    return ", ".join(parts)
+
+
+def print_comparison(before: SchedulingStats, after: SchedulingStats):
+    def show(value, unit):
+        return f"{value:>12.1f}{unit}" if value is not None else f"{'n/a':>12}{unit}"
+
+    print(f"{'':<26}{'before':>14}{'after':>14}")
+    print(f"{'CPU':<26}{show(before.cpu_percent, ' %')}{show(after.cpu_percent, ' %')}")
+    print(f"{'Context switches':<26}{show(before.context_switches, '/s')}{show(after.context_switches, '/s')}")
+    print(f"{'CPU migrations':<26}{show(before.migrations, '/s')}{show(after.migrations, '/s')}")
+    print(f"{'Run-queue wait per slice':<26}{show(before.run_delay_us, 'µs')}{show(after.run_delay_us, 'µs')}")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "topology"
+    try:
+        config = PolicyConfig.load()
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not load {DEFAULT_POLICY_PATH.name}: {e}")
+        return 1
+    topology = read_cpu_topology()
+
+    if command == "topology":
+        print(f"🖥️  {len(topology.cores)} cores, {topology.logical_count} logical CPUs "
+              f"(SMT: {'yes' if topology.smt else 'no'}, hybrid: {'yes' if topology.hybrid else 'no'})")
+        for core in topology.cores:
+            print(f"   CPUs {','.join(map(str, core.cpus)):<10} efficiency class {core.efficiency}")
+        print(f"   Selected policy: {config.select(topology).name}")
+        return 0
+
+    if command in ("apply", "evaluate") and len(sys.argv) > 2:
+        pid = int(sys.argv[2])
+        name = sys.argv[3] if len(sys.argv) > 3 else None
+        if name is not None and name not in config.policies:
+            print(f"❌ Unknown policy {name} (available: {', '.join(config.policies)})")
+            return 1
+        policy = config.policies[name] if name else config.select(topology)
+        try:
+            if command == "apply":
+                result = apply_policy(pid, policy, topology)
+            else:
+                window = float(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_MEASURE_WINDOW
+                before, result, after = evaluate_policy(pid, policy, window)
+        except (ProcessLookupError, RuntimeError) as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"⚙️  Policy {result.policy}: {describe(result)}")
+        for error in result.errors:
+            print(f"   ⚠️  {error}")
+        if command == "evaluate":
+            print_comparison(before, after)
+        return 0
+
+    print("Usage: python scheduling_policy.py topology | apply <pid> [policy] | evaluate <pid> [policy] [window]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Settings Document Engine for Star Wars Battlefront II
+Parses Frostbite "Key Value" settings files (BootOptions, ProfileOptions_profile,
+Win32Game.cfg) once, patches them in memory and writes them back in a single pass
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+COMMENT_PREFIXES = ('#', '//', ';')
+NON_KEY_STARTS = '#;/ \t'
+
+
+def split_setting(line: str) -> Tuple[Optional[str], str]:
+    """Split a settings line into (key, value); key is None for comments/blank lines"""
+    stripped = line.strip()
+    if not stripped or stripped.startswith(COMMENT_PREFIXES):
+        return None, ''
+    parts = stripped.split(None, 1)
+    return parts[0], parts[1] if len(parts) > 1 else ''
+
+
+class SettingsDocument:
+    """Ordered, indexed view of a settings file.
+
+    Every original line is kept verbatim (comments, blank lines and lines we
+    do not understand included) and only the lines of keys that are set are
+    rewritten. Keys are indexed by line number so lookups and updates are
+    O(1) regardless of file size; a key defined more than once is indexed
+    at its last definition, which is the one the game ends up using.
+    """
+
+    def __init__(self, lines: Optional[List[str]] = None, path: Optional[str] = None,
+                 trailing_newline: bool = False):
+        self.path = path
+        self.trailing_newline = trailing_newline
+        self.dirty = False
+        # Value of each key before its first change since load/save (None: it was absent)
+        self._original = {}  # type: Dict[str, Optional[str]]
+        self._lines = list(lines or [])  # type: List[Optional[str]]
+        self._index = self._build_index()  # type: Dict[str, int]
+
+    def _build_index(self) -> Dict[str, int]:
+        """Map each key to the line of its last definition (the one in effect)"""
+        # Plain "Key Value" lines take the fast path; comments, blank and
+        # indented lines go through split_setting
+        keys = [line.split(None, 1)[0] if line[:1] not in NON_KEY_STARTS else (split_setting(line)[0] or '')
+                for line in self._lines]
+        # Later definitions overwrite earlier ones; duplicate lines are kept
+        # verbatim and only the indexed one is ever rewritten
+        index = dict(zip(keys, range(len(keys))))
+        index.pop('', None)
+        return index
+
+    @classmethod
+    def parse(cls, text: str, path: Optional[str] = None) -> 'SettingsDocument':
+        """Build a document from file contents"""
+        trailing_newline = text.endswith('\n')
+        if trailing_newline:
+            text = text[:-1]
+        lines = text.split('\n') if text else []
+        return cls(lines, path=path, trailing_newline=trailing_newline)
+
+    @classmethod
+    def load(cls, path: str) -> 'SettingsDocument':
+        """Read and parse a settings file"""
+        with open(path, 'r') as f:
+            return cls.parse(f.read(), path=path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def keys(self) -> List[str]:
+        """Setting keys in file order"""
+        return sorted(self._index, key=self._index.__getitem__)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the raw value of a setting"""
+        position = self._index.get(key)
+        if position is None:
+            return default
+        return split_setting(self._lines[position])[1]
+
+    def set(self, key: str, value) -> bool:
+        """Set a setting in place (or append it); returns True if the document changed"""
+        new_line = f"{key} {value}"
+        position = self._index.get(key)
+        if position is not None and self._lines[position] == new_line:
+            return False
+        self._remember(key)
+        if position is None:
+            self._index[key] = len(self._lines)
+            self._lines.append(new_line)
+        else:
+            self._lines[position] = new_line
+        self.dirty = True
+        return True
+
+    def remove(self, key: str) -> bool:
+        """Drop a setting (every definition of it); returns True if it was present"""
+        if key not in self._index:
+            return False
+        self._remember(key)
+        position = self._index.pop(key)
+        self._lines[position] = None
+        for earlier in range(position):
+            line = self._lines[earlier]
+            if line is not None and key in line and split_setting(line)[0] == key:
+                self._lines[earlier] = None
+        self.dirty = True
+        return True
+
+    def _remember(self, key: str):
+        if key not in self._original:
+            self._original[key] = self.get(key)
+
+    def changes(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """(key, old value, new value) of every key changed since load/save (None: absent)"""
+        changes = []
+        for key, old in self._original.items():
+            new = self.get(key)
+            if new != old:
+                changes.append((key, old, new))
+        return changes
+
+    def apply(self, settings: Iterable[str]) -> int:
+        """Apply "Key Value" setting lines, returning how many changed the document"""
+        changed = 0
+        for setting in settings:
+            key, value = split_setting(setting)
+            if key is not None and self.set(key, value):
+                changed += 1
+        return changed
+
+    def items(self) -> List[Tuple[str, str]]:
+        """(key, value) pairs in file order"""
+        return [(key, self.get(key)) for key in self.keys()]
+
+    def to_text(self) -> str:
+        """Render the document back to file contents"""
+        text = '\n'.join(line for line in self._lines if line is not None)
+        if self.trailing_newline:
+            text += '\n'
+        return text
+
+    def save(self, path: Optional[str] = None, force: bool = False) -> bool:
+        """Write the document if it changed; returns True if a write happened"""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save settings document to")
+        if not (self.dirty or force):
+            return False
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_text())
+        os.replace(tmp_path, path)
+        self.path = path
+        self.dirty = False
+        self._original = {}
+        return True
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Signature Database for Star Wars Battlefront II
+Loads the versioned, per-build signature file (signatures.json), picks the
+entry matching the installed game build and compiles its signatures into a
+SignatureMatcher.
+"""
+
+import os
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from memory_scanner import Signature, SignatureMatcher
+
+DB_FORMAT = 1
+PACKAGE_DIR = Path(__file__).resolve().parent
+DEFAULT_DB_PATH = PACKAGE_DIR / "signatures.json"
+DEFAULT_BUILD = "default"
+
+
+class SignatureDatabase:
+    """Signature sets keyed by game build.
+
+    Each build entry has a ``build`` label, optional ``exe_sizes`` (sizes in
+    bytes of the game executable it applies to) and a list of signatures
+    (``name``, ``pattern``, ``description``). The ``default`` build is used
+    when no entry matches the installed executable.
+    """
+
+    def __init__(self, data: dict, path: Optional[Path] = None):
+        if data.get("format") != DB_FORMAT:
+            raise ValueError(f"Unsupported signature database format: {data.get('format')!r}")
+        self.path = path
+        self.version = data.get("version", "")
+        self.builds = {entry["build"]: entry for entry in data.get("builds", [])}
+        if DEFAULT_BUILD not in self.builds:
+            raise ValueError("Signature database has no default build")
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_DB_PATH) -> "SignatureDatabase":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), Path(path))
+
+    def select_build(self, exe_size: Optional[int] = None) -> str:
+        """Label of the build entry for an executable of the given size"""
+        if exe_size is not None:
+            for label, entry in self.builds.items():
+                if exe_size in entry.get("exe_sizes", ()):
+                    return label
+        return DEFAULT_BUILD
+
+    def signatures(self, build: str = DEFAULT_BUILD) -> List[Signature]:
+        return [Signature(entry["name"], entry["pattern"], entry.get("description", ""))
+                for entry in self.builds[build]["signatures"]]
+
+    def compile(self, build: str = DEFAULT_BUILD) -> SignatureMatcher:
+        return SignatureMatcher(self.signatures(build))
+
+
+def _executable_size(exe_path) -> Optional[int]:
+    try:
+        return os.path.getsize(exe_path) if exe_path else None
+    except OSError:
+        return None
+
+
+def load_matcher(exe_path=None, db_path: Path = DEFAULT_DB_PATH) -> Tuple[str, SignatureMatcher]:
+    """(build label, compiled matcher) for the game executable at exe_path"""
+    database = SignatureDatabase.load(db_path)
+    build = database.select_build(_executable_size(exe_path))
+    return build, database.compile(build)
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Runtime Telemetry Sampler for Star Wars Battlefront II
+Keeps sampling the game process after the runtime fixes are applied: CPU%,
+working set, private bytes, handle and thread counts and I/O counters. Samples
+go into preallocated arrays: a ring of the most recent full-rate samples and
+a session history that halves its resolution whenever it fills, so a session
+of any length fits in fixed memory. Recordings are saved as packed binary rows.
+
+Usage: python telemetry.py record <pid> [rate_hz] [output.swtl]
+       python telemetry.py show <recording.swtl>
+"""
+
+import os
+import sys
+import time
+import struct
+import logging
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 10.0            # samples per second
+DEFAULT_CAPACITY = 8192        # history rows before resolution is halved
+DEFAULT_RECENT = 600           # full-rate samples kept (one minute at 10 Hz)
+DEFAULT_TELEMETRY_DIR = Path(__file__).resolve().parent / "Telemetry"
+
+FIELDS = ("time", "cpu_percent", "working_set", "private_bytes", "handles", "threads",
+          "read_bytes", "write_bytes")
+FIELD_COUNT = len(FIELDS)
+# Cumulative counters keep the newest value when rows are merged; everything else is averaged
+LAST_FIELDS = (FIELDS.index("read_bytes"), FIELDS.index("write_bytes"))
+MEAN_FIELDS = tuple(index for index in range(FIELD_COUNT) if index not in LAST_FIELDS)
+
+FILE_MAGIC = b"SWTL"
+FILE_VERSION = 1
+HEADER = struct.Struct("<4sHHIIdI")  # magic, version, field count, pid, stride, rate, rows
+ROW = struct.Struct("<dfQQIIQQ")     # 52 bytes per sample
+
+thread_time = getattr(time, "thread_time", time.process_time)
+
+
+class TelemetrySample(NamedTuple):
+    """One (possibly averaged) sample of the game process"""
+    time: float           # seconds since the epoch
+    cpu_percent: float    # of one core
+    working_set: float    # bytes
+    private_bytes: float
+    handles: float
+    threads: float
+    read_bytes: float     # cumulative
+    write_bytes: float
+
+
+class RawCounters(NamedTuple):
+    """What a source reads per sample; CPU time is turned into CPU% by the sampler"""
+    cpu_seconds: float
+    working_set: int
+    private_bytes: int
+    handles: int
+    threads: int
+    read_bytes: int
+    write_bytes: int
+
+
+# -- storage ----------------------------------------------------------------
+
+class TelemetryRing:
+    """Fixed-size ring of the most recent samples (oldest overwritten)"""
+
+    def __init__(self, capacity: int = DEFAULT_RECENT):
+        self.capacity = capacity
+        self.data = array('d', bytes(8 * capacity * FIELD_COUNT))
+        self.count = 0
+        self.next = 0
+
+    def append(self, values: Sequence[float]):
+        row = self.next * FIELD_COUNT
+        self.data[row:row + FIELD_COUNT] = array('d', values)
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def samples(self) -> List[TelemetrySample]:
+        """Oldest first"""
+        start = (self.next - self.count) % self.capacity
+        rows = [(start + i) % self.capacity for i in range(self.count)]
+        return [TelemetrySample(*self.data[row * FIELD_COUNT:(row + 1) * FIELD_COUNT]) for row in rows]
+
+
+class DownsamplingBuffer:
+    """Whole-session history in a fixed number of rows.
+
+    When the rows run out, adjacent pairs are merged in place and every row
+    from then on stands for twice as many samples (the stride), so memory
+    stays constant and the oldest data is never dropped, only coarsened.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 2 or capacity % 2:
+            raise ValueError("capacity must be an even number of at least 2")
+        self.capacity = capacity
+        self.data = array('d', bytes(8 * capacity * FIELD_COUNT))
+        self.count = 0
+        self.stride = 1
+        self.pending = array('d', bytes(8 * FIELD_COUNT))
+        self.pending_count = 0
+
+    def append(self, values: Sequence[float]):
+        if self.pending_count == 0 and self.count == self.capacity:
+            self._halve()  # Before accumulating, so the next row already spans the new stride
+        pending = self.pending
+        for index in MEAN_FIELDS:
+            pending[index] += values[index]
+        for index in LAST_FIELDS:
+            pending[index] = values[index]
+        self.pending_count += 1
+        if self.pending_count == self.stride:
+            self._store()
+
+    def _store(self):
+        row = self.count * FIELD_COUNT
+        pending, data, weight = self.pending, self.data, self.pending_count
+        for index in MEAN_FIELDS:
+            data[row + index] = pending[index] / weight
+            pending[index] = 0.0
+        for index in LAST_FIELDS:
+            data[row + index] = pending[index]
+        self.pending_count = 0
+        self.count += 1
+
+    def _halve(self):
+        data = self.data
+        for target in range(self.capacity // 2):
+            out, first, second = target * FIELD_COUNT, 2 * target * FIELD_COUNT, (2 * target + 1) * FIELD_COUNT
+            for index in MEAN_FIELDS:
+                data[out + index] = (data[first + index] + data[second + index]) / 2
+            for index in LAST_FIELDS:
+                data[out + index] = data[second + index]
+        self.count = self.capacity // 2
+        self.stride *= 2
+
+    def samples(self) -> List[TelemetrySample]:
+        return [TelemetrySample(*self.data[row * FIELD_COUNT:(row + 1) * FIELD_COUNT])
+                for row in range(self.count)]
+
+
+# -- sources ----------------------------------------------------------------
+
+class TelemetrySource:
+    """Reads the counters of one process; raises ProcessLookupError once it has exited"""
+
+    name = "base"
+
+    def read(self) -> RawCounters:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ProcfsTelemetrySource(TelemetrySource):
+    """/proc/<pid>/{stat,statm,io,fd} on Linux (including the game under Wine/Proton).
+
+    The files stay open and are re-read with pread, so a sample costs a few
+    system calls and no path lookups. I/O counters are rchar/wchar, which
+    like Windows' transfer counts include reads served from the page cache.
+    """
+
+    name = "procfs"
+
+    def __init__(self, pid: int, proc_root: str = "/proc"):
+        self.pid = pid
+        self.root = os.path.join(proc_root, str(pid))
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        try:
+            self.stat_fd = os.open(os.path.join(self.root, "stat"), os.O_RDONLY)
+        except FileNotFoundError:
+            raise ProcessLookupError(f"No process {pid}")
+        self.statm_fd = os.open(os.path.join(self.root, "statm"), os.O_RDONLY)
+        try:
+            self.io_fd = os.open(os.path.join(self.root, "io"), os.O_RDONLY)
+        except PermissionError:
+            self.io_fd = None  # Another user's process: I/O counters read as 0
+
+    def _read(self, fd: int) -> bytes:
+        try:
+            data = os.pread(fd, 4096, 0)
+        except OSError:
+            data = b""  # ESRCH once the process is gone
+        if not data:
+            raise ProcessLookupError(f"Process {self.pid} has exited")
+        return data
+
+    def read(self) -> RawCounters:
+        stat = self._read(self.stat_fd)
+        fields = stat[stat.rindex(b")") + 2:].split()
+        if fields[0] in (b"Z", b"X"):
+            raise ProcessLookupError(f"Process {self.pid} has exited")
+        statm = self._read(self.statm_fd).split()
+        resident, shared = int(statm[1]), int(statm[2])
+        read_bytes = write_bytes = 0
+        if self.io_fd is not None:
+            for line in self._read(self.io_fd).splitlines():
+                if line.startswith(b"rchar:"):
+                    read_bytes = int(line[6:])
+                elif line.startswith(b"wchar:"):
+                    write_bytes = int(line[6:])
+        try:
+            handles = len(os.listdir(os.path.join(self.root, "fd")))
+        except PermissionError:
+            handles = 0
+        except FileNotFoundError:
+            raise ProcessLookupError(f"Process {self.pid} has exited")
+        return RawCounters((int(fields[11]) + int(fields[12])) / self.clock_ticks,
+                           resident * self.page_size, (resident - shared) * self.page_size,
+                           handles, int(fields[17]), read_bytes, write_bytes)
+
+    def close(self):
+        for fd in (self.stat_fd, self.statm_fd, self.io_fd):
+            if fd is not None:
+                os.close(fd)
+
+
+class PsutilTelemetrySource(TelemetrySource):
+    """psutil (Windows and other platforms), reading everything in one oneshot() pass"""
+
+    name = "psutil"
+
+    def __init__(self, pid: int):
+        from process_watch import load_psutil
+        self.psutil = load_psutil()
+        if self.psutil is None:
+            raise RuntimeError("Telemetry needs psutil on this platform")
+        self.pid = pid
+        try:
+            self.process = self.psutil.Process(pid)
+        except self.psutil.NoSuchProcess:
+            raise ProcessLookupError(f"No process {pid}")
+
+    def read(self) -> RawCounters:
+        psutil, process = self.psutil, self.process
+        try:
+            with process.oneshot():
+                cpu = process.cpu_times()
+                memory = process.memory_info()
+                handles = process.num_handles() if hasattr(process, "num_handles") else process.num_fds()
+                threads = process.num_threads()
+                try:
+                    io = process.io_counters()
+                    read_bytes = getattr(io, "read_chars", io.read_bytes)
+                    write_bytes = getattr(io, "write_chars", io.write_bytes)
+                except (psutil.AccessDenied, AttributeError):
+                    read_bytes = write_bytes = 0
+        except psutil.NoSuchProcess:
+            raise ProcessLookupError(f"Process {self.pid} has exited")
+        # Windows reports private bytes directly; elsewhere approximate with non-shared resident memory
+        private = getattr(memory, "private", memory.rss - getattr(memory, "shared", 0))
+        return RawCounters(cpu.user + cpu.system, memory.rss, private, handles, threads, read_bytes, write_bytes)
+
+
+def open_telemetry_source(pid: int) -> TelemetrySource:
+    """Telemetry source for a live process on this platform"""
+    if sys.platform.startswith('linux') and os.path.isdir("/proc"):
+        return ProcfsTelemetrySource(pid)
+    return PsutilTelemetrySource(pid)
+
+
+# -- sampling ---------------------------------------------------------------
+
+class TelemetrySampler:
+    """Samples a source at a fixed rate on a background thread until stopped or the process exits"""
+
+    def __init__(self, source: TelemetrySource, rate: float = DEFAULT_RATE,
+                 capacity: int = DEFAULT_CAPACITY, recent: int = DEFAULT_RECENT):
+        self.source = source
+        self.rate = rate
+        self.history = DownsamplingBuffer(capacity)
+        self.recent = TelemetryRing(recent)
+        self.sample_count = 0
+        self.started = None  # type: Optional[float]
+        self.elapsed = 0.0
+        self.cpu_time = 0.0    # spent by the sampler thread itself
+        self.stop_event = threading.Event()
+        self.thread = None  # type: Optional[threading.Thread]
+
+    def start(self) -> 'TelemetrySampler':
+        self.thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self.stop_event.set()
+        self.join(timeout)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the sampler to finish (the process exited); True if it has"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+            return not self.thread.is_alive()
+        return True
+
+    def _run(self):
+        interval = 1.0 / self.rate
+        cpu_start = thread_time()
+        start = next_tick = time.monotonic()
+        self.started = time.time()
+        previous = None
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    counters = self.source.read()
+                except ProcessLookupError:
+                    logger.info(f"Telemetry: process exited after {self.sample_count} samples")
+                    break
+                now = time.monotonic()
+                cpu_percent = 0.0
+                if previous is not None and now > previous[0]:
+                    cpu_percent = (counters.cpu_seconds - previous[1]) / (now - previous[0]) * 100
+                previous = (now, counters.cpu_seconds)
+                values = (self.started + (now - start), cpu_percent) + tuple(counters[1:])
+                self.history.append(values)
+                self.recent.append(values)
+                self.sample_count += 1
+
+                next_tick += interval
+                if next_tick < now:
+                    next_tick = now + interval  # Fell behind (e.g. suspended): skip missed ticks
+                self.stop_event.wait(next_tick - time.monotonic())
+        finally:
+            self.elapsed = time.monotonic() - start
+            self.cpu_time = thread_time() - cpu_start
+            self.source.close()
+
+    @property
+    def overhead(self) -> float:
+        """CPU used by the sampler thread, as a percentage of one core"""
+        return self.cpu_time / self.elapsed * 100 if self.elapsed > 0 else 0.0
+
+    def samples(self) -> List[TelemetrySample]:
+        return self.history.samples()
+
+    def save(self, path, pid: int = 0) -> Path:
+        return save_recording(path, self.samples(), pid, self.rate, self.history.stride)
+
+
+# -- persistence ------------------------------------------------------------
+
+class TelemetryRecording(NamedTuple):
+    pid: int
+    rate: float
+    stride: int            # raw samples averaged into each row
+    samples: List[TelemetrySample]
+
+
+def save_recording(path, samples: Sequence[TelemetrySample], pid: int = 0, rate: float = DEFAULT_RATE,
+                   stride: int = 1) -> Path:
+    """Write a header and one packed row per sample, replacing path atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    buffer = bytearray(HEADER.size + ROW.size * len(samples))
+    HEADER.pack_into(buffer, 0, FILE_MAGIC, FILE_VERSION, FIELD_COUNT, pid, stride, rate, len(samples))
+    for number, sample in enumerate(samples):
+        ROW.pack_into(buffer, HEADER.size + number * ROW.size, sample.time, sample.cpu_percent,
+                      *(int(round(value)) for value in sample[2:]))
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(buffer)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_recording(path) -> TelemetryRecording:
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, field_count, pid, stride, rate, rows = HEADER.unpack_from(data, 0)
+    if magic != FILE_MAGIC or version != FILE_VERSION or field_count != FIELD_COUNT:
+        raise ValueError(f"{path} is not a version {FILE_VERSION} telemetry recording")
+    samples = [TelemetrySample(*row) for row in ROW.iter_unpack(data[HEADER.size:HEADER.size + rows * ROW.size])]
+    return TelemetryRecording(pid, rate, stride, samples)
+
+
+def summarize(samples: Sequence[TelemetrySample]) -> Dict[str, float]:
+    """Duration, CPU and memory averages/peaks and total I/O of a recording"""
+    if not samples:
+        return {}
+    return {
+        "duration": samples[-1].time - samples[0].time,
+        "cpu_mean": sum(sample.cpu_percent for sample in samples) / len(samples),
+        "cpu_peak": max(sample.cpu_percent for sample in samples),
+        "working_set_peak": max(sample.working_set for sample in samples),
+        "private_bytes_peak": max(sample.private_bytes for sample in samples),
+        "handles_peak": max(sample.handles for sample in samples),
+        "threads_peak": max(sample.threads for sample in samples),
+        "read_bytes": samples[-1].read_bytes - samples[0].read_bytes,
+        "write_bytes": samples[-1].write_bytes - samples[0].write_bytes,
+    }
+
+
+def print_summary(samples: Sequence[TelemetrySample]):
+    summary = summarize(samples)
+    if not summary:
+        print("No samples recorded")
+        return
+    mb = 1024 * 1024
+    print(f"   Duration:       {summary['duration']:.1f} s ({len(samples)} rows)")
+    print(f"   CPU:            {summary['cpu_mean']:.1f}% mean, {summary['cpu_peak']:.1f}% peak (of one core)")
+    print(f"   Working set:    {summary['working_set_peak'] / mb:.0f} MB peak")
+    print(f"   Private bytes:  {summary['private_bytes_peak'] / mb:.0f} MB peak")
+    print(f"   Handles:        {summary['handles_peak']:.0f} peak, threads: {summary['threads_peak']:.0f} peak")
+    print(f"   I/O:            {summary['read_bytes'] / mb:.0f} MB read, {summary['write_bytes'] / mb:.0f} MB written")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+
+    if command == "record" and len(sys.argv) > 2:
+        pid = int(sys.argv[2])
+        rate = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_RATE
+        output = Path(sys.argv[4]) if len(sys.argv) > 4 else \
+            DEFAULT_TELEMETRY_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{pid}.swtl"
+        try:
+            sampler = TelemetrySampler(open_telemetry_source(pid), rate).start()
+        except (ProcessLookupError, RuntimeError) as e:
+            print(f"❌ Cannot sample PID {pid}: {e}")
+            return 1
+        print(f"📈 Recording PID {pid} at {rate:g} Hz until it exits (Ctrl+C to stop)...")
+        try:
+            while not sampler.join(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+        sampler.stop()
+        sampler.save(output, pid)
+        print(f"✅ Saved {output} (sampler used {sampler.overhead:.2f}% of one core)")
+        print_summary(sampler.samples())
+        return 0
+
+    if command == "show" and len(sys.argv) > 2:
+        try:
+            recording = load_recording(sys.argv[2])
+        except (OSError, ValueError, struct.error) as e:
+            print(f"❌ Could not read {sys.argv[2]}: {e}")
+            return 1
+        print(f"📈 PID {recording.pid} at {recording.rate:g} Hz, {recording.stride} sample(s) per row")
+        print_summary(recording.samples)
+        return 0
+
+    print("Usage: python telemetry.py record <pid> [rate_hz] [output.swtl] | show <recording.swtl>")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Verification Engine for the SWBF2 DX12 Fix
+In-process system and installation checks returning structured results, shared
+by verify_system.py, the GUI and the complete fixer. Independent checks run
+concurrently, each with its own timeout; results of expensive checks can be
+cached and are reused while a cheap fingerprint of their inputs is unchanged.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import shutil
+import platform
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import game_discovery
+from platform_backends import get_backends
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+REQUIRED_PACKAGE_FILES = [
+    "SWBF2_DX12_Complete_Fix.py",
+    "README_SWBF2_DX12_Fix.md",
+    "requirements.txt",
+]
+SETTINGS_FILES = ["BootOptions", "ProfileOptions_profile"]
+MIN_FREE_SPACE = 100 * 1024 * 1024  # 100 MB for backups
+DEFAULT_CHECK_TIMEOUT = 10.0
+DISCOVERY_CHECK_TIMEOUT = 30.0  # Probing unresponsive drives takes a few probe timeouts
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = PACKAGE_DIR / "verification_cache.json"
+
+PASS = "pass"
+WARN = "warn"
+FAIL = "fail"
+UNKNOWN = "unknown"
+STATUS_SYMBOLS = {PASS: "✅", WARN: "⚠️ ", FAIL: "❌", UNKNOWN: "❓"}
+
+
+class CheckResult(NamedTuple):
+    """Outcome of one check"""
+    name: str
+    status: str  # PASS, WARN, FAIL or UNKNOWN
+    message: str
+    details: Tuple[str, ...] = ()
+    elapsed: float = 0.0
+    data: Optional[dict] = None  # Machine-readable facts (e.g. the install path)
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Warnings and undetermined checks do not block the fix"""
+        return self.status != FAIL
+
+    @property
+    def symbol(self) -> str:
+        return STATUS_SYMBOLS[self.status]
+
+    def to_dict(self) -> dict:
+        return dict(self._asdict(), details=list(self.details))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CheckResult":
+        return cls(**dict(data, details=tuple(data.get("details", ()))))
+
+
+class Check(NamedTuple):
+    """A named check; with a fingerprint function its result may be cached"""
+    name: str
+    run: Callable[[], CheckResult]
+    timeout: float = DEFAULT_CHECK_TIMEOUT
+    fingerprint: Optional[Callable[[Optional[CheckResult]], object]] = None
+
+
+class VerificationReport:
+    """Results of a verification run"""
+
+    def __init__(self, results: Optional[List[CheckResult]] = None):
+        self.results = list(results or [])
+        self.elapsed = 0.0
+
+    @property
+    def passed(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def total(self) -> int:
+        return len(self.results)
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    def failures(self) -> List[CheckResult]:
+        return [result for result in self.results if not result.ok]
+
+    def to_dict(self) -> dict:
+        return {
+            "generated": time.time(),
+            "elapsed": self.elapsed,
+            "passed": self.passed,
+            "total": self.total,
+            "ok": self.ok,
+            "checks": [result.to_dict() for result in self.results],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+
+# -- system checks -----------------------------------------------------
+
+def check_python_version() -> CheckResult:
+    version = sys.version_info
+    label = f"Python {version.major}.{version.minor}.{version.micro}"
+    if version >= (3, 6):
+        return CheckResult("Python Version", PASS, f"{label} - Compatible")
+    return CheckResult("Python Version", FAIL, f"{label} - Requires Python 3.6+")
+
+
+def check_windows_version() -> CheckResult:
+    if platform.system() != "Windows":
+        return CheckResult("Windows Version", FAIL, f"OS: {platform.system()} - Windows required")
+    release = platform.release()
+    if release in ("10", "11"):
+        return CheckResult("Windows Version", PASS, f"Windows {release} - Compatible")
+    return CheckResult("Windows Version", WARN, f"Windows {release} - May work but not fully tested")
+
+
+def check_admin_privileges() -> CheckResult:
+    is_admin = get_backends().process.is_admin()
+    if is_admin is None:
+        return CheckResult("Administrator Privileges", UNKNOWN, "Administrator privileges - Cannot determine")
+    if is_admin:
+        return CheckResult("Administrator Privileges", PASS, "Administrator privileges - Available")
+    return CheckResult("Administrator Privileges", WARN,
+                       "Administrator privileges - Not available (some fixes may not apply)")
+
+
+def check_dependencies() -> CheckResult:
+    try:
+        import psutil
+    except ImportError:
+        # The complete fix installs it automatically
+        return CheckResult("Python Dependencies", WARN, "psutil - Not installed (will be auto-installed)")
+    return CheckResult("Python Dependencies", PASS, f"psutil {psutil.__version__} - Available",
+                       data={"psutil": psutil.__version__})
+
+
+def check_game_installation(local_dirs: Optional[Sequence] = None,
+                            discovery: Optional[game_discovery.GameDiscovery] = None) -> CheckResult:
+    """Find the game in local_dirs, then through Steam/EA install manifests"""
+    if local_dirs is None:
+        local_dirs = [Path.cwd().parent, Path.cwd()]
+    discovery = discovery or game_discovery.GameDiscovery()
+    install = discovery.find_game(local_dirs=local_dirs)
+    details = tuple(f"Skipped unresponsive location: {path}" for path in discovery.last_probe.timed_out)
+
+    if install is None:
+        return CheckResult("Game Installation", FAIL, "SWBF2 installation not found", details + (
+            "Make sure the game is installed and this fix package is in the game directory",))
+    data = {"path": install.path, "source": install.source}
+    if install.source == "local":
+        location = "parent" if Path(install.path) == Path(local_dirs[0]) else "current"
+        return CheckResult("Game Installation", PASS, f"Game found in {location} directory: {install.path}",
+                           details, data=data)
+    return CheckResult("Game Installation", PASS, f"Game found at: {install.path} ({install.source})",
+                       details, data=data)
+
+
+def check_game_executable(game_path) -> CheckResult:
+    """The selected game directory holds the game executable"""
+    if not game_path:
+        return CheckResult("Game Executable", FAIL, "Game directory not selected")
+    if os.path.isfile(os.path.join(str(game_path), game_discovery.GAME_EXECUTABLE)):
+        return CheckResult("Game Executable", PASS, "Game executable found")
+    return CheckResult("Game Executable", FAIL, "Game executable not found", (str(game_path),))
+
+
+def check_settings_files(settings_path) -> CheckResult:
+    """BootOptions and ProfileOptions_profile exist in the settings directory"""
+    if not settings_path:
+        return CheckResult("Settings Files", FAIL, "Settings directory not selected")
+    missing = [name for name in SETTINGS_FILES if not os.path.isfile(os.path.join(str(settings_path), name))]
+    if missing:
+        return CheckResult("Settings Files", FAIL, f"Settings files not found: {', '.join(missing)}",
+                           (str(settings_path),))
+    return CheckResult("Settings Files", PASS, "BootOptions and ProfileOptions files found")
+
+
+def check_package_integrity(package_dir: Path = PACKAGE_DIR) -> CheckResult:
+    missing = [name for name in REQUIRED_PACKAGE_FILES if not (Path(package_dir) / name).exists()]
+    if missing:
+        return CheckResult("Package Integrity", FAIL, f"Fix package - Missing files: {', '.join(missing)}")
+    return CheckResult("Package Integrity", PASS, "Fix package - All files present")
+
+
+def check_disk_space(path=PACKAGE_DIR) -> CheckResult:
+    try:
+        free = shutil.disk_usage(str(path)).free
+    except OSError:
+        return CheckResult("Disk Space", UNKNOWN, "Disk space - Cannot determine")
+    if free > MIN_FREE_SPACE:
+        return CheckResult("Disk Space", PASS, "Disk space - Sufficient for backups")
+    return CheckResult("Disk Space", WARN, "Disk space - Low (may affect backup creation)")
+
+
+# -- fingerprints ------------------------------------------------------
+
+def _stat_key(path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(str(path))
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def dependencies_fingerprint(previous: Optional[CheckResult] = None) -> list:
+    """Interpreter plus the modification times of every import directory (installs touch them).
+
+    The package directory is left out: the cache itself is written there.
+    """
+    return [sys.executable, sys.version] + [[entry, _stat_key(entry)] for entry in sys.path
+                                            if entry and Path(entry).resolve() != PACKAGE_DIR]
+
+
+def installation_fingerprint(local_dirs: Sequence) -> Callable[[Optional[CheckResult]], list]:
+    """The found executable's stat, or the searched directories and discovery cache if none was found.
+
+    The package directory is left out: the caches are written there.
+    """
+    def fingerprint(previous: Optional[CheckResult] = None) -> list:
+        found = previous.data.get("path") if previous is not None and previous.data else None
+        if found:
+            return ["found", found, _stat_key(os.path.join(found, game_discovery.GAME_EXECUTABLE))]
+        return ["missing", [[str(path), _stat_key(path)] for path in local_dirs
+                            if Path(path).resolve() != PACKAGE_DIR],
+                _stat_key(game_discovery.DEFAULT_CACHE_PATH)]
+    return fingerprint
+
+
+class ResultCache:
+    """Check results with the fingerprint they were computed under (JSON file)"""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_CACHE_PATH):
+        self.path = Path(path) if path else None
+        self.entries = {}  # type: Dict[str, dict]
+        if self.path:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.entries = data.get("checks", {})
+            except (OSError, ValueError):
+                pass
+
+    def get(self, check: Check) -> Optional[CheckResult]:
+        entry = self.entries.get(check.name)
+        if entry is None:
+            return None
+        result = CheckResult.from_dict(entry["result"])
+        # JSON turns tuples into lists: compare in the same shape
+        if json.loads(json.dumps(check.fingerprint(result))) != entry["fingerprint"]:
+            return None
+        return result._replace(cached=True)
+
+    def put(self, check: Check, result: CheckResult):
+        self.entries[check.name] = {"fingerprint": json.loads(json.dumps(check.fingerprint(result))),
+                                    "result": result._replace(cached=False).to_dict()}
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "checks": self.entries}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+# -- runners -----------------------------------------------------------
+
+def _run_check(check: Check, results: "queue.Queue", index: int):
+    begin = time.perf_counter()
+    try:
+        result = check.run()
+    except Exception as e:
+        result = CheckResult(check.name, UNKNOWN, f"{check.name} - Check failed: {e}")
+    results.put((index, result._replace(elapsed=time.perf_counter() - begin)))
+
+
+def run_checks(checks: Sequence[Check], concurrent: bool = True,
+               cache: Optional[ResultCache] = None, use_cache: bool = False) -> VerificationReport:
+    """Run checks, concurrently by default, and return their results in check order.
+
+    Each check runs on its own daemon thread; one that does not finish
+    within its timeout is reported as unknown (and left to finish in the
+    background). A check that raises is reported as unknown too. With a
+    cache, fingerprinted checks are stored after running and, if use_cache,
+    reused while their fingerprint is unchanged.
+    """
+    report = VerificationReport([None] * len(checks))
+    start = time.perf_counter()
+    results = queue.Queue()  # type: queue.Queue
+    deadlines = {}  # type: Dict[int, float]
+
+    for index, check in enumerate(checks):
+        if use_cache and cache is not None and check.fingerprint is not None:
+            cached = cache.get(check)
+            if cached is not None:
+                report.results[index] = cached
+                continue
+        deadlines[index] = time.perf_counter() + check.timeout
+        if concurrent:
+            threading.Thread(target=_run_check, args=(check, results, index), daemon=True).start()
+        else:
+            _run_check(check, results, index)
+
+    while deadlines:
+        index = min(deadlines, key=deadlines.get)
+        try:
+            done, result = results.get(timeout=max(0.0, deadlines[index] - time.perf_counter()))
+        except queue.Empty:
+            check = checks[index]
+            report.results[index] = CheckResult(check.name, UNKNOWN,
+                                                f"{check.name} - Timed out after {check.timeout:.0f} s",
+                                                elapsed=check.timeout)
+            del deadlines[index]
+            continue
+        if done in deadlines:
+            report.results[done] = result
+            del deadlines[done]
+            check = checks[done]
+            if cache is not None and check.fingerprint is not None and result.status != UNKNOWN:
+                cache.put(check, result)
+
+    if cache is not None:
+        cache.save()
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def system_checks(game_path=None, local_dirs: Optional[Sequence] = None,
+                  package_dir: Path = PACKAGE_DIR) -> List[Check]:
+    """The checks run before applying the fix; a known game_path skips discovery"""
+    if game_path:
+        game_check = Check("Game Installation", lambda: check_game_executable(game_path))
+    else:
+        if local_dirs is None:
+            local_dirs = [Path.cwd().parent, Path.cwd()]
+        game_check = Check("Game Installation", lambda: check_game_installation(local_dirs),
+                           DISCOVERY_CHECK_TIMEOUT, installation_fingerprint(local_dirs))
+    return [
+        Check("Python Version", check_python_version),
+        Check("Windows Version", check_windows_version),
+        Check("Administrator Privileges", check_admin_privileges),
+        Check("Python Dependencies", check_dependencies, fingerprint=dependencies_fingerprint),
+        game_check,
+        Check("Package Integrity", lambda: check_package_integrity(package_dir)),
+        Check("Disk Space", lambda: check_disk_space(package_dir)),
+    ]
+
+
+def verify_system(game_path=None, local_dirs: Optional[Sequence] = None, package_dir: Path = PACKAGE_DIR,
+                  cache: Optional[ResultCache] = None, use_cache: bool = False) -> VerificationReport:
+    """Full pre-fix verification"""
+    return run_checks(system_checks(game_path, local_dirs, package_dir), cache=cache, use_cache=use_cache)
+
+
+def verify_install(game_path, settings_path) -> VerificationReport:
+    """Check user-selected game and settings directories"""
+    return run_checks([
+        Check("Game Executable", lambda: check_game_executable(game_path)),
+        Check("Settings Files", lambda: check_settings_files(settings_path)),
+    ])